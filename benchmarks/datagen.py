@@ -0,0 +1,123 @@
+"""Deterministic synthetic task generator for benchmarks.
+
+Example:
+    python -m benchmarks.datagen --size 100000 --tags 200 -o tasks.json
+"""
+
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+# Fixed reference point so generated files are byte-for-byte reproducible
+EPOCH = datetime(2025, 1, 1, 9, 0, 0)
+
+VERBS = [
+    "Fix", "Write", "Review", "Update", "Plan", "Call", "Email", "Buy", "Clean",
+    "Refactor", "Test", "Deploy", "Read", "Book", "Prepare", "Submit", "Schedule",
+]
+NOUNS = [
+    "login bug", "report", "pull request", "docs", "budget", "dentist", "groceries",
+    "kitchen", "parser", "unit tests", "release", "chapter", "flights", "slides",
+    "invoice", "meeting", "database", "backlog", "garden", "newsletter",
+]
+QUALIFIERS = [
+    "", "", "", "for Monday", "before lunch", "again", "for the team", "this week",
+    "with Alex", "v2", "asap", "properly",
+]
+PRIORITIES = ["high", "medium", "low"]
+
+
+def generate_tasks(
+    size: int,
+    tag_cardinality: int = 50,
+    completion_ratio: float = 0.3,
+    due_spread_days: int = 90,
+    seed: int = 0
+) -> Iterator[Dict]:
+    """Generate synthetic tasks deterministically.
+
+    Args:
+        size: Number of tasks to generate
+        tag_cardinality: Number of distinct tags to draw from
+        completion_ratio: Fraction of tasks that are completed
+        due_spread_days: Due dates fall within +/- this many days of creation;
+            0 disables due dates
+        seed: Random seed
+
+    Yields:
+        Task dictionaries in the stored format
+    """
+    rng = random.Random(seed)
+    tags = [f"tag{i}" for i in range(max(tag_cardinality, 1))]
+    history_seconds = 365 * 24 * 3600
+
+    for _ in range(size):
+        created = EPOCH + timedelta(seconds=rng.randrange(history_seconds))
+        description = " ".join(
+            part for part in (rng.choice(VERBS), rng.choice(NOUNS), rng.choice(QUALIFIERS))
+            if part
+        )
+        task_tags = rng.sample(tags, k=min(len(tags), rng.choice((0, 1, 1, 2, 3)))) if tag_cardinality else []
+        due_date = None
+        if due_spread_days and rng.random() < 0.5:
+            due = created + timedelta(days=rng.randint(-due_spread_days, due_spread_days))
+            due_date = due.date().isoformat()
+        completed_at = None
+        status = "pending"
+        if rng.random() < completion_ratio:
+            status = "completed"
+            completed_at = (created + timedelta(seconds=rng.randrange(30 * 24 * 3600))).isoformat()
+        yield {
+            "task": description,
+            "status": status,
+            "priority": rng.choice(PRIORITIES),
+            "tags": task_tags,
+            "due_date": due_date,
+            "created_at": created.isoformat(),
+            "completed_at": completed_at,
+        }
+
+
+def write_dataset(path: str, size: int, **options: object) -> List[Dict]:
+    """Generate tasks and write them in the tasks.json format.
+
+    Args:
+        path: Output file path
+        size: Number of tasks
+        **options: Extra keyword arguments for generate_tasks
+
+    Returns:
+        The generated tasks
+    """
+    tasks = list(generate_tasks(size, **options))  # type: ignore[arg-type]
+    with open(path, "w") as f:
+        json.dump(tasks, f, indent=4)
+    return tasks
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic tasks.json")
+    parser.add_argument("--size", type=int, default=10000, help="Number of tasks (default: 10000)")
+    parser.add_argument("--tags", type=int, default=50, help="Tag cardinality (default: 50)")
+    parser.add_argument("--completed", type=float, default=0.3, help="Completion ratio (default: 0.3)")
+    parser.add_argument("--due-spread", type=int, default=90, help="Due date spread in days (default: 90)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("-o", "--output", default="tasks.json", help="Output path (default: tasks.json)")
+    args = parser.parse_args()
+
+    write_dataset(
+        args.output,
+        args.size,
+        tag_cardinality=args.tags,
+        completion_ratio=args.completed,
+        due_spread_days=args.due_spread,
+        seed=args.seed,
+    )
+    print(f"Wrote {args.size} tasks to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
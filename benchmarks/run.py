@@ -0,0 +1,330 @@
+"""Benchmark harness for TodoList operations and CLI commands.
+
+Every case runs in a fresh worker process against a synthetic dataset, and
+records wall time (cold and warm), peak RSS and bytes written. Results are
+compared against a stored baseline; the run fails when a case gets slower
+or bigger than the baseline by more than the threshold.
+
+Example:
+    python -m benchmarks.run --sizes 1000,10000
+    python -m benchmarks.run --sizes 10000 --save-baseline
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Regressions smaller than these are treated as noise
+WALL_FLOOR = 0.005
+# Cold times include process start-up and are single samples for library cases
+COLD_FLOOR = 0.050
+RSS_FLOOR_KB = 2048
+BYTES_FLOOR = 4096
+
+# (metric, noise floor) pairs checked against the baseline
+GATED = (("cold", COLD_FLOOR), ("warm", WALL_FLOOR), ("peak_rss_kb", RSS_FLOOR_KB), ("bytes_written", BYTES_FLOOR))
+
+
+def _consume(results: object) -> None:
+    for _ in results:  # type: ignore[attr-defined]
+        pass
+
+
+def _sync(todo: object) -> None:
+    os.makedirs("replica", exist_ok=True)
+    todo.sync("replica")  # type: ignore[attr-defined]
+
+
+def _agenda(todo: object) -> None:
+    for rule in ("daily", "every 2 weeks", "monthly", "cron: * * mon-fri"):
+        todo.add_recurring("Benchmark chore", rule)  # type: ignore[attr-defined]
+    _consume(todo.agenda(days=31))  # type: ignore[attr-defined]
+
+
+def _tree(todo: object) -> None:
+    todo.add_task("Benchmark subtask", parent=1)  # type: ignore[attr-defined]
+    todo.tree()  # type: ignore[attr-defined]
+    todo.add_task("Benchmark subtask", parent=2)  # type: ignore[attr-defined]
+    todo.tree(1)  # type: ignore[attr-defined]
+
+
+# name -> function(todo, tasks) run against a fresh copy of the dataset
+LIBRARY_CASES: Dict[str, Callable] = {
+    "load": lambda todo, tasks: todo.load_tasks(),
+    "save": lambda todo, tasks: todo.save_tasks(tasks),
+    "add": lambda todo, tasks: todo.add_task("Benchmark task", "high", ["bench"]),
+    "list": lambda todo, tasks: _consume(todo.list_tasks()),
+    "list-filtered": lambda todo, tasks: _consume(todo.list_tasks("pending", "high", ["tag1"])),
+    "search": lambda todo, tasks: _consume(todo.search_tasks("report")),
+    "complete": lambda todo, tasks: todo.complete_task(len(tasks) // 2 + 1),
+    "remove": lambda todo, tasks: todo.remove_task(len(tasks) // 2 + 1),
+    "clear": lambda todo, tasks: todo.clear_completed(),
+    "clear-undo": lambda todo, tasks: (todo.clear_completed(), todo.undo()),
+    "tags": lambda todo, tasks: todo.list_tags(),
+    "stats": lambda todo, tasks: todo.get_statistics(),
+    "next": lambda todo, tasks: todo.next_tasks(10),
+    "report": lambda todo, tasks: todo.report("month"),
+    "dedupe": lambda todo, tasks: todo.find_duplicates(),
+    "search-fuzzy": lambda todo, tasks: todo.fuzzy_search("reprot"),
+    "sync": lambda todo, tasks: _sync(todo),
+    "agenda": lambda todo, tasks: _agenda(todo),
+    "verify": lambda todo, tasks: todo.verify(),
+    "tree": lambda todo, tasks: _tree(todo),
+    "export-json": lambda todo, tasks: todo.export_tasks("json", "export.json"),
+    "export-csv": lambda todo, tasks: todo.export_tasks("csv", "export.csv"),
+    "export-markdown": lambda todo, tasks: todo.export_tasks("markdown", "export.md"),
+}
+
+# name -> argv passed to `todo`
+CLI_CASES: Dict[str, List[str]] = {
+    "cli-list": ["list"],
+    "cli-list-ndjson": ["list", "--ndjson"],
+    "cli-search": ["search", "report"],
+    "cli-add": ["add", "Benchmark task", "--tags", "bench"],
+    "cli-complete": ["complete", "1"],
+    "cli-stats": ["stats"],
+    "cli-next": ["next", "-n", "10"],
+    "cli-report": ["report", "--by", "month"],
+    "cli-tags": ["tags"],
+    "cli-export": ["export", "--format", "csv", "--output", "export.csv"],
+    "cli-verify": ["verify"],
+}
+
+
+def _snapshot(directory: str) -> Dict[str, Tuple[int, int]]:
+    """Return (mtime_ns, size) for every file in a directory."""
+    result = {}
+    for entry in os.scandir(directory):
+        if entry.is_file():
+            st = entry.stat()
+            result[entry.name] = (st.st_mtime_ns, st.st_size)
+    return result
+
+
+def _bytes_written(before: Dict[str, Tuple[int, int]], after: Dict[str, Tuple[int, int]]) -> int:
+    """Sum the sizes of files created or modified between two snapshots."""
+    return sum(size for name, (mtime, size) in after.items() if before.get(name) != (mtime, size))
+
+
+def _run_child(argv: List[str], cwd: str) -> Tuple[float, Optional[int], bytes]:
+    """Run a child process and return (wall seconds, peak RSS in KiB, stdout)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([SRC, ROOT]), NO_COLOR="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen(argv, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    out = proc.stdout.read() if proc.stdout else b""
+    rss: Optional[int] = None
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") else status
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    else:
+        proc.wait()
+    elapsed = time.perf_counter() - start
+    if proc.stdout:
+        proc.stdout.close()
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} exited with status {proc.returncode}")
+    return elapsed, rss, out
+
+
+def _worker(case: str, workdir: str, pristine: str, repeat: int) -> Dict:
+    """Time one case repeatedly inside this process (runs in the child)."""
+    from todolist.__main__ import main
+    from todolist.core import TodoList
+
+    os.chdir(workdir)
+    todo = TodoList("tasks.json")
+    timings = []
+    written = 0
+
+    for i in range(repeat):
+        shutil.copyfile(pristine, "tasks.json")
+        tasks = todo.load_tasks()
+        before = _snapshot(workdir)
+        if case in LIBRARY_CASES:
+            start = time.perf_counter()
+            LIBRARY_CASES[case](todo, tasks)
+            timings.append(time.perf_counter() - start)
+        else:
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                try:
+                    main(CLI_CASES[case])
+                except SystemExit:
+                    pass
+            timings.append(time.perf_counter() - start)
+        if i == 0:
+            written = _bytes_written(before, _snapshot(workdir))
+
+    warm = timings[1:] or timings
+    return {"cold": timings[0], "warm": statistics.median(warm), "bytes_written": written}
+
+
+def run_case(case: str, pristine: str, repeat: int) -> Dict:
+    """Run one benchmark case in fresh processes.
+
+    Args:
+        case: Case name from LIBRARY_CASES or CLI_CASES
+        pristine: Path to the dataset to copy before every iteration
+        repeat: Number of timed iterations
+
+    Returns:
+        Result dictionary with cold/warm seconds, peak RSS and bytes written
+    """
+    with tempfile.TemporaryDirectory(prefix="todo-bench-") as workdir:
+        argv = [sys.executable, "-m", "benchmarks.run", "--worker", case,
+                "--workdir", workdir, "--pristine", pristine, "--repeat", str(repeat)]
+        _, rss, out = _run_child(argv, ROOT)
+        result = json.loads(out.decode())
+        result["peak_rss_kb"] = rss
+
+        if case in CLI_CASES:
+            # A cold CLI run is a full process start: interpreter, imports, parse, run
+            colds = []
+            for _ in range(repeat):
+                shutil.copyfile(pristine, os.path.join(workdir, "tasks.json"))
+                before = _snapshot(workdir)
+                elapsed, rss, _ = _run_child(
+                    [sys.executable, "-m", "todolist"] + CLI_CASES[case], workdir
+                )
+                colds.append(elapsed)
+                result["bytes_written"] = _bytes_written(before, _snapshot(workdir))
+                if rss is not None:
+                    result["peak_rss_kb"] = max(result["peak_rss_kb"] or 0, rss)
+            result["cold"] = statistics.median(colds)
+    return result
+
+
+def compare(results: Dict[str, Dict[str, Dict]], baseline: Dict[str, Dict[str, Dict]],
+            threshold: float) -> List[str]:
+    """Find results that regressed against the baseline.
+
+    A case without a baseline entry is reported too, so new cases cannot
+    pass unchecked; record one with --save-baseline.
+
+    Args:
+        results: {size: {case: result}} from this run
+        baseline: {size: {case: result}} previously saved
+        threshold: Allowed relative increase (0.25 = 25%)
+
+    Returns:
+        Human-readable description of each regression or missing baseline
+    """
+    regressions = []
+    for size, cases in results.items():
+        for case, result in cases.items():
+            base = baseline.get(size, {}).get(case)
+            if not base:
+                regressions.append(f"{case} @ {size}: no baseline")
+                continue
+            for metric, floor in GATED:
+                old, new = base.get(metric), result.get(metric)
+                if old is None or new is None:
+                    continue
+                if new > old * (1 + threshold) and new - old > floor:
+                    change = f"+{(new / old - 1) * 100:.0f}%" if old else "new"
+                    regressions.append(f"{case} @ {size}: {metric} {old:.4g} -> {new:.4g} ({change})")
+    return regressions
+
+
+def _format_row(case: str, result: Dict, base: Optional[Dict]) -> str:
+    rss = result.get("peak_rss_kb")
+    change = ""
+    if base and base.get("warm"):
+        change = f"{(result['warm'] / base['warm'] - 1) * 100:+.0f}%"
+    return (f"  {case:<18} {result['cold'] * 1000:>10.2f} {result['warm'] * 1000:>10.2f} "
+            f"{(rss or 0) / 1024:>9.1f} {result['bytes_written']:>12} {change:>8}")
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Run todo list benchmarks")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated dataset sizes (default: 1000,10000)")
+    parser.add_argument("--cases", help="Comma-separated case names (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed iterations per case (default: 5)")
+    parser.add_argument("--tags", type=int, default=50, help="Tag cardinality (default: 50)")
+    parser.add_argument("--completed", type=float, default=0.3, help="Completion ratio (default: 0.3)")
+    parser.add_argument("--due-spread", type=int, default=90, help="Due date spread in days (default: 90)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown (default: 0.25)")
+    parser.add_argument("--json-out", help="Also write results to this JSON file")
+    # Internal: run a single case inside a worker process
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--pristine", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        sys.path.insert(0, SRC)
+        print(json.dumps(_worker(args.worker, args.workdir, args.pristine, args.repeat)))
+        return
+
+    from benchmarks.datagen import write_dataset
+
+    all_cases = list(LIBRARY_CASES) + list(CLI_CASES)
+    cases = args.cases.split(",") if args.cases else all_cases
+    unknown = set(cases) - set(all_cases)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    baseline: Dict[str, Dict[str, Dict]] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("results", {})
+
+    results: Dict[str, Dict[str, Dict]] = {}
+    with tempfile.TemporaryDirectory(prefix="todo-bench-data-") as datadir:
+        for size in [int(s) for s in args.sizes.split(",")]:
+            pristine = os.path.join(datadir, f"tasks-{size}.json")
+            write_dataset(pristine, size, tag_cardinality=args.tags, completion_ratio=args.completed,
+                          due_spread_days=args.due_spread, seed=args.seed)
+            print(f"\n{size} tasks ({os.path.getsize(pristine)} bytes)")
+            print(f"  {'case':<18} {'cold ms':>10} {'warm ms':>10} {'peak MiB':>9} {'bytes out':>12} {'vs base':>8}")
+            size_results = results.setdefault(str(size), {})
+            for case in cases:
+                size_results[case] = run_case(case, pristine, args.repeat)
+                print(_format_row(case, size_results[case], baseline.get(str(size), {}).get(case)))
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+
+    if args.save_baseline:
+        merged = dict(baseline)
+        for size, cases_result in results.items():
+            merged.setdefault(size, {}).update(cases_result)
+        with open(args.baseline, "w") as f:
+            json.dump({"python": sys.version.split()[0], "results": merged}, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.baseline}")
+        return
+
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; record one with --save-baseline.")
+        return
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} or missing from the baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
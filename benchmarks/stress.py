@@ -0,0 +1,395 @@
+"""Concurrency stress and crash-injection harness for the storage layer.
+
+Runs a mixed add/complete/remove/list workload against one tasks file from
+many concurrent workers, either separate ``todo`` processes or threads each
+holding its own ``TodoList``. In process mode some writes are killed part
+way through. Afterwards the file is checked against what the workers were
+told succeeded:
+
+- every acknowledged add and complete is still there (no lost updates),
+- every acknowledged remove stayed removed,
+- nothing appears that no worker added,
+- the file verifies, loads without recovery and no damaged copy was kept.
+
+A killed operation may or may not have taken effect, so each kill excuses at
+most one task from these checks. Throughput and p50/p99 latency are reported
+for every concurrency level, so storage changes can be judged on both
+safety and scaling. The run exits with status 1 on any violation.
+
+Example:
+    python -m benchmarks.stress --concurrency 1,4,16 --ops 40
+    python -m benchmarks.stress --mode threads --concurrency 1,8,32 --ops 200
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+
+# Relative frequency of each operation
+WORKLOAD: Dict[str, int] = {"add": 4, "complete": 2, "remove": 2, "list": 3}
+WRITES = ("add", "complete", "remove")
+
+# An operation taking longer than this is reported as hung (e.g. a lock never released)
+TIMEOUT = 60.0
+
+
+@dataclass
+class Outcome:
+    """What one operation did, as its worker saw it.
+
+    Attributes:
+        op: Operation name (add, complete, remove or list)
+        latency: Wall time in seconds
+        description: Description of the task an add created
+        task: Task the operation returned (None if it changed nothing)
+        killed: Whether the process was killed before it finished
+        error: Unexpected failure message, if any
+    """
+    op: str
+    latency: float
+    description: str = ""
+    task: Optional[Dict] = None
+    killed: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class LevelResult:
+    """Results for one concurrency level.
+
+    Attributes:
+        mode: "processes" or "threads"
+        concurrency: Number of concurrent workers
+        ops: Operations attempted
+        seconds: Wall time of the whole level
+        p50_ms: Median latency of operations that ran to completion
+        p99_ms: 99th percentile latency of operations that ran to completion
+        killed: Operations killed mid-flight
+        tasks: Tasks in the file afterwards
+        violations: Safety violations found
+    """
+    mode: str
+    concurrency: int
+    ops: int
+    seconds: float
+    p50_ms: float
+    p99_ms: float
+    killed: int = 0
+    tasks: int = 0
+    violations: List[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Operations per second."""
+        return self.ops / self.seconds if self.seconds else 0.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of some values (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _choose(rng: random.Random) -> str:
+    return rng.choices(list(WORKLOAD), weights=list(WORKLOAD.values()))[0]
+
+
+def _run_todo(argv: List[str], cwd: str, kill_after: Optional[float]) -> Tuple[float, bool, int, bytes, bytes]:
+    """Run one ``todo`` process, optionally killing it after a delay.
+
+    Returns:
+        (wall seconds, killed, exit status, stdout, stderr)
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([SRC, ROOT]), NO_COLOR="1")
+    env.pop("TODO_TRACE", None)
+    env.pop("TODO_METRICS_FILE", None)
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "todolist"] + argv, cwd=cwd, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    killed = False
+    try:
+        out, err = proc.communicate(timeout=kill_after if kill_after is not None else TIMEOUT)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        out, err = proc.communicate()
+        killed = kill_after is not None
+        if not killed:
+            err += b"\nhung: killed after %d s" % TIMEOUT
+    return time.perf_counter() - start, killed, proc.returncode, out, err
+
+
+def _process_worker(workdir: str, worker: int, ops: int, kill_rate: float, seed: int) -> List[Outcome]:
+    """Run operations one after another as separate ``todo`` processes."""
+    rng = random.Random(seed * 1000 + worker)
+    outcomes: List[Outcome] = []
+    size = 1
+    write_times: List[float] = []
+    for n in range(ops):
+        op = _choose(rng)
+        description = f"w{worker}-{n}"
+        if op == "add":
+            argv = ["add", description, "--json"]
+        elif op == "list":
+            argv = ["list", "--json"]
+        else:
+            argv = [op, str(rng.randint(1, size)), "--json"]
+        kill_after = None
+        if op in WRITES and rng.random() < kill_rate:
+            # The file is written at the end of a run, so aim at the tail
+            typical = percentile(write_times, 50) if write_times else 0.2
+            kill_after = rng.uniform(0.5, 1.1) * typical
+        latency, killed, status, out, err = _run_todo(argv, workdir, kill_after)
+        outcome = Outcome(op, latency, description if op == "add" else "", killed=killed)
+        if killed:
+            outcomes.append(outcome)
+            continue
+        if op in WRITES:
+            write_times.append(latency)
+        try:
+            record = json.loads(out.decode()) if out.strip() else None
+        except ValueError:
+            record = None
+        stderr = err.decode(errors="replace").strip()
+        if isinstance(record, list):
+            size = max(len(record), 1)
+        elif isinstance(record, dict) and "error" not in record:
+            outcome.task = record
+        elif not (isinstance(record, dict) and record.get("error") == "Invalid task number"):
+            outcome.error = f"`todo {' '.join(argv)}` exited {status}: {stderr or out.decode(errors='replace')}"
+        if stderr and outcome.error is None:
+            # Recovery warnings mean a damaged file was seen
+            outcome.error = f"`todo {' '.join(argv)}`: {stderr}"
+        outcomes.append(outcome)
+    return outcomes
+
+
+def _thread_worker(path: str, worker: int, ops: int, seed: int) -> List[Outcome]:
+    """Run operations through a TodoList of this thread's own."""
+    from todolist.core import TodoList
+
+    rng = random.Random(seed * 1000 + worker)
+    todo = TodoList(path)
+    outcomes: List[Outcome] = []
+    size = 1
+    for n in range(ops):
+        op = _choose(rng)
+        description = f"w{worker}-{n}"
+        start = time.perf_counter()
+        outcome = Outcome(op, 0.0, description if op == "add" else "")
+        try:
+            if op == "add":
+                outcome.task = todo.add_task(description)
+            elif op == "list":
+                size = max(sum(1 for _ in todo.list_tasks()), 1)
+            elif op == "complete":
+                outcome.task = todo.complete_task(rng.randint(1, size))
+            else:
+                outcome.task = todo.remove_task(rng.randint(1, size))
+        except Exception as e:  # pylint: disable=broad-except
+            outcome.error = f"{op}: {type(e).__name__}: {e}"
+        outcome.latency = time.perf_counter() - start
+        outcomes.append(outcome)
+    return outcomes
+
+
+def seed_tasks(path: str, count: int) -> List[str]:
+    """Write the starting list of pending tasks.
+
+    Args:
+        path: Tasks file to create
+        count: Number of tasks
+
+    Returns:
+        Ids of the tasks written
+    """
+    from todolist.core import TodoList, make_task
+
+    tasks = [make_task(f"seed-{i}") for i in range(count)]
+    TodoList(path).save_tasks(tasks)
+    return [task["id"] for task in tasks]
+
+
+def check(path: str, seeded: List[str], outcomes: List[Outcome]) -> List[str]:
+    """Compare a tasks file with what the workers were told.
+
+    Args:
+        path: Tasks file the workers used
+        seeded: Ids of the tasks present before the run
+        outcomes: Every operation's outcome
+
+    Returns:
+        Description of each violation (empty if the file is consistent)
+    """
+    from todolist.storage import CorruptTasksError, TaskStore
+
+    violations = [o.error for o in outcomes if o.error]
+    store = TaskStore(path)
+    report = store.verify()
+    if not report.ok:
+        violations.append(f"verify: {[d.reason for d in report.damaged] + report.errors}")
+    directory, name = os.path.split(os.path.abspath(path))
+    kept = sorted(f for f in os.listdir(directory) if f.startswith(name + ".corrupt-"))
+    if kept:
+        violations.append(f"damaged copies were kept: {', '.join(kept)}")
+    try:
+        tasks = store.read()
+    except CorruptTasksError as e:
+        return violations + [str(e)]
+
+    killed = {op: sum(1 for o in outcomes if o.killed and o.op == op) for op in WRITES}
+    final = {}
+    for task in tasks:
+        if task.get("id") in final:
+            violations.append(f"duplicate task id {task.get('id')}")
+        final[task.get("id")] = task
+    added = set(seeded) | {o.task["id"] for o in outcomes if o.op == "add" and o.task}
+    maybe_added = {o.description for o in outcomes if o.op == "add" and o.killed}
+    removed = {o.task["id"] for o in outcomes if o.op == "remove" and o.task}
+    completed = {o.task["id"] for o in outcomes if o.op == "complete" and o.task} - removed
+
+    unexpected = [t for tid, t in final.items() if tid not in added and t.get("task") not in maybe_added]
+    if unexpected:
+        violations.append(f"{len(unexpected)} task(s) no worker added, e.g. {unexpected[0].get('task')!r}")
+    if len(final) - len(added & set(final)) > killed["add"]:
+        violations.append(f"more unacknowledged adds survived than adds were killed ({killed['add']})")
+    resurrected = removed & set(final)
+    if resurrected:
+        violations.append(f"{len(resurrected)} removed task(s) came back")
+    missing = (added - removed) - set(final)
+    if len(missing) > killed["remove"]:
+        violations.append(
+            f"lost update: {len(missing)} acknowledged task(s) missing, "
+            f"only {killed['remove']} remove(s) were killed"
+        )
+    reverted = [tid for tid in completed & set(final) if final[tid].get("status") != "completed"]
+    if reverted:
+        violations.append(f"lost update: {len(reverted)} acknowledged completion(s) undone")
+    stray = [tid for tid, t in final.items() if t.get("status") == "completed" and tid not in completed]
+    if len(stray) > killed["complete"]:
+        violations.append(
+            f"{len(stray)} task(s) completed without acknowledgement, "
+            f"only {killed['complete']} complete(s) were killed"
+        )
+    return violations
+
+
+def run_level(mode: str, concurrency: int, ops: int, workdir: str, kill_rate: float = 0.0,
+              initial: int = 20, seed: int = 0) -> LevelResult:
+    """Run the workload at one concurrency level and check the result.
+
+    Args:
+        mode: "processes" (separate ``todo`` runs, kills possible) or "threads"
+        concurrency: Number of concurrent workers
+        ops: Operations per worker
+        workdir: Empty directory to hold the tasks file
+        kill_rate: Fraction of process-mode writes to kill part way through
+        initial: Number of tasks to start with
+        seed: Random seed for the workload
+
+    Returns:
+        Timings and violations for the level
+    """
+    from todolist.storage import CorruptTasksError, TaskStore
+
+    path = os.path.join(workdir, "tasks.json")
+    seeded = seed_tasks(path, initial)
+    results: List[List[Outcome]] = [[] for _ in range(concurrency)]
+
+    def target(worker: int) -> None:
+        if mode == "processes":
+            results[worker] = _process_worker(workdir, worker, ops, kill_rate, seed)
+        else:
+            results[worker] = _thread_worker(path, worker, ops, seed)
+
+    threads = [threading.Thread(target=target, args=(w,)) for w in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    outcomes = [o for worker in results for o in worker]
+    latencies = [o.latency for o in outcomes if not o.killed]
+    result = LevelResult(
+        mode, concurrency, len(outcomes), elapsed,
+        percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000,
+        killed=sum(o.killed for o in outcomes),
+    )
+    result.violations = check(path, seeded, outcomes)
+    try:
+        result.tasks = len(TaskStore(path).read())
+    except CorruptTasksError:
+        pass
+    return result
+
+
+def _format_row(result: LevelResult) -> str:
+    status = "ok" if not result.violations else f"{len(result.violations)} violation(s)"
+    return (f"  {result.mode:<10} {result.concurrency:>5} {result.ops:>6} {result.throughput:>9.1f} "
+            f"{result.p50_ms:>9.1f} {result.p99_ms:>9.1f} {result.killed:>6} {result.tasks:>6}  {status}")
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Stress concurrent and interrupted writes to one task list")
+    parser.add_argument("--mode", choices=["processes", "threads", "both"], default="both",
+                        help="Run workers as todo processes, threads, or both (default: both)")
+    parser.add_argument("--concurrency", default="1,2,4,8",
+                        help="Comma-separated worker counts (default: 1,2,4,8)")
+    parser.add_argument("--ops", type=int, default=25, help="Operations per worker (default: 25)")
+    parser.add_argument("--kill-rate", type=float, default=0.2,
+                        help="Fraction of process writes killed mid-flight (default: 0.2)")
+    parser.add_argument("--initial", type=int, default=20, help="Tasks to start with (default: 20)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--keep", action="store_true", help="Keep the work directories of failed levels")
+    parser.add_argument("--json-out", help="Also write results to this JSON file")
+    args = parser.parse_args()
+    sys.path.insert(0, SRC)
+
+    modes = ["processes", "threads"] if args.mode == "both" else [args.mode]
+    print(f"  {'mode':<10} {'conc':>5} {'ops':>6} {'ops/s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+          f"{'killed':>6} {'tasks':>6}  result")
+    results: List[LevelResult] = []
+    for mode in modes:
+        for concurrency in [int(c) for c in args.concurrency.split(",")]:
+            workdir = tempfile.mkdtemp(prefix="todo-stress-")
+            result = run_level(mode, concurrency, args.ops, workdir, args.kill_rate, args.initial, args.seed)
+            results.append(result)
+            print(_format_row(result))
+            for violation in result.violations[:10]:
+                print(f"      {violation}")
+            if result.violations and args.keep:
+                print(f"      kept {workdir}")
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump({"results": [dict(asdict(r), throughput=r.throughput) for r in results]}, f, indent=2)
+
+    failed = sum(1 for r in results if r.violations)
+    if failed:
+        print(f"\n{failed} level(s) with violations.")
+        sys.exit(1)
+    print("\nNo violations.")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ _todo_completions() {
     local cur prev words cword
     _init_completion || return
 
-    local commands="add list remove complete search clear tags stats export"
+    local commands="add list watch next remove complete move tree search clear tags stats report dedupe sync undo redo history recur agenda verify export metrics"
     local priorities="high medium low"
     local statuses="pending completed"
     local formats="json csv markdown"
@@ -24,11 +24,11 @@ _todo_completions() {
                     COMPREPLY=($(compgen -W "$priorities" -- "$cur"))
                     return
                     ;;
-                -t|--tags|-d|--due)
+                -t|--tags|-d|--due|--parent)
                     return
                     ;;
             esac
-            COMPREPLY=($(compgen -W "-p --priority -t --tags -d --due" -- "$cur"))
+            COMPREPLY=($(compgen -W "-p --priority -t --tags -d --due --parent --check-duplicates" -- "$cur"))
             ;;
         list)
             case "$prev" in
@@ -59,10 +59,119 @@ _todo_completions() {
             esac
             COMPREPLY=($(compgen -W "-f --format -o --output" -- "$cur"))
             ;;
+        dedupe)
+            case "$prev" in
+                --threshold)
+                    return
+                    ;;
+            esac
+            COMPREPLY=($(compgen -W "--threshold -a --all" -- "$cur"))
+            ;;
+        report)
+            case "$prev" in
+                --by)
+                    COMPREPLY=($(compgen -W "day week month" -- "$cur"))
+                    return
+                    ;;
+                -t|--tags|--last)
+                    return
+                    ;;
+            esac
+            COMPREPLY=($(compgen -W "--by -t --tags --last" -- "$cur"))
+            ;;
+        next)
+            COMPREPLY=($(compgen -W "-n --count" -- "$cur"))
+            ;;
+        watch)
+            case "$prev" in
+                -s|--status)
+                    COMPREPLY=($(compgen -W "$statuses" -- "$cur"))
+                    return
+                    ;;
+                -p|--priority)
+                    COMPREPLY=($(compgen -W "$priorities" -- "$cur"))
+                    return
+                    ;;
+                -t|--tags|--interval)
+                    return
+                    ;;
+            esac
+            COMPREPLY=($(compgen -W "-s --status -p --priority -t --tags --interval --poll" -- "$cur"))
+            ;;
+        history)
+            COMPREPLY=($(compgen -W "-n --limit" -- "$cur"))
+            ;;
+        sync)
+            if [[ "$cur" == -* ]]; then
+                COMPREPLY=($(compgen -W "-n --dry-run" -- "$cur"))
+            else
+                _filedir
+            fi
+            ;;
+        recur)
+            if [[ $cword -eq 2 ]]; then
+                COMPREPLY=($(compgen -W "add list remove done" -- "$cur"))
+                return
+            fi
+            case "$prev" in
+                -p|--priority)
+                    COMPREPLY=($(compgen -W "$priorities" -- "$cur"))
+                    return
+                    ;;
+                -r|--rule)
+                    COMPREPLY=($(compgen -W "daily weekly monthly yearly" -- "$cur"))
+                    return
+                    ;;
+                -t|--tags|--start|--on)
+                    return
+                    ;;
+            esac
+            case "${words[2]}" in
+                add)
+                    COMPREPLY=($(compgen -W "-r --rule --start -p --priority -t --tags" -- "$cur"))
+                    ;;
+                done)
+                    COMPREPLY=($(compgen -W "--on" -- "$cur"))
+                    ;;
+            esac
+            ;;
+        move)
+            COMPREPLY=($(compgen -W "--parent --root" -- "$cur"))
+            ;;
+        tree)
+            COMPREPLY=($(compgen -W "-d --depth" -- "$cur"))
+            ;;
+        agenda)
+            case "$prev" in
+                --from|--days)
+                    return
+                    ;;
+            esac
+            COMPREPLY=($(compgen -W "--from --days" -- "$cur"))
+            ;;
+        metrics)
+            case "$prev" in
+                -f|--format)
+                    COMPREPLY=($(compgen -W "prometheus openmetrics" -- "$cur"))
+                    return
+                    ;;
+                -o|--output)
+                    _filedir
+                    return
+                    ;;
+            esac
+            COMPREPLY=($(compgen -W "-f --format -o --output" -- "$cur"))
+            ;;
         remove|complete)
             # Could potentially list task numbers here
             ;;
         search)
+            case "$prev" in
+                --max-distance)
+                    return
+                    ;;
+            esac
+            COMPREPLY=($(compgen -W "-f --fuzzy --max-distance" -- "$cur"))
             ;;
         *)
             ;;
@@ -7,7 +7,7 @@ import os
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from todolist import TodoList
+from todolist import TodoList, display
 
 
 def main():
@@ -24,35 +24,36 @@ def main():
 
     # Add some tasks
     print("Adding tasks...")
-    todo.add_task("Learn Python programming", priority="high")
-    todo.add_task("Build a web application", priority="medium")
-    todo.add_task("Read Python documentation", priority="low")
-    todo.add_task("Write unit tests", priority="high")
+    display.print_added(todo.add_task("Learn Python programming", priority="high"))
+    display.print_added(todo.add_task("Build a web application", priority="medium"))
+    display.print_added(todo.add_task("Read Python documentation", priority="low"))
+    display.print_added(todo.add_task("Write unit tests", priority="high"))
     print()
 
     # List all tasks
     print("All tasks:")
-    todo.list_tasks()
+    display.print_tasks(todo.list_tasks())
     print()
 
     # Complete some tasks
     print("Completing task #1...")
-    todo.complete_task(1)
+    display.print_completed(todo.complete_task(1))
     print()
 
-    # List pending tasks only
-    print("Pending tasks only:")
-    todo.list_tasks(status="pending")
+    # Methods return plain data, so results can be used directly
+    print("Pending task descriptions:")
+    for index, task in todo.list_tasks(status="pending"):
+        print(f"  {index}: {task['task']}")
     print()
 
     # List high priority tasks
     print("High priority tasks:")
-    todo.list_tasks(priority="high")
+    display.print_tasks(todo.list_tasks(priority="high"), filtered=True)
     print()
 
     # Search for tasks
     print("Searching for 'Python':")
-    todo.search_tasks("Python")
+    display.print_search_results("Python", todo.search_tasks("Python"))
     print()
 
     # Add more tasks and complete them
@@ -61,19 +62,19 @@ def main():
     todo.complete_task(2)
     print()
 
-    # List completed tasks
-    print("Completed tasks:")
-    todo.list_tasks(status="completed")
+    # Statistics are returned as a dataclass
+    stats = todo.get_statistics()
+    print(f"{stats.completed} of {stats.total} tasks done ({stats.completion_pct:.0f}%)")
     print()
 
     # Clear completed tasks
     print("Clearing completed tasks...")
-    todo.clear_completed()
+    print(f"Cleared {todo.clear_completed()} task(s)")
     print()
 
     # Final task list
     print("Final task list:")
-    todo.list_tasks()
+    display.print_tasks(todo.list_tasks())
     print()
 
     print("=" * 50)
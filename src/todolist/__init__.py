@@ -4,6 +4,41 @@ __version__ = "1.0.0"
 __author__ = "codeforgood-org"
 __license__ = "MIT"
 
-from .core import TodoList
+from typing import Any
 
-__all__ = ["TodoList"]
+from .core import TaskStatistics, TodoList
+
+# Re-exported on first access, so `todo` does not import asyncio and every
+# feature module just to start up
+_LAZY = {
+    "AgendaItem": "recurrence",
+    "AsyncTodoList": "aio",
+    "CorruptTasksError": "storage",
+    "PeriodStats": "rollups",
+    "RecoveredTasksWarning": "storage",
+    "Report": "rollups",
+    "SyncResult": "sync",
+    "TreeRow": "hierarchy",
+    "VerifyReport": "storage",
+    "display": None,
+}
+
+__all__ = [
+    "AgendaItem", "AsyncTodoList", "CorruptTasksError", "PeriodStats", "RecoveredTasksWarning", "Report",
+    "SyncResult", "TaskStatistics", "TodoList", "TreeRow", "VerifyReport", "display",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import lazily re-exported names on first access."""
+    import importlib
+
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = _LAZY[name]
+    if module is None:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -1,10 +1,78 @@
 """CLI entry point for the todo list manager."""
 
 import argparse
+import os
 import sys
-from typing import Optional
+import time
+import warnings
+from datetime import date, datetime
+from typing import List, Optional
+
+from . import colors, display, metrics, output
+from .core import TodoList, Priority, Status, default_export_path
+from .dedupe import DEFAULT_THRESHOLD
+from .locking import file_lock
+from .profiling import span, trace_format_from_env, tracer
+from .rollups import PERIODS
+from .storage import RecoveredTasksWarning
+from .watch import DEFAULT_INTERVAL, FileWatcher, LiveScreen
+
+
+def _format_flags() -> argparse.ArgumentParser:
+    """Build the parent parser holding the --json/--ndjson shortcuts.
+
+    Defaults are suppressed so a flag given after the command does not get
+    overwritten, and one given before it is not reset.
+    """
+    flags = argparse.ArgumentParser(add_help=False)
+    flags.add_argument(
+        "--json",
+        dest="output_format",
+        action="store_const",
+        const="json",
+        default=argparse.SUPPRESS,
+        help="Write results as a JSON document (same as --output json)"
+    )
+    flags.add_argument(
+        "--ndjson",
+        dest="output_format",
+        action="store_const",
+        const="ndjson",
+        default=argparse.SUPPRESS,
+        help="Write results as one JSON object per line (same as --output ndjson)"
+    )
+    return flags
+
+
+def _output_flag() -> argparse.ArgumentParser:
+    """Build the parent parser holding the --output format option."""
+    flags = argparse.ArgumentParser(add_help=False)
+    flags.add_argument(
+        "--output",
+        dest="output_format",
+        choices=output.FORMATS,
+        default=argparse.SUPPRESS,
+        help="Output format (default: text)"
+    )
+    return flags
 
-from .core import TodoList, Priority, Status
+
+def _date(text: str) -> date:
+    """Parse a YYYY-MM-DD command-line date.
+
+    Args:
+        text: Argument value
+
+    Returns:
+        The date
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a date
+    """
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {text!r} (expected YYYY-MM-DD)")
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -17,6 +85,7 @@ def create_parser() -> argparse.ArgumentParser:
         prog="todo",
         description="A powerful command-line todo list manager with colors, tags, and more",
         formatter_class=argparse.RawDescriptionHelpFormatter,
+        parents=[_format_flags(), _output_flag()],
         epilog="""
 Examples:
   todo add "Buy groceries" --priority high --tags shopping,personal
@@ -24,19 +93,52 @@ Examples:
   todo list
   todo list --status pending --priority high
   todo list --tags work
+  todo watch --status pending
   todo complete 1
+  todo add "Write chapter 1" --parent 3
+  todo tree 3
+  todo undo
+  todo recur add "Water plants" --rule "every 3 days"
+  todo recur add "Standup" --rule "cron: * * mon-fri" --tags work
+  todo agenda --days 14
+  todo next -n 3
   todo search "project"
+  todo search --fuzzy "projcet"
   todo stats
+  todo report --by month
+  todo dedupe
+  todo sync ~/Dropbox/todo --dry-run
   todo tags
   todo export --format markdown
+  todo verify
   todo clear
+  todo list --status pending --output ndjson | jq .task
         """
     )
+    parser.set_defaults(output_format="text")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-phase timing breakdown to stderr (also enabled by TODO_TRACE=1)"
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=["table", "json"],
+        default="table",
+        help="Format of the timing breakdown (default: table)"
+    )
+    parser.add_argument(
+        "--profile-dump",
+        metavar="FILE",
+        help="Write cProfile statistics to FILE (implies --profile)"
+    )
+    # Every command accepts the output flags; export keeps -o/--output for its path
+    common = [_format_flags(), _output_flag()]
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # Add command
-    add_parser = subparsers.add_parser("add", help="Add a new task")
+    add_parser = subparsers.add_parser("add", help="Add a new task", parents=common)
     add_parser.add_argument("description", nargs="+", help="Task description")
     add_parser.add_argument(
         "-p", "--priority",
@@ -52,9 +154,20 @@ Examples:
         "-d", "--due",
         help="Due date (e.g., 2025-11-15 or 'tomorrow')"
     )
+    add_parser.add_argument(
+        "--parent",
+        type=int,
+        metavar="N",
+        help="Add as a subtask of task N"
+    )
+    add_parser.add_argument(
+        "--check-duplicates",
+        action="store_true",
+        help="Warn if similar pending tasks already exist"
+    )
 
     # List command
-    list_parser = subparsers.add_parser("list", help="List tasks")
+    list_parser = subparsers.add_parser("list", help="List tasks", parents=common)
     list_parser.add_argument(
         "-s", "--status",
         choices=["pending", "completed"],
@@ -70,29 +183,246 @@ Examples:
         help="Filter by tags (comma-separated)"
     )
 
+    # Watch command
+    watch_parser = subparsers.add_parser(
+        "watch", help="Keep a live view of tasks open, redrawn when the file changes", parents=common
+    )
+    watch_parser.add_argument(
+        "-s", "--status",
+        choices=["pending", "completed"],
+        help="Filter by status"
+    )
+    watch_parser.add_argument(
+        "-p", "--priority",
+        choices=["high", "medium", "low"],
+        help="Filter by priority"
+    )
+    watch_parser.add_argument(
+        "-t", "--tags",
+        help="Filter by tags (comma-separated)"
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help=f"Seconds between checks when polling (default: {DEFAULT_INTERVAL:g})"
+    )
+    watch_parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Poll the file even where inotify is available"
+    )
+
+    # Next command
+    next_parser = subparsers.add_parser(
+        "next", help="Show the most urgent pending tasks", parents=common
+    )
+    next_parser.add_argument(
+        "-n", "--count",
+        type=int,
+        default=1,
+        help="Number of tasks to show (default: 1)"
+    )
+
     # Remove command
-    remove_parser = subparsers.add_parser("remove", help="Remove a task")
+    remove_parser = subparsers.add_parser("remove", help="Remove a task", parents=common)
     remove_parser.add_argument("index", type=int, help="Task number to remove")
 
     # Complete command
-    complete_parser = subparsers.add_parser("complete", help="Mark a task as completed")
+    complete_parser = subparsers.add_parser("complete", help="Mark a task as completed", parents=common)
     complete_parser.add_argument("index", type=int, help="Task number to complete")
 
+    # Move command
+    move_parser = subparsers.add_parser(
+        "move", help="Make a task a subtask of another, or top-level again", parents=common
+    )
+    move_parser.add_argument("index", type=int, help="Task number to move")
+    move_target = move_parser.add_mutually_exclusive_group(required=True)
+    move_target.add_argument("--parent", type=int, metavar="N", help="New parent task number")
+    move_target.add_argument("--root", action="store_true", help="Make it a top-level task")
+
+    # Tree command
+    tree_parser = subparsers.add_parser(
+        "tree", help="Show tasks with their subtasks and progress", parents=common
+    )
+    tree_parser.add_argument(
+        "index",
+        type=int,
+        nargs="?",
+        help="Task number to show (default: every task that has subtasks)"
+    )
+    tree_parser.add_argument(
+        "-d", "--depth",
+        type=int,
+        help="Deepest level of subtasks to show (default: all)"
+    )
+
     # Search command
-    search_parser = subparsers.add_parser("search", help="Search for tasks")
+    search_parser = subparsers.add_parser("search", help="Search for tasks", parents=common)
     search_parser.add_argument("query", help="Search query")
+    search_parser.add_argument(
+        "-f", "--fuzzy",
+        action="store_true",
+        help="Tolerate typos and rank results by closeness"
+    )
+    search_parser.add_argument(
+        "--max-distance",
+        type=int,
+        help="Typos tolerated per word with --fuzzy (default: by word length)"
+    )
 
     # Clear command
-    subparsers.add_parser("clear", help="Clear all completed tasks")
+    subparsers.add_parser("clear", help="Clear all completed tasks", parents=common)
 
     # Tags command
-    subparsers.add_parser("tags", help="List all tags with task counts")
+    subparsers.add_parser("tags", help="List all tags with task counts", parents=common)
 
     # Stats command
-    subparsers.add_parser("stats", help="Display task statistics")
+    subparsers.add_parser("stats", help="Display task statistics", parents=common)
+
+    # Dedupe command
+    dedupe_parser = subparsers.add_parser(
+        "dedupe", help="Find groups of near-duplicate tasks", parents=common
+    )
+    dedupe_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Minimum similarity from 0 to 1 (default: {DEFAULT_THRESHOLD})"
+    )
+    dedupe_parser.add_argument(
+        "-a", "--all",
+        action="store_true",
+        help="Include completed tasks"
+    )
+
+    # Report command
+    report_parser = subparsers.add_parser(
+        "report", help="Show created vs completed tasks over time", parents=common
+    )
+    report_parser.add_argument(
+        "--by",
+        choices=PERIODS,
+        default="week",
+        help="Period length (default: week)"
+    )
+    report_parser.add_argument(
+        "-t", "--tags",
+        nargs="+",
+        help="Only break down these tags"
+    )
+    report_parser.add_argument(
+        "--last",
+        type=int,
+        help="Only show the most recent N periods"
+    )
+
+    # Undo/redo/history commands
+    subparsers.add_parser("undo", help="Undo the last change", parents=common)
+    subparsers.add_parser("redo", help="Redo the last undone change", parents=common)
+    history_parser = subparsers.add_parser(
+        "history", help="Show recent changes that can be undone", parents=common
+    )
+    history_parser.add_argument(
+        "-n", "--limit",
+        type=int,
+        default=10,
+        help="Number of changes to show (default: 10)"
+    )
+
+    # Sync command
+    sync_parser = subparsers.add_parser(
+        "sync", help="Merge tasks with another task file or directory", parents=common
+    )
+    sync_parser.add_argument(
+        "path",
+        help="Other tasks file, or a directory containing tasks.json"
+    )
+    sync_parser.add_argument(
+        "-n", "--dry-run",
+        action="store_true",
+        help="Show what would change without writing either file"
+    )
+
+    # Recurring task commands
+    recur_parser = subparsers.add_parser("recur", help="Manage recurring tasks", parents=common)
+    recur_commands = recur_parser.add_subparsers(dest="recur_command", help="Recurring task commands")
+    recur_add = recur_commands.add_parser("add", help="Add a recurring task", parents=common)
+    recur_add.add_argument("description", nargs="+", help="Task description")
+    recur_add.add_argument(
+        "-r", "--rule",
+        required=True,
+        help="daily, weekly, monthly, yearly, 'every N days|weeks|months' or 'cron: DOM MON DOW'"
+    )
+    recur_add.add_argument(
+        "--start",
+        type=_date,
+        help="First possible occurrence, YYYY-MM-DD (default: today)"
+    )
+    recur_add.add_argument(
+        "-p", "--priority",
+        choices=["high", "medium", "low"],
+        default="medium",
+        help="Task priority (default: medium)"
+    )
+    recur_add.add_argument(
+        "-t", "--tags",
+        help="Comma-separated list of tags (e.g., home,chores)"
+    )
+    recur_commands.add_parser("list", help="List recurring tasks", parents=common)
+    recur_remove = recur_commands.add_parser("remove", help="Remove a recurring task", parents=common)
+    recur_remove.add_argument("index", type=int, help="Recurring task number to remove")
+    recur_done = recur_commands.add_parser("done", help="Complete one occurrence", parents=common)
+    recur_done.add_argument("index", type=int, help="Recurring task number")
+    recur_done.add_argument(
+        "--on",
+        type=_date,
+        help="Occurrence date, YYYY-MM-DD (default: the latest one due, else the next)"
+    )
+
+    # Agenda command
+    agenda_parser = subparsers.add_parser(
+        "agenda", help="Show tasks and recurring tasks due in the coming days", parents=common
+    )
+    agenda_parser.add_argument(
+        "--from",
+        dest="start",
+        type=_date,
+        help="First day, YYYY-MM-DD (default: today)"
+    )
+    agenda_parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        help="Number of days to show (default: 7)"
+    )
+
+    # Verify command
+    subparsers.add_parser(
+        "verify", help="Check the tasks file for damaged records", parents=common
+    )
+
+    # Metrics command
+    metrics_parser = subparsers.add_parser(
+        "metrics",
+        help="Write operational metrics in Prometheus/OpenMetrics text format",
+        parents=[_format_flags()]
+    )
+    metrics_parser.add_argument(
+        "-f", "--format",
+        choices=metrics.FORMATS,
+        default="prometheus",
+        help="Exposition format (default: prometheus)"
+    )
+    metrics_parser.add_argument(
+        "-o", "--output",
+        help="Write to this file atomically instead of stdout (for textfile collectors)"
+    )
 
     # Export command
-    export_parser = subparsers.add_parser("export", help="Export tasks to file")
+    export_parser = subparsers.add_parser(
+        "export", help="Export tasks to file", parents=[_format_flags()]
+    )
     export_parser.add_argument(
         "-f", "--format",
         choices=["json", "csv", "markdown"],
@@ -107,62 +437,454 @@ Examples:
     return parser
 
 
-def main() -> None:
-    """Main entry point for the CLI."""
-    parser = create_parser()
-
-    # If no arguments provided, show help
-    if len(sys.argv) == 1:
-        parser.print_help()
-        sys.exit(0)
+def _execute(args: argparse.Namespace, parser: argparse.ArgumentParser, todo_list: TodoList) -> None:
+    """Run the parsed command.
 
-    args = parser.parse_args()
-
-    # Initialize todo list
-    todo_list = TodoList()
+    Args:
+        args: Parsed command-line arguments
+        parser: Parser used, for printing help
+        todo_list: Todo list to operate on
+    """
+    fmt = args.output_format
+    text = fmt == "text"
 
     # Execute command
     try:
         if args.command == "add":
             description = " ".join(args.description)
             tags = args.tags.split(",") if args.tags else None
-            todo_list.add_task(description, args.priority, tags, args.due)
+            similar = todo_list.find_similar(description, tags) if args.check_duplicates else None
+            with span("compute"):
+                task = todo_list.add_task(description, args.priority, tags, args.due, args.parent)
+            with span("render"):
+                if text:
+                    display.print_added(task)
+                    if similar:
+                        display.print_similar(similar)
+                elif similar is None:
+                    output.write_record(task, fmt)
+                else:
+                    record = dict(task)
+                    record["similar"] = [
+                        {"index": i, "task": t["task"], "similarity": score} for i, t, score in similar
+                    ]
+                    output.write_record(record, fmt)
 
         elif args.command == "list":
             tags = args.tags.split(",") if args.tags else None
-            todo_list.list_tasks(args.status, args.priority, tags)
-
-        elif args.command == "remove":
-            todo_list.remove_task(args.index)
-
-        elif args.command == "complete":
-            todo_list.complete_task(args.index)
+            results = tracer.timed_iter("filter", todo_list.list_tasks(args.status, args.priority, tags))
+            with span("render"):
+                if text:
+                    shown = display.print_tasks(results, filtered=bool(args.status or args.priority or tags))
+                else:
+                    output.write_tasks(results, fmt)
+            if text and tags and not shown:
+                display.print_tag_suggestions(todo_list.suggest_tags(tags))
+
+        elif args.command == "watch":
+            _watch(args, todo_list)
+
+        elif args.command == "next":
+            results = todo_list.next_tasks(args.count)
+            with span("render"):
+                if text:
+                    display.print_next(results)
+                else:
+                    output.write_tasks(results, fmt)
+
+        elif args.command in ("remove", "complete"):
+            with span("compute"):
+                if args.command == "remove":
+                    task = todo_list.remove_task(args.index)
+                else:
+                    task = todo_list.complete_task(args.index)
+            with span("render"):
+                if task is None:
+                    if text:
+                        display.print_invalid_index()
+                    else:
+                        output.write_error("Invalid task number", fmt, index=args.index)
+                        sys.exit(1)
+                elif not text:
+                    output.write_record(output.task_record(args.index, task), fmt)
+                elif args.command == "remove":
+                    display.print_removed(task)
+                else:
+                    display.print_completed(task)
+
+        elif args.command == "move":
+            with span("compute"):
+                task = todo_list.move_task(args.index, None if args.root else args.parent)
+            with span("render"):
+                if task is None:
+                    if text:
+                        display.print_invalid_index()
+                    else:
+                        output.write_error("Invalid task number", fmt, index=args.index)
+                        sys.exit(1)
+                elif text:
+                    display.print_moved(task, args.parent)
+                else:
+                    output.write_record(output.task_record(args.index, task), fmt)
+
+        elif args.command == "tree":
+            rows = todo_list.tree(args.index, args.depth)
+            with span("render"):
+                if rows is None:
+                    if text:
+                        display.print_invalid_index()
+                    else:
+                        output.write_error("Invalid task number", fmt, index=args.index)
+                        sys.exit(1)
+                elif text:
+                    display.print_tree(rows)
+                else:
+                    output.write_records(map(output.tree_record, rows), fmt)
+
+        elif args.command == "search" and args.fuzzy:
+            matches = todo_list.fuzzy_search(args.query, args.max_distance)
+            with span("render"):
+                if text:
+                    display.print_search_results(args.query, ((i, task) for i, task, _ in matches))
+                else:
+                    output.write_records(output.scored_records(matches), fmt)
 
         elif args.command == "search":
-            todo_list.search_tasks(args.query)
+            results = tracer.timed_iter("filter", todo_list.search_tasks(args.query))
+            with span("render"):
+                if text:
+                    display.print_search_results(args.query, results)
+                else:
+                    output.write_tasks(results, fmt)
 
         elif args.command == "clear":
-            todo_list.clear_completed()
+            with span("compute"):
+                cleared = todo_list.clear_completed()
+            with span("render"):
+                if text:
+                    display.print_cleared(cleared)
+                else:
+                    output.write_record({"cleared": cleared}, fmt)
 
         elif args.command == "tags":
-            todo_list.list_tags()
+            with span("compute"):
+                tag_counts = todo_list.list_tags()
+            with span("render"):
+                if text:
+                    display.print_tags(tag_counts)
+                else:
+                    output.write_tags(tag_counts, fmt)
 
         elif args.command == "stats":
-            todo_list.get_statistics()
+            with span("compute"):
+                stats = todo_list.get_statistics()
+            with span("render"):
+                if text:
+                    display.print_statistics(stats)
+                else:
+                    output.write_record(output.statistics_record(stats), fmt)
+
+        elif args.command == "dedupe":
+            clusters = todo_list.find_duplicates(args.threshold, args.all)
+            with span("render"):
+                if text:
+                    display.print_duplicates(clusters)
+                else:
+                    output.write_records(output.duplicate_records(clusters), fmt)
+
+        elif args.command == "report":
+            report = todo_list.report(args.by, args.tags, args.last)
+            with span("render"):
+                if text:
+                    display.print_report(report)
+                else:
+                    output.write_records(output.report_records(report), fmt)
+
+        elif args.command in ("undo", "redo"):
+            with span("compute"):
+                revision = todo_list.undo() if args.command == "undo" else todo_list.redo()
+            with span("render"):
+                if text:
+                    display.print_step(revision, args.command)
+                elif revision is None:
+                    output.write_error(f"Nothing to {args.command}", fmt)
+                    sys.exit(1)
+                else:
+                    output.write_record(output.revision_record(revision), fmt)
+
+        elif args.command == "history":
+            revisions = todo_list.revisions()
+            with span("render"):
+                if text:
+                    display.print_history(revisions, args.limit)
+                else:
+                    output.write_records(map(output.revision_record, reversed(revisions[-args.limit:])), fmt)
+
+        elif args.command == "sync":
+            result = todo_list.sync(args.path, args.dry_run)
+            with span("render"):
+                if text:
+                    display.print_sync(result, args.path, args.dry_run)
+                else:
+                    output.write_record(output.sync_record(result, args.dry_run), fmt)
+
+        elif args.command == "recur":
+            _recur(args, parser, todo_list)
+
+        elif args.command == "agenda":
+            items = tracer.timed_iter("filter", todo_list.agenda(args.start, args.days))
+            with span("render"):
+                if text:
+                    display.print_agenda(items)
+                else:
+                    output.write_records(map(output.agenda_record, items), fmt)
+
+        elif args.command == "verify":
+            report = todo_list.verify()
+            with span("render"):
+                if text:
+                    display.print_verify(report)
+                else:
+                    output.write_record(output.verify_record(report), fmt)
+            if not report.ok:
+                sys.exit(1)
 
         elif args.command == "export":
-            todo_list.export_tasks(args.format, args.output)
+            output_file = args.output or default_export_path(args.format)
+            try:
+                with span("compute"):
+                    count = todo_list.export_tasks(args.format, output_file)
+            except OSError as e:
+                if not text:
+                    output.write_error(str(e), fmt, path=output_file)
+                else:
+                    print(colors.error(f"✗ Error exporting tasks: {e}"))
+                sys.exit(1)
+            with span("render"):
+                if text:
+                    display.print_exported(count, output_file)
+                else:
+                    output.write_record({"exported": count, "path": output_file if count else None}, fmt)
+
+        elif args.command == "metrics":
+            metrics_file = metrics.metrics_path_from_env()
+            data = metrics.MetricsStore(metrics_file).load() if metrics_file else metrics.empty_metrics()
+            with span("compute"):
+                task_counts = metrics.count_by_status_priority(todo_list.load_tasks())
+                file_size = os.path.getsize(todo_list.tasks_file) if os.path.exists(todo_list.tasks_file) else None
+            with span("render"):
+                if not text:
+                    output.write_record({
+                        "metrics": data,
+                        "tasks": [{"status": s, "priority": p, "count": c} for (s, p), c in sorted(task_counts.items())],
+                        "tasks_file_size_bytes": file_size,
+                    }, fmt)
+                else:
+                    exposition = metrics.render(data, task_counts, file_size, args.format)
+                    if args.output:
+                        metrics.write_atomic(args.output, exposition)
+                    else:
+                        sys.stdout.write(exposition)
 
         else:
             parser.print_help()
 
     except KeyboardInterrupt:
-        print("\n\nOperation cancelled.")
+        print("\n\nOperation cancelled.", file=sys.stdout if text else sys.stderr)
         sys.exit(1)
+    except BrokenPipeError:
+        # The reader went away (e.g. `todo list | head`): stop quietly like other filters
+        _discard_stdout()
+        sys.exit(141)
     except Exception as e:
-        print(f"Error: {e}")
+        # Keep stdout parseable in machine-readable modes
+        print(f"Error: {e}", file=sys.stdout if text else sys.stderr)
         sys.exit(1)
 
 
+def _discard_stdout() -> None:
+    """Point stdout at the null device so flushing at exit cannot fail again."""
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Not a real file (e.g. redirected in tests); nothing is left to flush
+        return
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, fd)
+    os.close(devnull)
+
+
+def _recur(args: argparse.Namespace, parser: argparse.ArgumentParser, todo_list: TodoList) -> None:
+    """Run a ``todo recur`` subcommand.
+
+    Args:
+        args: Parsed command-line arguments
+        parser: Parser used, for printing help
+        todo_list: Todo list to operate on
+    """
+    fmt = args.output_format
+    text = fmt == "text"
+    if args.recur_command == "add":
+        tags = args.tags.split(",") if args.tags else None
+        with span("compute"):
+            template = todo_list.add_recurring(" ".join(args.description), args.rule, args.priority, tags, args.start)
+        with span("render"):
+            if text:
+                display.print_recurring_added(template)
+            else:
+                output.write_record(template, fmt)
+
+    elif args.recur_command == "list":
+        templates = todo_list.list_recurring()
+        with span("render"):
+            if text:
+                display.print_recurring(templates)
+            else:
+                output.write_records((output.task_record(i, t) for i, t in templates), fmt)
+
+    elif args.recur_command in ("remove", "done"):
+        with span("compute"):
+            if args.recur_command == "remove":
+                result = todo_list.remove_recurring(args.index)
+            else:
+                result = todo_list.complete_occurrence(args.index, args.on)
+        with span("render"):
+            if result is None:
+                if text:
+                    print(colors.error("✗ Invalid recurring task number."))
+                else:
+                    output.write_error("Invalid recurring task number", fmt, index=args.index)
+                    sys.exit(1)
+            elif not text:
+                output.write_record(result, fmt)
+            elif args.recur_command == "remove":
+                display.print_removed(result)
+            else:
+                display.print_completed(result)
+
+    else:
+        parser.parse_args(["recur", "--help"])
+
+
+def _watch(args: argparse.Namespace, todo_list: TodoList) -> None:
+    """Show the filtered task list and refresh it whenever the file changes.
+
+    Runs until interrupted. In text mode only the changed lines are
+    redrawn; in JSON modes one view record is written per change.
+
+    Args:
+        args: Parsed command-line arguments
+        todo_list: Todo list to watch
+    """
+    fmt = args.output_format
+    tags = args.tags.split(",") if args.tags else None
+    filtered = bool(args.status or args.priority or tags)
+    watcher = FileWatcher(todo_list.tasks_file, args.interval, use_inotify=not args.poll)
+    screen = LiveScreen(sys.stdout) if fmt == "text" else None
+    try:
+        while True:
+            # Readers of a half-written file would see garbage, so load under the lock
+            with file_lock(todo_list.lock_file):
+                watcher.changed()
+                results = list(todo_list.list_tasks(args.status, args.priority, tags))
+            updated = datetime.now()
+            if screen is not None:
+                header = (
+                    f"{todo_list.tasks_file}: {len(results)} task(s), "
+                    f"updated {updated:%H:%M:%S} (Ctrl-C to quit)"
+                )
+                screen.update(display.format_view(results, header, filtered))
+            else:
+                output.write_record(output.view_record(results, updated.isoformat()), fmt)
+                sys.stdout.flush()
+            watcher.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        if screen is not None:
+            screen.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main entry point for the CLI.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    started = time.perf_counter()
+    # CPU time used so far is interpreter startup plus imports
+    startup_cpu = time.process_time()
+
+    parser = create_parser()
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # If no arguments provided, show help
+    if not argv:
+        parser.print_help()
+        sys.exit(0)
+
+    args = parser.parse_args(argv)
+
+    trace_format = args.profile_format if args.profile or args.profile_dump else trace_format_from_env()
+    metrics_file = metrics.metrics_path_from_env()
+    if trace_format or metrics_file:
+        # Metrics only need the coarse save/lock-wait phases
+        tracer.enable(per_item=bool(trace_format))
+        tracer.record("parse-args", time.perf_counter() - started)
+
+    profiler = None
+    if args.profile_dump:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    todo_list = TodoList()
+    ok = False
+    try:
+        with warnings.catch_warnings():
+            # The library warns about recovered files; show them as plain messages
+            warnings.simplefilter("always", RecoveredTasksWarning)
+            warnings.showwarning = _show_warning
+            _execute(args, parser, todo_list)
+        ok = True
+    except SystemExit as e:
+        ok = not e.code
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile_dump)
+        if trace_format:
+            tracer.report(trace_format, total=elapsed, startup_cpu=startup_cpu)
+        if metrics_file:
+            _record_metrics(metrics_file, args.command or "help", elapsed, ok, todo_list)
+
+
+def _show_warning(message: Warning, category: type, filename: str, lineno: int, *args: object) -> None:
+    """Print a library warning to stderr without the source location."""
+    print(f"Warning: {message}", file=sys.stderr)
+
+
+def _record_metrics(metrics_file: str, command: str, elapsed: float, ok: bool, todo_list: TodoList) -> None:
+    """Add this run to the metrics file, warning instead of failing on errors."""
+    save = tracer.phases.get("save")
+    lock_wait = tracer.phases.get("lock-wait")
+    try:
+        size = os.path.getsize(todo_list.tasks_file) if os.path.exists(todo_list.tasks_file) else None
+        metrics.MetricsStore(metrics_file).record_run(
+            command,
+            elapsed,
+            ok,
+            save_seconds=save.total if save else None,
+            lock_wait_seconds=lock_wait.total if lock_wait else None,
+            file_size=size,
+        )
+    except OSError as e:
+        print(f"Warning: could not record metrics: {e}", file=sys.stderr)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,684 @@
+"""Asyncio interface for the todo list manager."""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor
+from datetime import date
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .core import (
+    Priority,
+    Status,
+    TaskStatistics,
+    TodoList,
+    compute_statistics,
+    count_tags,
+    default_export_path,
+    filter_tasks,
+    make_task,
+    mark_completed,
+    match_tasks,
+    write_export,
+)
+from .dedupe import DEFAULT_THRESHOLD, build_blob, find_clusters
+from .fuzzy import TermIndex, rank, vocabulary
+from .history import rebase
+from .locking import file_lock, file_signature, sidecar_path
+from .rollups import Report, build_rollups, make_report
+from .scheduler import TaskScheduler
+from .storage import VerifyReport
+from .sync import SyncResult, task_id, tombstones_for
+
+if TYPE_CHECKING:  # pragma: no cover - only needed for annotations
+    from .hierarchy import TreeRow
+    from .history import Revision
+    from .recurrence import AgendaItem
+
+T = TypeVar("T")
+
+
+class AsyncTodoList:
+    """Awaitable todo list backed by one shared in-memory copy of the tasks.
+
+    The tasks file is parsed once, in the executor, the first time any
+    operation needs it. Every coroutine using the instance then reads and
+    mutates the same list, so no operation has to touch the disk. Mutations
+    schedule a flush ``flush_delay`` seconds later; all mutations made in
+    the meantime are written together by that single flush.
+
+    Results are returned as data and nothing is printed. Tasks handed out
+    are copies, so callers may keep or modify them freely. Filtering,
+    reports and searches that scan the whole list run in the executor on a
+    snapshot.
+
+    Operations built on the file's sidecars (subtasks, sync, undo and
+    redo, recurring tasks, verify, find_similar and suggest_tags) flush
+    pending mutations and then run the TodoList method in the executor.
+    If that method writes the file, the shared list is read again on next
+    use.
+
+    Example:
+        async with AsyncTodoList("tasks.json") as todo:
+            await todo.add_task("Ship release", priority="high")
+            pending = await todo.list_tasks(status="pending")
+
+    Attributes:
+        tasks_file: Path to the JSON file storing tasks
+        flush_delay: Seconds to wait before writing pending mutations
+    """
+
+    def __init__(
+        self,
+        tasks_file: str = "tasks.json",
+        flush_delay: float = 0.05,
+        executor: Optional[Executor] = None
+    ):
+        """Initialize the AsyncTodoList with a storage file.
+
+        Args:
+            tasks_file: Path to the JSON file for storing tasks
+            flush_delay: Seconds to coalesce mutations before writing
+            executor: Executor for parsing and disk I/O (default executor if None)
+        """
+        self.tasks_file = tasks_file
+        self.flush_delay = flush_delay
+        self._store = TodoList(tasks_file)
+        self._executor = executor
+        self._tasks: Optional[List[Dict]] = None
+        # Signature of the tasks file as last loaded or written by this instance
+        self._signature: Optional[Tuple[int, ...]] = None
+        self._dirty = False
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+        self._scheduler: Optional[TaskScheduler] = None
+        # Tombstones and undo history for mutations since the last flush
+        self._removed: Dict[str, str] = {}
+        self._revisions: List[Tuple[str, str, List]] = []
+        # BK-trees grow with the vocabulary and live only in memory here
+        self._terms = TermIndex(sidecar_path(tasks_file, "terms"))
+        # Fuzzy searches update the BK-trees from executor threads
+        self._terms_lock = threading.Lock()
+
+    async def __aenter__(self) -> "AsyncTodoList":
+        await self._ensure_loaded()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking function in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def _ensure_loaded(self) -> List[Dict]:
+        """Load tasks from disk once and return the shared list."""
+        if self._tasks is None:
+            # Locks are created lazily so they bind to the running loop
+            if self._load_lock is None:
+                self._load_lock = asyncio.Lock()
+            async with self._load_lock:
+                if self._tasks is None:
+                    self._tasks, self._signature = await self._run(self._load_locked)
+        return self._tasks
+
+    def _load_locked(self) -> Tuple[List[Dict], Optional[Tuple[int, ...]]]:
+        """Load tasks and the file signature under the lock (runs in the executor)."""
+        with file_lock(self._store.lock_file):
+            return self._store.load_tasks(), file_signature(self.tasks_file)
+
+    async def _via_store(self, method: Callable[..., T], *args: Any, writes: bool = False) -> T:
+        """Run a TodoList method on the flushed file in the executor.
+
+        Args:
+            method: Bound method of the underlying TodoList
+            *args: Positional arguments for it
+            writes: Whether the method may change the tasks file
+
+        Returns:
+            The method's result
+        """
+        await self.flush()
+        result = await self._run(method, *args)
+        if writes:
+            if self._dirty:
+                # Mutations made meanwhile are replayed onto the changed file
+                await self.flush()
+            else:
+                self._tasks = None
+                self._scheduler = None
+        return result
+
+    def _schedule_flush(self) -> None:
+        """Mark the list dirty and make sure a flush is pending."""
+        self._dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write pending mutations to disk now."""
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        async with self._write_lock:
+            if not self._dirty or self._tasks is None:
+                return
+            # Snapshot before leaving the loop so later mutations can't race the dump
+            snapshot = [dict(task) for task in self._tasks]
+            removed, self._removed = self._removed, {}
+            revisions, self._revisions = self._revisions, []
+            self._dirty = False
+            try:
+                rebased, self._signature = await self._run(
+                    self._save_locked, snapshot, removed, revisions, self._signature
+                )
+            except BaseException:
+                self._dirty = True
+                self._removed = {**removed, **self._removed}
+                self._revisions = revisions + self._revisions
+                raise
+            if rebased is not None:
+                # Mutations made during the save refer to the old list; replay them too
+                self._revisions = [
+                    (op, summary, rebase(rebased, changes)) for op, summary, changes in self._revisions
+                ]
+                self._tasks[:] = rebased
+                self._scheduler = None
+
+    def _save_locked(
+        self,
+        tasks: List[Dict],
+        removed: Dict[str, str],
+        revisions: List[Tuple[str, str, List]],
+        loaded: Optional[Tuple[int, ...]]
+    ) -> Tuple[Optional[List[Dict]], Optional[Tuple[int, ...]]]:
+        """Save under the tasks file lock (runs in the executor).
+
+        If another writer changed the file since it was loaded, the pending
+        revisions are replayed onto the current file instead of overwriting
+        it with the in-memory list.
+
+        Returns:
+            The replayed list (None if the file was unchanged) and the new
+            file signature
+        """
+        with file_lock(self._store.lock_file):
+            before = file_signature(self.tasks_file)
+            rebased = None
+            if before != loaded:
+                rebased = self._store.load_tasks()
+                revisions = [(op, summary, rebase(rebased, changes)) for op, summary, changes in revisions]
+                tasks = rebased
+            self._store.save_tasks(tasks)
+            self._store.tombstones.add(removed)
+            after = file_signature(self.tasks_file)
+            self._store.history.record(before, after, revisions)
+            return rebased, after
+
+    async def aclose(self) -> None:
+        """Cancel the delayed flush and write any pending mutations."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+        await self.flush()
+
+    async def reload(self) -> None:
+        """Flush pending mutations and re-read the tasks file."""
+        await self.aclose()
+        self._tasks = None
+        self._scheduler = None
+        await self._ensure_loaded()
+
+    async def load_tasks(self) -> List[Dict]:
+        """Return a copy of all tasks.
+
+        Returns:
+            List of task dictionaries
+        """
+        tasks = await self._ensure_loaded()
+        return [dict(task) for task in tasks]
+
+    async def add_task(
+        self,
+        description: str,
+        priority: Priority = "medium",
+        tags: Optional[List[str]] = None,
+        due_date: Optional[str] = None,
+        parent: Optional[int] = None
+    ) -> Dict:
+        """Add a new task to the list.
+
+        Args:
+            description: Task description
+            priority: Task priority (high, medium, or low)
+            tags: Optional list of tags/categories
+            due_date: Optional due date
+            parent: Optional 1-based index of the task to add it under
+
+        Returns:
+            The created task
+
+        Raises:
+            ValueError: If the parent index is invalid
+        """
+        tasks = await self._ensure_loaded()
+        changes: List = []
+        parent_id = None
+        if parent is not None:
+            if not 1 <= parent <= len(tasks):
+                raise ValueError(f"Invalid parent task number: {parent}")
+            if not tasks[parent - 1].get("id"):
+                previous = dict(tasks[parent - 1])
+                tasks[parent - 1]["id"] = task_id(previous)
+                changes.append(["replace", parent - 1, previous, dict(tasks[parent - 1])])
+            parent_id = tasks[parent - 1]["id"]
+        task = make_task(description, priority, tags, due_date, parent_id)
+        tasks.append(task)
+        self._revisions.append(("add", description, changes + [["insert", len(tasks) - 1, dict(task)]]))
+        if self._scheduler is not None:
+            self._scheduler.add(len(tasks), task)
+        self._schedule_flush()
+        return dict(task)
+
+    async def list_tasks(
+        self,
+        status: Optional[Status] = None,
+        priority: Optional[Priority] = None,
+        tags: Optional[List[str]] = None
+    ) -> List[Tuple[int, Dict]]:
+        """List tasks with optional filtering.
+
+        Args:
+            status: Filter by status (pending or completed)
+            priority: Filter by priority (high, medium, or low)
+            tags: Filter by tags (tasks must have at least one matching tag)
+
+        Returns:
+            List of (index, task) pairs with 1-based indices
+        """
+        tasks = await self._ensure_loaded()
+        return [(i, dict(task)) for i, task in filter_tasks(tasks, status, priority, tags)]
+
+    async def remove_task(self, index: int) -> Optional[Dict]:
+        """Remove a task by its index.
+
+        Args:
+            index: 1-based index of the task to remove
+
+        Returns:
+            The removed task, or None if the index is invalid
+        """
+        tasks = await self._ensure_loaded()
+        if not 1 <= index <= len(tasks):
+            return None
+        removed = tasks.pop(index - 1)
+        self._removed.update(tombstones_for([removed]))
+        self._revisions.append(("remove", removed.get("task", ""), [["delete", index - 1, dict(removed)]]))
+        self._scheduler = None
+        self._schedule_flush()
+        return dict(removed)
+
+    async def complete_task(self, index: int) -> Optional[Dict]:
+        """Mark a task as completed.
+
+        Args:
+            index: 1-based index of the task to complete
+
+        Returns:
+            The completed task, or None if the index is invalid
+        """
+        tasks = await self._ensure_loaded()
+        if not 1 <= index <= len(tasks):
+            return None
+        previous = dict(tasks[index - 1])
+        mark_completed(tasks[index - 1])
+        self._revisions.append(
+            ("complete", previous.get("task", ""), [["replace", index - 1, previous, dict(tasks[index - 1])]])
+        )
+        if self._scheduler is not None:
+            self._scheduler.add(index, tasks[index - 1])
+        self._schedule_flush()
+        return dict(tasks[index - 1])
+
+    async def next_tasks(self, count: int = 1) -> List[Tuple[int, Dict]]:
+        """Return the most urgent pending tasks.
+
+        The priority queue is built once from the shared list and then
+        updated in place by add_task and complete_task.
+
+        Args:
+            count: Maximum number of tasks to return
+
+        Returns:
+            Up to count (index, task) pairs, most urgent first
+        """
+        tasks = await self._ensure_loaded()
+        if self._scheduler is None:
+            self._scheduler = TaskScheduler.from_tasks(enumerate(tasks, 1))
+        return [(i, dict(tasks[i - 1])) for i in self._scheduler.peek(count)]
+
+    async def search_tasks(self, query: str) -> List[Tuple[int, Dict]]:
+        """Search for tasks containing the query string.
+
+        Args:
+            query: Case-insensitive search string
+
+        Returns:
+            List of (index, task) pairs with 1-based indices
+        """
+        tasks = await self._ensure_loaded()
+        return [(i, dict(task)) for i, task in match_tasks(tasks, query)]
+
+    async def clear_completed(self) -> int:
+        """Remove all completed tasks.
+
+        Returns:
+            Number of tasks removed
+        """
+        tasks = await self._ensure_loaded()
+        remaining = [t for t in tasks if t.get("status") != "completed"]
+        removed_count = len(tasks) - len(remaining)
+        if removed_count:
+            self._removed.update(tombstones_for(t for t in tasks if t.get("status") == "completed"))
+            self._revisions.append(("clear", f"{removed_count} completed task(s)", [
+                ["delete", i, dict(tasks[i])]
+                for i in range(len(tasks) - 1, -1, -1) if tasks[i].get("status") == "completed"
+            ]))
+            tasks[:] = remaining
+            self._scheduler = None
+            self._schedule_flush()
+        return removed_count
+
+    async def list_tags(self) -> Dict[str, int]:
+        """Count tasks per tag.
+
+        Returns:
+            Dictionary mapping tag to number of tasks
+        """
+        return count_tags(await self._ensure_loaded())
+
+    async def get_statistics(self) -> TaskStatistics:
+        """Compute statistics about tasks.
+
+        Returns:
+            TaskStatistics for the current list
+        """
+        return compute_statistics(await self._ensure_loaded())
+
+    async def report(self, by: str = "week", tags: Optional[List[str]] = None, last: Optional[int] = None) -> Report:
+        """Summarize created and completed tasks per period and per tag.
+
+        Computed from the shared in-memory list; the rollups sidecar used
+        by TodoList is neither read nor written.
+
+        Args:
+            by: Period length (day, week or month)
+            tags: Tags to break down (defaults to every tag)
+            last: Only include the most recent N periods
+
+        Returns:
+            Report with overall and per-tag periods
+
+        Raises:
+            ValueError: If the period is not supported
+        """
+        snapshot = [dict(task) for task in await self._ensure_loaded()]
+        rollups = await self._run(build_rollups, snapshot)
+        return await self._run(make_report, rollups, by, tags, last)
+
+    async def fuzzy_search(self, query: str, max_distance: Optional[int] = None) -> List[Tuple[int, Dict, float]]:
+        """Search descriptions and tags, tolerating typos.
+
+        Args:
+            query: Search text
+            max_distance: Typos tolerated per query word
+
+        Returns:
+            (index, task, score) triples, best match first
+        """
+        snapshot = [dict(task) for task in await self._ensure_loaded()]
+        ranked = await self._run(self._rank, snapshot, query, max_distance)
+        return [(p + 1, snapshot[p], score) for p, score in ranked]
+
+    def _rank(self, tasks: List[Dict], query: str, max_distance: Optional[int]) -> List[Tuple[int, float]]:
+        """Rank tasks against a fuzzy query (runs in the executor)."""
+        tag_postings, term_postings = vocabulary(tasks)
+        with self._terms_lock:
+            self._terms.sync(tag_postings, term_postings)
+            return rank(query, self._terms.terms, term_postings, max_distance)
+
+    async def find_duplicates(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        include_completed: bool = False
+    ) -> List[List[Tuple[int, Dict]]]:
+        """Find clusters of near-duplicate tasks in the shared list.
+
+        Signatures are computed in the executor; the MinHash index file
+        used by TodoList is neither read nor written.
+
+        Args:
+            threshold: Minimum similarity between 0 and 1
+            include_completed: Also consider completed tasks
+
+        Returns:
+            Clusters of two or more (index, task) pairs, in list order
+        """
+        tasks = await self._ensure_loaded()
+        snapshot = [dict(task) for task in tasks]
+        positions = [
+            i for i, task in enumerate(snapshot)
+            if include_completed or task.get("status", "pending") == "pending"
+        ]
+        blob = await self._run(build_blob, snapshot)
+        clusters = await self._run(find_clusters, blob, positions, threshold)
+        return [[(p + 1, snapshot[p]) for p in cluster] for cluster in clusters]
+
+    async def find_similar(
+        self,
+        description: str,
+        tags: Optional[List[str]] = None,
+        threshold: float = DEFAULT_THRESHOLD
+    ) -> List[Tuple[int, Dict, float]]:
+        """Find pending tasks that look like a prospective new task.
+
+        Args:
+            description: Description of the task about to be added
+            tags: Its tags
+            threshold: Minimum similarity between 0 and 1
+
+        Returns:
+            (index, task, similarity) triples, most similar first
+        """
+        return await self._via_store(self._store.find_similar, description, tags, threshold)
+
+    async def suggest_tags(self, tags: List[str], limit: int = 3) -> Dict[str, List[str]]:
+        """Suggest existing tags for tags that no task has.
+
+        Args:
+            tags: Tags from a filter
+            limit: Maximum suggestions per tag
+
+        Returns:
+            Dictionary mapping each unknown tag to close existing tags
+        """
+        return await self._via_store(self._store.suggest_tags, tags, limit)
+
+    async def move_task(self, index: int, parent: Optional[int] = None) -> Optional[Dict]:
+        """Make a task a subtask of another, or a top-level task again.
+
+        Args:
+            index: 1-based index of the task to move
+            parent: 1-based index of the new parent (None for top level)
+
+        Returns:
+            The moved task, or None if the index is invalid
+
+        Raises:
+            ValueError: If the parent index is invalid or the parent is the
+                task itself or one of its subtasks
+        """
+        return await self._via_store(self._store.move_task, index, parent, writes=True)
+
+    async def tree(self, index: Optional[int] = None, depth: Optional[int] = None) -> "Optional[List[TreeRow]]":
+        """Return tasks with their subtasks and rolled-up progress.
+
+        Args:
+            index: 1-based index of the task to show (None for every
+                top-level task that has subtasks)
+            depth: Deepest level of subtasks to show (None for all)
+
+        Returns:
+            Rows in display order, or None if the index is invalid
+        """
+        return await self._via_store(self._store.tree, index, depth)
+
+    async def sync(self, other: str, dry_run: bool = False) -> SyncResult:
+        """Merge this list with another task file in both directions.
+
+        Args:
+            other: Path of the other tasks file, or a directory containing tasks.json
+            dry_run: Compute the result without writing either file
+
+        Returns:
+            Counts of what was copied, updated and removed on each side
+
+        Raises:
+            ValueError: If other is this list's own file or its directory is missing
+        """
+        return await self._via_store(self._store.sync, other, dry_run, writes=not dry_run)
+
+    async def undo(self) -> "Optional[Revision]":
+        """Reverse the most recent change that has not been undone.
+
+        Returns:
+            The undone revision, or None if there is nothing to undo
+
+        Raises:
+            ValueError: If the tasks file was changed by something that does
+                not record history
+        """
+        return await self._via_store(self._store.undo, writes=True)
+
+    async def redo(self) -> "Optional[Revision]":
+        """Re-apply the most recently undone change.
+
+        Returns:
+            The redone revision, or None if there is nothing to redo
+
+        Raises:
+            ValueError: If the tasks file was changed by something that does
+                not record history
+        """
+        return await self._via_store(self._store.redo, writes=True)
+
+    async def revisions(self) -> "List[Revision]":
+        """Return the undo history.
+
+        Returns:
+            Revisions oldest first; undone ones come last
+        """
+        return await self._via_store(self._store.revisions)
+
+    async def add_recurring(
+        self,
+        description: str,
+        rule: str,
+        priority: Priority = "medium",
+        tags: Optional[List[str]] = None,
+        start: Optional[date] = None
+    ) -> Dict:
+        """Add a recurring task template.
+
+        Args:
+            description: Description of each occurrence
+            rule: Recurrence rule (see todolist.recurrence)
+            priority: Priority of each occurrence
+            tags: Tags of each occurrence
+            start: Date of the first possible occurrence (defaults to today)
+
+        Returns:
+            The created template
+
+        Raises:
+            ValueError: If the rule is not understood
+        """
+        return await self._run(self._store.add_recurring, description, rule, priority, tags, start)
+
+    async def list_recurring(self) -> List[Tuple[int, Dict]]:
+        """Return the recurring task templates.
+
+        Returns:
+            (index, template) pairs, where index is the 1-based position
+        """
+        return await self._run(self._store.list_recurring)
+
+    async def remove_recurring(self, index: int) -> Optional[Dict]:
+        """Remove a recurring task template.
+
+        Args:
+            index: 1-based index of the template
+
+        Returns:
+            The removed template, or None if the index is invalid
+        """
+        return await self._run(self._store.remove_recurring, index)
+
+    async def complete_occurrence(self, index: int, on: Optional[date] = None) -> Optional[Dict]:
+        """Complete one occurrence of a recurring task.
+
+        Args:
+            index: 1-based index of the template
+            on: Occurrence date (defaults to the latest one not yet done
+                that is due by today, or else the next one)
+
+        Returns:
+            The stored task, or None if the index is invalid
+
+        Raises:
+            ValueError: If the date is not an occurrence or is already done
+        """
+        return await self._via_store(self._store.complete_occurrence, index, on, writes=True)
+
+    async def agenda(self, start: Optional[date] = None, days: int = 7) -> "List[AgendaItem]":
+        """List everything due in a date window.
+
+        Args:
+            start: First day of the window (defaults to today)
+            days: Length of the window in days
+
+        Returns:
+            Agenda items in date order
+        """
+        return await self._via_store(lambda: list(self._store.agenda(start, days)))
+
+    async def verify(self) -> VerifyReport:
+        """Check the tasks file for damaged records.
+
+        Returns:
+            Report listing damaged records and file-level problems
+        """
+        return await self._via_store(self._store.verify)
+
+    async def export_tasks(self, format: str = "json", output_file: Optional[str] = None) -> int:
+        """Export tasks to a file without blocking the event loop.
+
+        Nothing is written when there are no tasks.
+
+        Args:
+            format: Export format (json, csv, or markdown)
+            output_file: Output file path (defaults to tasks_export.[format])
+
+        Returns:
+            Number of tasks exported
+        """
+        tasks = await self.load_tasks()
+        if tasks:
+            path = output_file or default_export_path(format)
+            await self._run(write_export, tasks, format, path)
+        return len(tasks)
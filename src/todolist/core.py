@@ -1,22 +1,343 @@
 """Core functionality for the todo list manager."""
 
+import heapq
 import json
 import os
-from datetime import datetime
-from typing import List, Dict, Optional, Literal
-
-from . import colors
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Literal, Optional, Sequence, Set, Tuple
+
+from .dedupe import DEFAULT_THRESHOLD
+from .locking import file_lock, file_signature, sidecar_path
+from .profiling import span
+from .storage import TaskStore, VerifyReport
+from .sync import (
+    Replica,
+    SyncResult,
+    SyncTree,
+    SyncTreeStore,
+    TombstoneStore,
+    ensure_ids,
+    entry_hash,
+    merge,
+    prune,
+    task_id,
+    tombstone_hash,
+    tombstones_for,
+    touch,
+    utc_now,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - feature modules are imported where used
+    from .dedupe import SignatureIndex
+    from .fuzzy import TermIndex
+    from .hierarchy import TreeRow, TreeStore
+    from .history import Revision, RevisionLog
+    from .recurrence import AgendaItem, RecurringStore
+    from .rollups import Report, RollupStore
+    from .scheduler import TaskScheduler
 
 
 Priority = Literal["high", "medium", "low"]
 Status = Literal["pending", "completed"]
 
+EXPORT_FIELDS = ["task", "status", "priority", "tags", "due_date", "created_at", "completed_at"]
+
+
+@dataclass
+class TaskStatistics:
+    """Point-in-time totals for a task list.
+
+    Attributes:
+        total: Number of tasks
+        completed: Number of completed tasks
+        pending: Number of pending tasks
+        pending_by_priority: Pending task counts keyed by priority
+        tag_counts: Task counts keyed by tag
+    """
+
+    total: int = 0
+    completed: int = 0
+    pending: int = 0
+    pending_by_priority: Dict[str, int] = field(
+        default_factory=lambda: {"high": 0, "medium": 0, "low": 0}
+    )
+    tag_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def completion_pct(self) -> float:
+        """Percentage of tasks that are completed."""
+        return (self.completed / self.total * 100) if self.total > 0 else 0.0
+
+    def top_tags(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """Return the most used tags.
+
+        Args:
+            limit: Maximum number of tags to return
+
+        Returns:
+            List of (tag, count) pairs, most used first
+        """
+        return sorted(self.tag_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+
+def make_task(
+    description: str,
+    priority: Priority = "medium",
+    tags: Optional[List[str]] = None,
+    due_date: Optional[str] = None,
+    parent: Optional[str] = None
+) -> Dict:
+    """Build a new pending task dictionary.
+
+    Args:
+        description: Task description
+        priority: Task priority (high, medium, or low)
+        tags: Optional list of tags/categories
+        due_date: Optional due date
+        parent: Optional id of the parent task
+
+    Returns:
+        Task dictionary ready to be stored
+    """
+    task = {
+        "id": uuid.uuid4().hex,
+        "task": description,
+        "status": "pending",
+        "priority": priority,
+        "tags": tags or [],
+        "due_date": due_date,
+        "created_at": datetime.now().isoformat(),
+        "completed_at": None
+    }
+    if parent:
+        task["parent"] = parent
+    return task
+
+
+def mark_completed(task: Dict) -> None:
+    """Mark a task dictionary as completed now.
+
+    Args:
+        task: Task to update in place
+    """
+    task["status"] = "completed"
+    task["completed_at"] = datetime.now().isoformat()
+    touch(task, ["status", "completed_at"])
+
+
+def filter_tasks(
+    tasks: Iterable[Dict],
+    status: Optional[Status] = None,
+    priority: Optional[Priority] = None,
+    tags: Optional[List[str]] = None
+) -> Iterator[Tuple[int, Dict]]:
+    """Lazily select tasks matching all of the given filters.
+
+    Args:
+        tasks: Tasks in storage order
+        status: Keep only tasks with this status
+        priority: Keep only tasks with this priority
+        tags: Keep only tasks having at least one of these tags
+
+    Yields:
+        (index, task) pairs, where index is the task's 1-based position
+    """
+    wanted_tags = set(tags) if tags else None
+    for i, task in enumerate(tasks, 1):
+        if status and task.get("status") != status:
+            continue
+        if priority and task.get("priority") != priority:
+            continue
+        if wanted_tags and wanted_tags.isdisjoint(task.get("tags", [])):
+            continue
+        yield i, task
+
+
+def match_tasks(tasks: Iterable[Dict], query: str) -> Iterator[Tuple[int, Dict]]:
+    """Lazily select tasks whose description contains the query.
+
+    Args:
+        tasks: Tasks in storage order
+        query: Case-insensitive substring to look for
+
+    Yields:
+        (index, task) pairs, where index is the task's 1-based position
+    """
+    needle = query.lower()
+    for i, task in enumerate(tasks, 1):
+        if needle in task["task"].lower():
+            yield i, task
+
+
+def count_tags(tasks: Iterable[Dict]) -> Dict[str, int]:
+    """Count how many tasks carry each tag.
+
+    Args:
+        tasks: Tasks to count
+
+    Returns:
+        Dictionary mapping tag to number of tasks
+    """
+    tag_counts: Dict[str, int] = {}
+    for task in tasks:
+        for tag in task.get("tags", []):
+            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+    return tag_counts
+
+
+def compute_statistics(tasks: Iterable[Dict]) -> TaskStatistics:
+    """Compute task statistics in a single pass.
+
+    Args:
+        tasks: Tasks to summarize
+
+    Returns:
+        TaskStatistics for the given tasks
+    """
+    stats = TaskStatistics()
+    for task in tasks:
+        stats.total += 1
+        if task.get("status") == "completed":
+            stats.completed += 1
+        else:
+            stats.pending += 1
+            priority = task.get("priority")
+            if priority in stats.pending_by_priority:
+                stats.pending_by_priority[priority] += 1
+        for tag in task.get("tags", []):
+            stats.tag_counts[tag] = stats.tag_counts.get(tag, 0) + 1
+    return stats
+
+
+def _completed_occurrences(tasks: Iterable[Dict]) -> Dict[str, Dict[date, Dict]]:
+    """Index the stored occurrences of recurring tasks.
+
+    Args:
+        tasks: Task dictionaries
+
+    Returns:
+        Mapping of template id to {occurrence date: task}
+    """
+    done: Dict[str, Dict[date, Dict]] = {}
+    for task in tasks:
+        origin = task.get("recurrence")
+        if origin:
+            done.setdefault(origin["template"], {})[date.fromisoformat(origin["on"])] = task
+    return done
+
+
+def _pending_occurrence(template: Dict, on: date) -> Dict:
+    """Build the task shown for an occurrence that has not been completed.
+
+    Args:
+        template: Recurring task template
+        on: Occurrence date
+
+    Returns:
+        A pending task dictionary that is not stored anywhere
+    """
+    return {
+        "task": template["task"],
+        "status": "pending",
+        "priority": template.get("priority", "medium"),
+        "tags": template.get("tags", []),
+        "due_date": on.isoformat(),
+        "recurrence": {"template": template["id"], "on": on.isoformat()},
+    }
+
+
+def default_export_path(format: str) -> str:
+    """Return the file name used when no export path is given.
+
+    Args:
+        format: Export format
+
+    Returns:
+        Default output path for the format
+    """
+    return f"tasks_export.{format}"
+
+
+def write_export(tasks: List[Dict], format: str, output_file: str) -> None:
+    """Write tasks to a file in the given export format.
+
+    Args:
+        tasks: Tasks to export
+        format: Export format (json, csv, or markdown)
+        output_file: Output file path
+
+    Raises:
+        ValueError: If the format is not supported
+        OSError: If the file cannot be written
+    """
+    if format == "json":
+        with open(output_file, "w") as f:
+            json.dump(tasks, f, indent=4)
+
+    elif format == "csv":
+        import csv
+        with open(output_file, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for task in tasks:
+                task_copy = task.copy()
+                task_copy["tags"] = ",".join(task.get("tags", []))
+                writer.writerow(task_copy)
+
+    elif format == "markdown":
+        with open(output_file, "w") as f:
+            f.write("# Todo List\n\n")
+
+            # Pending tasks
+            pending_tasks = [t for t in tasks if t.get("status") == "pending"]
+            if pending_tasks:
+                f.write("## Pending Tasks\n\n")
+                for task in pending_tasks:
+                    priority = task.get("priority", "medium").upper()
+                    tags_str = " ".join([f"`#{tag}`" for tag in task.get("tags", [])])
+                    due = f" (Due: {task.get('due_date')})" if task.get("due_date") else ""
+                    f.write(f"- [ ] **{task['task']}** [{priority}]{due}\n")
+                    if tags_str:
+                        f.write(f"  - Tags: {tags_str}\n")
+                f.write("\n")
+
+            # Completed tasks
+            completed_tasks = [t for t in tasks if t.get("status") == "completed"]
+            if completed_tasks:
+                f.write("## Completed Tasks\n\n")
+                for task in completed_tasks:
+                    priority = task.get("priority", "medium").upper()
+                    tags_str = " ".join([f"`#{tag}`" for tag in task.get("tags", [])])
+                    f.write(f"- [x] ~~{task['task']}~~ [{priority}]\n")
+                    if tags_str:
+                        f.write(f"  - Tags: {tags_str}\n")
+
+    else:
+        raise ValueError(f"Unsupported export format: {format}")
+
 
 class TodoList:
     """Manages a todo list with persistent JSON storage.
 
+    Mutating methods hold an advisory lock on ``<tasks_file>.lock`` while
+    they read, modify and write the file, so concurrent processes do not
+    overwrite each other's changes.
+
     Attributes:
         tasks_file: Path to the JSON file storing tasks
+        lock_file: Path to the lock file guarding read-modify-write cycles
+        storage: Checksummed, crash-safe reader and writer of the tasks file
+        rollups: Store for the time-bucketed rollups behind report()
+        signatures: MinHash index behind find_duplicates() and find_similar()
+        terms: BK-tree index behind fuzzy_search() and suggest_tags()
+        tombstones: Removal times of deleted tasks, used by sync()
+        synctree: Hash tree behind sync()
+        history: Revision log behind undo() and redo()
+        recurring: Recurring task templates behind agenda()
+        hierarchy: Parent/child index with rolled-up progress behind tree()
     """
 
     def __init__(self, tasks_file: str = "tasks.json"):
@@ -26,41 +347,99 @@ class TodoList:
             tasks_file: Path to the JSON file for storing tasks
         """
         self.tasks_file = tasks_file
+        self.lock_file = sidecar_path(tasks_file, "lock")
+        self.storage = TaskStore(tasks_file)
+        self._terms_loaded = False
+        self.tombstones = TombstoneStore(sidecar_path(tasks_file, "tombstones"))
+        self.synctree = SyncTreeStore(sidecar_path(tasks_file, "synctree"))
+        # Scheduler for next_tasks, kept while the file matches _schedule_sig
+        self._scheduler: "Optional[TaskScheduler]" = None
+        self._schedule_tasks: List[Dict] = []
+        self._schedule_sig: Optional[Tuple[int, int, int]] = None
+
+    # The feature indexes are created on first use, so commands that do not
+    # need them do not pay for importing their modules
+
+    @cached_property
+    def rollups(self) -> "RollupStore":
+        """Store for the time-bucketed rollups behind report()."""
+        from .rollups import RollupStore
+        return RollupStore(sidecar_path(self.tasks_file, "rollups"))
+
+    @cached_property
+    def signatures(self) -> "SignatureIndex":
+        """MinHash index behind find_duplicates() and find_similar()."""
+        from .dedupe import SignatureIndex
+        return SignatureIndex(sidecar_path(self.tasks_file, "minhash"))
+
+    @cached_property
+    def terms(self) -> "TermIndex":
+        """BK-tree index behind fuzzy_search() and suggest_tags()."""
+        from .fuzzy import TermIndex
+        return TermIndex(sidecar_path(self.tasks_file, "terms"))
+
+    @cached_property
+    def history(self) -> "RevisionLog":
+        """Revision log behind undo() and redo()."""
+        from .history import RevisionLog
+        return RevisionLog(sidecar_path(self.tasks_file, "history"))
+
+    @cached_property
+    def recurring(self) -> "RecurringStore":
+        """Recurring task templates behind agenda()."""
+        from .recurrence import RecurringStore
+        return RecurringStore(sidecar_path(self.tasks_file, "recurring"))
+
+    @cached_property
+    def hierarchy(self) -> "TreeStore":
+        """Parent/child index with rolled-up progress behind tree()."""
+        from .hierarchy import TreeStore
+        return TreeStore(sidecar_path(self.tasks_file, "tree"))
 
     def load_tasks(self) -> List[Dict]:
         """Load tasks from the JSON file.
 
+        A damaged file is never treated as empty: the last good copy is
+        loaded instead (see todolist.storage).
+
         Returns:
             List of task dictionaries. Returns empty list if file doesn't exist.
+
+        Raises:
+            CorruptTasksError: If the file is damaged and has no usable backup
         """
-        if not os.path.exists(self.tasks_file):
-            return []
-        try:
-            with open(self.tasks_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading tasks: {e}")
-            return []
+        with span("load"):
+            return self.storage.read()
 
     def save_tasks(self, tasks: List[Dict]) -> None:
         """Save tasks to the JSON file.
 
+        The file is replaced atomically and flushed to disk, and the
+        previous version is kept as the backup.
+
         Args:
             tasks: List of task dictionaries to save
         """
-        try:
-            with open(self.tasks_file, "w") as f:
-                json.dump(tasks, f, indent=4)
-        except IOError as e:
-            print(f"Error saving tasks: {e}")
+        with span("save"):
+            self.storage.write(tasks)
+
+    def verify(self) -> VerifyReport:
+        """Check the tasks file for damaged records.
+
+        Returns:
+            Report listing damaged records and file-level problems
+        """
+        with span("compute"):
+            return self.storage.verify()
 
     def add_task(
         self,
         description: str,
         priority: Priority = "medium",
         tags: Optional[List[str]] = None,
-        due_date: Optional[str] = None
-    ) -> None:
+        due_date: Optional[str] = None,
+        parent: Optional[int] = None
+    ) -> Dict:
         """Add a new task to the list.
 
         Args:
@@ -68,295 +447,925 @@ class TodoList:
             priority: Task priority (high, medium, or low)
             tags: Optional list of tags/categories
             due_date: Optional due date (ISO format or natural language)
+            parent: Optional 1-based index of the task to add it under
+
+        Returns:
+            The created task
+
+        Raises:
+            ValueError: If the parent index is invalid
+        """
+        with file_lock(self.lock_file):
+            before = file_signature(self.tasks_file)
+            tasks = self.load_tasks()
+            if parent is not None and not 1 <= parent <= len(tasks):
+                raise ValueError(f"Invalid parent task number: {parent}")
+            changes: List = []
+            toggles: List[Tuple[str, int]] = []
+            parent_id = self._stable_id(tasks, parent, changes, toggles) if parent is not None else None
+            task = make_task(description, priority, tags, due_date, parent_id)
+            self._append(before, tasks, task, "add", description, parent, changes, toggles)
+        return task
+
+    def _append(self, before: Optional[Tuple[int, int, int]], tasks: List[Dict], task: Dict,
+                op: str, summary: str, parent: Optional[int] = None,
+                changes: Sequence = (), toggles: Sequence[Tuple[str, int]] = ()) -> None:
+        """Save a task appended to the loaded list (caller holds the lock).
+
+        Args:
+            before: File signature read before the list was loaded
+            tasks: Loaded task list (the task is appended in place)
+            task: New task
+            op: Command name recorded in the undo history
+            summary: Short description recorded in the undo history
+            parent: 1-based index of the new task's parent, if any
+            changes: Earlier changes to the list, recorded in the same revision
+            toggles: Sync tree toggles for those changes
         """
-        tasks = self.load_tasks()
-        task = {
-            "task": description,
-            "status": "pending",
-            "priority": priority,
-            "tags": tags or [],
-            "due_date": due_date,
-            "created_at": datetime.now().isoformat(),
-            "completed_at": None
-        }
         tasks.append(task)
         self.save_tasks(tasks)
+        self._update_schedule(before, tasks, [len(tasks)])
+        self._update_rollups(before, [(task, 1)])
+        self._update_signatures(before, added=[task])
+        self._update_synctree(before, list(toggles) + [(task["id"], entry_hash(task))])
+        self._update_tree(before, [
+            ("add", len(tasks), task, (parent, tasks[parent - 1]) if parent is not None else None)
+        ])
+        self._record(before, op, summary, list(changes) + [["insert", len(tasks) - 1, task]])
+
+    @staticmethod
+    def _stable_id(tasks: List[Dict], index: int, changes: List, toggles: List[Tuple[str, int]]) -> str:
+        """Return a task's id, storing the derived one on tasks that predate ids.
 
-        msg = colors.success("✓ Added task: ") + f"{description} [{colors.color_priority(priority)}]"
-        if tags:
-            tag_str = ", ".join([colors.colorize(f"#{tag}", colors.Colors.CYAN) for tag in tags])
-            msg += f" {tag_str}"
-        if due_date:
-            msg += colors.colorize(f" 📅 Due: {due_date}", colors.Colors.MAGENTA)
-        print(msg)
+        Args:
+            tasks: Loaded task list
+            index: 1-based index of the task
+            changes: History changes, extended if the task is modified
+            toggles: Sync tree toggles, extended if the task is modified
+
+        Returns:
+            The task's id
+        """
+        task = tasks[index - 1]
+        if not task.get("id"):
+            previous = dict(task)
+            task["id"] = task_id(task)
+            changes.append(["replace", index - 1, previous, task])
+            toggles.extend([(task["id"], entry_hash(previous)), (task["id"], entry_hash(task))])
+        return task["id"]
 
     def list_tasks(
         self,
         status: Optional[Status] = None,
         priority: Optional[Priority] = None,
         tags: Optional[List[str]] = None
-    ) -> None:
-        """List all tasks with optional filtering.
+    ) -> Iterator[Tuple[int, Dict]]:
+        """Iterate over tasks with optional filtering.
+
+        The tasks file is read when iteration starts and matches are
+        produced one at a time.
 
         Args:
             status: Filter by status (pending or completed)
             priority: Filter by priority (high, medium, or low)
             tags: Filter by tags (tasks must have at least one matching tag)
+
+        Yields:
+            (index, task) pairs, where index is the task's 1-based position
+        """
+        yield from filter_tasks(self.load_tasks(), status, priority, tags)
+
+    def remove_task(self, index: int) -> Optional[Dict]:
+        """Remove a task by its index.
+
+        Args:
+            index: 1-based index of the task to remove
+
+        Returns:
+            The removed task, or None if the index is invalid
+        """
+        with file_lock(self.lock_file):
+            before = file_signature(self.tasks_file)
+            tasks = self.load_tasks()
+            if not 1 <= index <= len(tasks):
+                return None
+            removed = tasks.pop(index - 1)
+            self.save_tasks(tasks)
+            self._record_removed(before, [removed])
+            # Later indices shift, so the schedule is rebuilt on next use
+            self._scheduler = None
+            self._update_rollups(before, [(removed, -1)])
+            self._update_signatures(before, removed=[index - 1])
+            self._update_tree(before, [("remove", [(index, removed)])])
+            self._record(before, "remove", removed.get("task", ""), [["delete", index - 1, removed]])
+        return removed
+
+    def complete_task(self, index: int) -> Optional[Dict]:
+        """Mark a task as completed.
+
+        Args:
+            index: 1-based index of the task to complete
+
+        Returns:
+            The completed task, or None if the index is invalid
+        """
+        with file_lock(self.lock_file):
+            before = file_signature(self.tasks_file)
+            tasks = self.load_tasks()
+            if not 1 <= index <= len(tasks):
+                return None
+            previous = dict(tasks[index - 1])
+            mark_completed(tasks[index - 1])
+            self.save_tasks(tasks)
+            self._update_schedule(before, tasks, [index])
+            self._update_rollups(before, [(previous, -1), (tasks[index - 1], 1)])
+            self._update_signatures(before)
+            self._update_synctree(before, [
+                (task_id(previous), entry_hash(previous)),
+                (task_id(previous), entry_hash(tasks[index - 1])),
+            ])
+            self._update_tree(before, [("update", tasks[index - 1])])
+            self._record(before, "complete", previous.get("task", ""), [
+                ["replace", index - 1, previous, tasks[index - 1]]
+            ])
+        return tasks[index - 1]
+
+    def move_task(self, index: int, parent: Optional[int] = None) -> Optional[Dict]:
+        """Make a task a subtask of another, or a top-level task again.
+
+        Args:
+            index: 1-based index of the task to move
+            parent: 1-based index of the new parent (None for top level)
+
+        Returns:
+            The moved task, or None if the index is invalid
+
+        Raises:
+            ValueError: If the parent index is invalid or the parent is the
+                task itself or one of its subtasks
+        """
+        with file_lock(self.lock_file):
+            before = file_signature(self.tasks_file)
+            tasks = self.load_tasks()
+            if not 1 <= index <= len(tasks):
+                return None
+            if parent is not None and not 1 <= parent <= len(tasks):
+                raise ValueError(f"Invalid parent task number: {parent}")
+            moved_id = task_id(tasks[index - 1])
+            if parent is not None:
+                positions = {task_id(t): i for i, t in enumerate(tasks, 1)}
+                ancestor: Optional[int] = parent
+                while ancestor is not None:
+                    if ancestor == index:
+                        raise ValueError("Cannot move a task under itself or one of its subtasks")
+                    ancestor = positions.get(tasks[ancestor - 1].get("parent") or "")
+            changes: List = []
+            toggles: List[Tuple[str, int]] = []
+            parent_id = self._stable_id(tasks, parent, changes, toggles) if parent is not None else None
+            task = tasks[index - 1]
+            if task.get("parent") == parent_id:
+                return task
+            previous = dict(task)
+            # Keep the field when moving to top level so sync merges the
+            # change by timestamp instead of resurrecting the old parent
+            task["parent"] = parent_id
+            touch(task, ["parent"])
+            self.save_tasks(tasks)
+            self._update_schedule(before, tasks, [index])
+            self._update_rollups(before, [])
+            self._update_signatures(before)
+            self._update_synctree(before, toggles + [
+                (moved_id, entry_hash(previous)), (moved_id, entry_hash(task))
+            ])
+            self._update_tree(before, [
+                ("move", index, task, (parent, tasks[parent - 1]) if parent is not None else None)
+            ])
+            self._record(before, "move", task.get("task", ""), changes + [["replace", index - 1, previous, task]])
+        return task
+
+    def tree(self, index: Optional[int] = None, depth: Optional[int] = None) -> "Optional[List[TreeRow]]":
+        """Return tasks with their subtasks and rolled-up progress.
+
+        Served from the hierarchy index, so the cost is the size of the
+        part shown rather than the whole list. The index is rebuilt once
+        if the tasks file changed behind its back.
+
+        Args:
+            index: 1-based index of the task to show (None for every
+                top-level task that has subtasks)
+            depth: Deepest level of subtasks to show (None for all)
+
+        Returns:
+            Rows in display order, or None if the index is invalid
         """
+        from .hierarchy import TreeRow, build_tree, find, roots, walk
+
+        signature = file_signature(self.tasks_file)
+        tree = self.hierarchy.load(signature)
+        if tree is None:
+            with file_lock(self.lock_file):
+                signature = file_signature(self.tasks_file)
+                tasks = self.load_tasks()
+                with span("compute"):
+                    tree = build_tree(tasks)
+                if signature is not None:
+                    self.hierarchy.save(tree, signature)
+        with span("compute"):
+            if index is None:
+                return list(walk(tree, roots(tree), depth))
+            start = find(tree, index)
+            if start is not None:
+                return list(walk(tree, [start], depth))
         tasks = self.load_tasks()
+        if not 1 <= index <= len(tasks):
+            return None
+        task = tasks[index - 1]
+        summary = {key: task.get(key) for key in ("task", "status", "priority")}
+        summary["id"] = task_id(task)
+        return [TreeRow(0, index, summary)]
+
+    def next_tasks(self, count: int = 1) -> List[Tuple[int, Dict]]:
+        """Return the most urgent pending tasks.
+
+        Tasks are ranked overdue first, then by priority, due date and age.
+        The priority queue behind this is kept on the instance: repeated
+        calls while the file is unchanged skip loading entirely, and
+        add_task/complete_task made through this instance update the queue
+        in place instead of rebuilding it.
 
-        if not tasks:
-            print(colors.info("No tasks found."))
+        Args:
+            count: Maximum number of tasks to return
+
+        Returns:
+            Up to count (index, task) pairs, most urgent first
+        """
+        from .scheduler import TaskScheduler
+
+        sig = file_signature(self.tasks_file)
+        if self._scheduler is None or sig != self._schedule_sig:
+            tasks = self.load_tasks()
+            with span("compute"):
+                self._scheduler = TaskScheduler.from_tasks(enumerate(tasks, 1))
+            self._schedule_tasks = tasks
+            self._schedule_sig = sig
+        with span("compute"):
+            keys = self._scheduler.peek(count)
+        return [(i, self._schedule_tasks[i - 1]) for i in keys]
+
+    def _update_schedule(self, before: Optional[Tuple[int, int, int]], tasks: List[Dict],
+                         changed: List[int]) -> None:
+        """Apply a saved mutation to the cached schedule, or drop a stale one.
+
+        Args:
+            before: File signature read before the mutation loaded the file
+            tasks: Task list as saved
+            changed: 1-based indices of added or modified tasks
+        """
+        if self._scheduler is None:
             return
+        if before != self._schedule_sig:
+            self._scheduler = None
+            return
+        for index in changed:
+            self._scheduler.add(index, tasks[index - 1])
+        self._schedule_tasks = tasks
+        self._schedule_sig = file_signature(self.tasks_file)
+
+    def _update_rollups(self, before: Optional[Tuple[int, int, int]], changes: List[Tuple[Dict, int]]) -> None:
+        """Apply a saved mutation to the rollups sidecar, if it is current.
+
+        Lists that have never been reported on have no sidecar and skip
+        this entirely.
 
-        # Apply filters
-        if status:
-            tasks = [t for t in tasks if t.get("status") == status]
-        if priority:
-            tasks = [t for t in tasks if t.get("priority") == priority]
-        if tags:
-            tasks = [
-                t for t in tasks
-                if any(tag in t.get("tags", []) for tag in tags)
-            ]
-
-        if not tasks:
-            print(colors.warning("No tasks match the filter criteria."))
+        Args:
+            before: File signature read before the mutation loaded the file
+            changes: (task, sign) pairs passed to RollupStore.apply
+        """
+        if not os.path.exists(sidecar_path(self.tasks_file, "rollups")):
             return
+        with span("rollups"):
+            self.rollups.apply(before, file_signature(self.tasks_file), changes)
 
-        # Print tasks
-        for i, task in enumerate(tasks, 1):
-            status_icon = colors.color_status(task.get("status", "pending"))
-            task_text = task['task']
+    def _update_signatures(
+        self,
+        before: Optional[Tuple[int, int, int]],
+        removed: Sequence[int] = (),
+        added: Sequence[Dict] = ()
+    ) -> None:
+        """Apply a saved mutation to the MinHash index, if it is current.
 
-            # Dim completed tasks
-            if task.get("status") == "completed":
-                task_text = colors.dim(task_text)
+        Args:
+            before: File signature read before the mutation loaded the file
+            removed: 0-based positions deleted from the previous list
+            added: Tasks appended at the end
+        """
+        if not os.path.exists(sidecar_path(self.tasks_file, "minhash")):
+            return
+        with span("minhash"):
+            self.signatures.apply(before, file_signature(self.tasks_file), removed, added)
 
-            print(f"{i}. [{status_icon}] {task_text}")
-            print(f"   Priority: {colors.color_priority(task.get('priority', 'medium'))}")
+    def _update_synctree(self, before: Optional[Tuple[int, int, int]], toggles: List[Tuple[str, int]]) -> None:
+        """Apply a saved mutation to the sync hash tree, if it is current.
 
-            # Show tags if present
-            if task.get("tags"):
-                tag_str = ", ".join([colors.colorize(f"#{tag}", colors.Colors.CYAN) for tag in task["tags"]])
-                print(f"   Tags: {tag_str}")
+        Args:
+            before: File signature read before the mutation loaded the file
+            toggles: (task id, entry hash) pairs passed to SyncTreeStore.apply
+        """
+        if not os.path.exists(self.synctree.path):
+            return
+        self.synctree.apply(before, file_signature(self.tasks_file), toggles)
 
-            # Show due date if present
-            if task.get("due_date"):
-                due_str = colors.colorize(f"📅 Due: {task['due_date']}", colors.Colors.MAGENTA)
-                print(f"   {due_str}")
+    def _update_tree(self, before: Optional[Tuple[int, int, int]], ops: List[Tuple]) -> None:
+        """Apply a saved mutation to the hierarchy index, if it is current.
 
-            if task.get("completed_at"):
-                completed_time = task['completed_at'].split('T')[0] if 'T' in task['completed_at'] else task['completed_at']
-                print(colors.dim(f"   Completed: {completed_time}"))
-            print()
+        Args:
+            before: File signature read before the mutation loaded the file
+            ops: Operations passed to TreeStore.apply
+        """
+        if not os.path.exists(sidecar_path(self.tasks_file, "tree")):
+            return
+        self.hierarchy.apply(before, file_signature(self.tasks_file), ops)
 
-    def remove_task(self, index: int) -> None:
-        """Remove a task by its index.
+    def _record(self, before: Optional[Tuple[int, int, int]], op: str, summary: str, changes: List) -> None:
+        """Add a saved mutation to the undo history.
 
         Args:
-            index: 1-based index of the task to remove
+            before: File signature read before the mutation loaded the file
+            op: Command name shown by history()
+            summary: Short description shown by history()
+            changes: Delta as described in todolist.history
         """
-        tasks = self.load_tasks()
-        if 1 <= index <= len(tasks):
-            removed = tasks.pop(index - 1)
-            self.save_tasks(tasks)
-            print(colors.success("✓ Removed task: ") + f"{removed['task']}")
-        else:
-            print(colors.error("✗ Invalid task number."))
+        self.history.record(before, file_signature(self.tasks_file), [(op, summary, changes)])
 
-    def complete_task(self, index: int) -> None:
-        """Mark a task as completed.
+    def _record_removed(self, before: Optional[Tuple[int, int, int]], removed: List[Dict]) -> None:
+        """Leave tombstones for removed tasks so sync() deletes other copies.
 
         Args:
-            index: 1-based index of the task to complete
+            before: File signature read before the mutation loaded the file
+            removed: Tasks removed from the list
         """
-        tasks = self.load_tasks()
-        if 1 <= index <= len(tasks):
-            tasks[index - 1]["status"] = "completed"
-            tasks[index - 1]["completed_at"] = datetime.now().isoformat()
-            self.save_tasks(tasks)
-            print(colors.success("✓ Completed task: ") + f"{tasks[index - 1]['task']}")
-        else:
-            print(colors.error("✗ Invalid task number."))
+        entries = tombstones_for(removed)
+        replaced = self.tombstones.add(entries)
+        self._update_synctree(
+            before,
+            [(task_id(t), entry_hash(t)) for t in removed]
+            + [(tid, tombstone_hash(tid, ts)) for tid, ts in entries.items()]
+            + [(tid, tombstone_hash(tid, ts)) for tid, ts in replaced.items()],
+        )
+
+    def _load_with_signatures(self) -> Tuple[List[Dict], bytearray]:
+        """Load tasks with their MinHash signatures, rebuilding the index if stale.
+
+        Returns:
+            (tasks, concatenated signatures in task order)
+        """
+        from .dedupe import SignatureIndex, build_blob
+
+        with file_lock(self.lock_file):
+            current = file_signature(self.tasks_file)
+            tasks = self.load_tasks()
+            with span("minhash"):
+                loaded = self.signatures.load()
+                if loaded is not None and SignatureIndex.matches(loaded[0], current):
+                    return tasks, loaded[1]
+                blob = build_blob(tasks)
+                if current is not None:
+                    self.signatures.save(blob, current)
+        return tasks, blob
+
+    def find_duplicates(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        include_completed: bool = False
+    ) -> List[List[Tuple[int, Dict]]]:
+        """Find clusters of near-duplicate tasks.
 
-    def search_tasks(self, query: str) -> None:
-        """Search for tasks containing the query string.
+        Similarity is the estimated Jaccard similarity of description
+        trigrams and tags. Signatures come from the persistent MinHash
+        index, which is built on first use and then kept up to date.
 
         Args:
-            query: Search query string
+            threshold: Minimum similarity between 0 and 1
+            include_completed: Also consider completed tasks
+
+        Returns:
+            Clusters of two or more (index, task) pairs, in list order
         """
-        tasks = self.load_tasks()
-        matching_tasks = [
-            (i, task) for i, task in enumerate(tasks, 1)
-            if query.lower() in task["task"].lower()
+        from .dedupe import find_clusters
+
+        tasks, blob = self._load_with_signatures()
+        positions = [
+            i for i, task in enumerate(tasks)
+            if include_completed or task.get("status", "pending") == "pending"
         ]
+        with span("compute"):
+            clusters = find_clusters(blob, positions, threshold)
+        return [[(p + 1, tasks[p]) for p in cluster] for cluster in clusters]
 
-        if not matching_tasks:
-            print(colors.warning(f"No tasks found matching '{query}'."))
-            return
+    def find_similar(
+        self,
+        description: str,
+        tags: Optional[List[str]] = None,
+        threshold: float = DEFAULT_THRESHOLD
+    ) -> List[Tuple[int, Dict, float]]:
+        """Find pending tasks that look like a prospective new task.
+
+        Args:
+            description: Description of the task about to be added
+            tags: Its tags
+            threshold: Minimum similarity between 0 and 1
+
+        Returns:
+            (index, task, similarity) triples, most similar first
+        """
+        from .dedupe import find_matches, signature
+
+        tasks, blob = self._load_with_signatures()
+        with span("compute"):
+            matches = find_matches(blob, signature(description, tags), threshold)
+        return [
+            (p + 1, tasks[p], score) for p, score in matches
+            if tasks[p].get("status", "pending") == "pending"
+        ]
+
+    def _load_with_vocabulary(self) -> Tuple[List[Dict], Dict[str, Set[int]], Dict[str, Set[int]]]:
+        """Load tasks and bring the BK-tree index up to date with their words.
+
+        Returns:
+            (tasks, tag postings, term postings) as built by fuzzy.vocabulary
+        """
+        from .fuzzy import vocabulary
 
-        print(colors.info(f"Found {len(matching_tasks)} task(s) matching '{query}':\n"))
-        for i, task in matching_tasks:
-            status_icon = colors.color_status(task.get("status", "pending"))
-            task_text = task['task']
-            if task.get("status") == "completed":
-                task_text = colors.dim(task_text)
-            print(f"{i}. [{status_icon}] {task_text}")
-            print(f"   Priority: {colors.color_priority(task.get('priority', 'medium'))}\n")
-
-    def clear_completed(self) -> None:
-        """Remove all completed tasks."""
         tasks = self.load_tasks()
-        remaining = [t for t in tasks if t.get("status") != "completed"]
-        removed_count = len(tasks) - len(remaining)
+        with span("fuzzy"):
+            tag_postings, term_postings = vocabulary(tasks)
+            if not self._terms_loaded:
+                self.terms.load()
+                self._terms_loaded = True
+            if self.terms.sync(tag_postings, term_postings):
+                with file_lock(self.lock_file):
+                    self.terms.save()
+        return tasks, tag_postings, term_postings
+
+    def fuzzy_search(self, query: str, max_distance: Optional[int] = None) -> List[Tuple[int, Dict, float]]:
+        """Search descriptions and tags, tolerating typos.
+
+        Each query word matches words within a small edit distance (by
+        default 0 for words of up to 2 characters, 1 up to 5, else 2).
 
-        if removed_count == 0:
-            print(colors.info("No completed tasks to clear."))
-            return
+        Args:
+            query: Search text
+            max_distance: Typos tolerated per query word
+
+        Returns:
+            (index, task, score) triples, best match first; score is 1.0
+            when every query word matched exactly
+        """
+        from .fuzzy import rank
+
+        tasks, _, term_postings = self._load_with_vocabulary()
+        with span("compute"):
+            ranked = rank(query, self.terms.terms, term_postings, max_distance)
+        return [(p + 1, tasks[p], score) for p, score in ranked]
+
+    def suggest_tags(self, tags: List[str], limit: int = 3) -> Dict[str, List[str]]:
+        """Suggest existing tags for tags that no task has.
+
+        Args:
+            tags: Tags from a filter
+            limit: Maximum suggestions per tag
+
+        Returns:
+            Dictionary mapping each unknown tag to close existing tags
+        """
+        from .fuzzy import suggest
 
-        self.save_tasks(remaining)
-        print(colors.success(f"✓ Cleared {removed_count} completed task(s)."))
+        _, tag_postings, _ = self._load_with_vocabulary()
+        with span("compute"):
+            return {
+                tag: suggest(self.terms.tags, tag, tag_postings, limit)
+                for tag in tags if tag not in tag_postings
+            }
 
-    def list_tags(self) -> None:
-        """List all unique tags with task counts."""
+    def search_tasks(self, query: str) -> Iterator[Tuple[int, Dict]]:
+        """Iterate over tasks containing the query string.
+
+        Args:
+            query: Case-insensitive search string
+
+        Yields:
+            (index, task) pairs, where index is the task's 1-based position
+        """
+        yield from match_tasks(self.load_tasks(), query)
+
+    def clear_completed(self) -> int:
+        """Remove all completed tasks.
+
+        Returns:
+            Number of tasks removed
+        """
+        with file_lock(self.lock_file):
+            before = file_signature(self.tasks_file)
+            tasks = self.load_tasks()
+            remaining = [t for t in tasks if t.get("status") != "completed"]
+            removed_count = len(tasks) - len(remaining)
+            if removed_count:
+                self.save_tasks(remaining)
+                self._record_removed(before, [t for t in tasks if t.get("status") == "completed"])
+                self._scheduler = None
+                self._update_rollups(
+                    before, [(t, -1) for t in tasks if t.get("status") == "completed"]
+                )
+                self._update_signatures(
+                    before, removed=[i for i, t in enumerate(tasks) if t.get("status") == "completed"]
+                )
+                self._update_tree(
+                    before, [("remove", [(i, t) for i, t in enumerate(tasks, 1) if t.get("status") == "completed"])]
+                )
+                self._record(before, "clear", f"{removed_count} completed task(s)", [
+                    ["delete", i, tasks[i]]
+                    for i in range(len(tasks) - 1, -1, -1) if tasks[i].get("status") == "completed"
+                ])
+        return removed_count
+
+    def list_tags(self) -> Dict[str, int]:
+        """Count tasks per tag.
+
+        Returns:
+            Dictionary mapping tag to number of tasks
+        """
+        return count_tags(self.load_tasks())
+
+    def get_statistics(self) -> TaskStatistics:
+        """Compute statistics about tasks.
+
+        Returns:
+            TaskStatistics for the current list
+        """
+        return compute_statistics(self.load_tasks())
+
+    def report(self, by: str = "week", tags: Optional[List[str]] = None, last: Optional[int] = None) -> "Report":
+        """Summarize created and completed tasks per period and per tag.
+
+        Served from the rollups sidecar when it matches the tasks file, so
+        no task is parsed. Otherwise the rollups are rebuilt once and saved.
+
+        Args:
+            by: Period length (day, week or month)
+            tags: Tags to break down (defaults to every tag)
+            last: Only include the most recent N periods
+
+        Returns:
+            Report with overall and per-tag periods
+
+        Raises:
+            ValueError: If the period is not supported
+        """
+        from .rollups import RollupStore, build_rollups, make_report
+
+        with span("rollups"):
+            rollups = self.rollups.load()
+        if rollups is None or not RollupStore.matches(rollups, file_signature(self.tasks_file)):
+            with file_lock(self.lock_file):
+                signature = file_signature(self.tasks_file)
+                tasks = self.load_tasks()
+                with span("rollups"):
+                    rollups = build_rollups(tasks)
+                    if signature is not None:
+                        self.rollups.save(rollups, signature)
+        with span("compute"):
+            return make_report(rollups, by, tags, last)
+
+    def _load_replica(self) -> Replica:
+        """Load tasks, tombstones and hash tree for sync (caller holds the lock).
+
+        Returns:
+            The replica; tasks missing an id get one and mark it changed
+        """
         tasks = self.load_tasks()
+        changed = ensure_ids(tasks)
+        tombstones = self.tombstones.load()
+        expired = prune(tombstones)
+        tree = None if changed else self.synctree.load(file_signature(self.tasks_file))
+        if tree is None:
+            with span("compute"):
+                tree = SyncTree.from_state(tasks, tombstones)
+            changed = True
+        else:
+            for tid, removed_at in expired.items():
+                tree.toggle(tid, tombstone_hash(tid, removed_at))
+        return Replica(tasks, tombstones, tree, changed or bool(expired))
 
-        if not tasks:
-            print(colors.info("No tasks found."))
-            return
+    def _save_replica(self, replica: Replica) -> None:
+        """Write back a replica changed by sync (caller holds the lock).
 
-        # Collect all tags with counts
-        tag_counts: Dict[str, int] = {}
-        for task in tasks:
-            for tag in task.get("tags", []):
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        Args:
+            replica: Replica returned by _load_replica
+        """
+        self.save_tasks(replica.tasks)
+        self.tombstones.save(replica.tombstones)
+        self.synctree.save(replica.tree, file_signature(self.tasks_file))
 
-        if not tag_counts:
-            print(colors.info("No tags found."))
-            return
+    def sync(self, other: str, dry_run: bool = False) -> SyncResult:
+        """Merge this list with another task file in both directions.
+
+        Tasks are matched by id. Each field keeps the most recently changed
+        value, removals win over older edits, and tasks missing on one side
+        are copied over. Both files are locked for the whole merge, and a
+        hash tree kept alongside each file limits the comparison to the
+        parts that differ.
+
+        Args:
+            other: Path of the other tasks file, or a directory containing tasks.json
+            dry_run: Compute the result without writing either file
+
+        Returns:
+            Counts of what was copied, updated and removed on each side
+
+        Raises:
+            ValueError: If other is this list's own file or its directory is missing
+        """
+        from .history import diff
+
+        if os.path.isdir(other):
+            other = os.path.join(other, "tasks.json")
+        if os.path.realpath(other) == os.path.realpath(self.tasks_file):
+            raise ValueError("Cannot sync a task list with itself")
+        if not os.path.isdir(os.path.dirname(os.path.abspath(other))):
+            raise ValueError(f"No such directory: {os.path.dirname(other)}")
+        remote = TodoList(other)
+        # A fixed lock order keeps two opposite syncs from deadlocking
+        first, second = sorted((self, remote), key=lambda t: os.path.realpath(t.lock_file))
+        result = SyncResult()
+        with file_lock(first.lock_file), file_lock(second.lock_file):
+            trees = [t.synctree.load(file_signature(t.tasks_file)) for t in (self, remote)]
+            if None not in trees and trees[0].root() == trees[1].root():
+                # Equal roots: nothing differs, so neither file needs reading
+                return result
+            local_state, remote_state = self._load_replica(), remote._load_replica()
+            previous = [list(local_state.tasks), list(remote_state.tasks)]
+            with span("compute"):
+                merge(local_state, remote_state, result)
+            if not dry_run:
+                for todo, state, old, peer in (
+                    (self, local_state, previous[0], os.path.abspath(other)),
+                    (remote, remote_state, previous[1], os.path.abspath(self.tasks_file)),
+                ):
+                    if state.changed:
+                        before = file_signature(todo.tasks_file)
+                        todo._save_replica(state)
+                        todo._record(before, "sync", f"with {peer}", diff(old, state.tasks))
+        self._scheduler = None
+        return result
+
+    def add_recurring(
+        self,
+        description: str,
+        rule: str,
+        priority: Priority = "medium",
+        tags: Optional[List[str]] = None,
+        start: Optional[date] = None
+    ) -> Dict:
+        """Add a recurring task template.
+
+        Nothing is added to the tasks file: occurrences are generated when
+        an agenda is listed, and only stored once completed.
+
+        Args:
+            description: Description of each occurrence
+            rule: Recurrence rule (see todolist.recurrence)
+            priority: Priority of each occurrence
+            tags: Tags of each occurrence
+            start: Date of the first possible occurrence (defaults to today)
+
+        Returns:
+            The created template
+
+        Raises:
+            ValueError: If the rule is not understood
+        """
+        from .recurrence import parse_rule
+
+        parsed = parse_rule(rule)
+        template = {
+            "id": uuid.uuid4().hex,
+            "task": description,
+            "priority": priority,
+            "tags": tags or [],
+            "rule": parsed.text,
+            "start": (start or date.today()).isoformat(),
+            "created_at": datetime.now().isoformat(),
+        }
+        with file_lock(self.lock_file):
+            templates = self.recurring.load()
+            templates.append(template)
+            self.recurring.save(templates)
+        return template
+
+    def list_recurring(self) -> List[Tuple[int, Dict]]:
+        """Return the recurring task templates.
+
+        Returns:
+            (index, template) pairs, where index is the 1-based position
+        """
+        return list(enumerate(self.recurring.load(), 1))
+
+    def remove_recurring(self, index: int) -> Optional[Dict]:
+        """Remove a recurring task template.
+
+        Completed occurrences already in the tasks file are kept.
+
+        Args:
+            index: 1-based index of the template
+
+        Returns:
+            The removed template, or None if the index is invalid
+        """
+        with file_lock(self.lock_file):
+            templates = self.recurring.load()
+            if not 1 <= index <= len(templates):
+                return None
+            removed = templates.pop(index - 1)
+            self.recurring.save(templates)
+        return removed
+
+    def complete_occurrence(self, index: int, on: Optional[date] = None) -> Optional[Dict]:
+        """Complete one occurrence of a recurring task.
+
+        The occurrence is stored as a completed task due on its date and
+        marked with the template and date it came from.
+
+        Args:
+            index: 1-based index of the template
+            on: Occurrence date (defaults to the latest one not yet done
+                that is due by today, or else the next one)
 
-        print(colors.info("Available tags:\n"))
-        for tag, count in sorted(tag_counts.items()):
-            tag_colored = colors.colorize(f"#{tag}", colors.Colors.CYAN, bold=True)
-            print(f"  {tag_colored} ({count} task{'s' if count != 1 else ''})")
+        Returns:
+            The stored task, or None if the index is invalid
+
+        Raises:
+            ValueError: If the date is not an occurrence or is already done
+        """
+        from .recurrence import next_occurrence, occurrences, parse_rule, previous_occurrence
+
+        with file_lock(self.lock_file):
+            templates = self.recurring.load()
+            if not 1 <= index <= len(templates):
+                return None
+            template = templates[index - 1]
+            rule, start = parse_rule(template["rule"]), date.fromisoformat(template["start"])
+            before = file_signature(self.tasks_file)
+            tasks = self.load_tasks()
+            done = _completed_occurrences(tasks).get(template["id"], {})
+            if on is None:
+                today = date.today()
+                on = previous_occurrence(rule, start, today)
+                if on is None or on in done:
+                    on = next_occurrence(rule, start, today)
+                    while on is not None and on in done:
+                        on = next_occurrence(rule, start, on)
+                if on is None:
+                    raise ValueError(f"No upcoming occurrence of {template['task']}")
+            elif next(occurrences(rule, start, on, on), None) is None:
+                raise ValueError(f"{template['task']} does not recur on {on.isoformat()}")
+            if on in done:
+                raise ValueError(f"{template['task']} is already done for {on.isoformat()}")
+            task = make_task(template["task"], template.get("priority", "medium"), template.get("tags"), on.isoformat())
+            task["recurrence"] = {"template": template["id"], "on": on.isoformat()}
+            mark_completed(task)
+            self._append(before, tasks, task, "done", f"{template['task']} ({on.isoformat()})")
+        return task
+
+    def agenda(self, start: Optional[date] = None, days: int = 7) -> "Iterator[AgendaItem]":
+        """Iterate over everything due in a date window.
+
+        Occurrences of recurring templates are generated lazily and merged
+        in date order with the regular tasks due in the window. Completed
+        occurrences show up as completed; stored occurrences of templates
+        that still exist are not listed a second time.
+
+        Args:
+            start: First day of the window (defaults to today)
+            days: Length of the window in days
 
-    def get_statistics(self) -> None:
-        """Display statistics about tasks."""
+        Yields:
+            Agenda items in date order
+        """
+        from .recurrence import AgendaItem, occurrences, parse_rule
+        from .scheduler import parse_due
+
+        begin = start or date.today()
+        end = begin + timedelta(days=days - 1)
+        templates = self.recurring.load()
         tasks = self.load_tasks()
+        live = {t["id"] for t in templates}
+        done = _completed_occurrences(tasks)
+
+        def regular() -> Iterator[AgendaItem]:
+            due = []
+            for index, task in enumerate(tasks, 1):
+                if (task.get("recurrence") or {}).get("template") in live:
+                    continue
+                on = parse_due(task.get("due_date"))
+                if on is not None and begin <= on <= end:
+                    due.append(AgendaItem(on, index, task))
+            due.sort(key=lambda item: item.on)
+            return iter(due)
+
+        def expand(number: int, template: Dict) -> Iterator[AgendaItem]:
+            rule, first = parse_rule(template["rule"]), date.fromisoformat(template["start"])
+            completed = done.get(template["id"], {})
+            for on in occurrences(rule, first, begin, end):
+                task = completed.get(on) or _pending_occurrence(template, on)
+                yield AgendaItem(on, number, task, recurring=True)
+
+        streams = [regular()] + [expand(i, t) for i, t in enumerate(templates, 1)]
+        yield from heapq.merge(*streams, key=lambda item: item.on)
+
+    def undo(self) -> "Optional[Revision]":
+        """Reverse the most recent change that has not been undone.
 
-        if not tasks:
-            print(colors.info("No tasks found."))
-            return
+        Returns:
+            The undone revision, or None if there is nothing to undo
+
+        Raises:
+            ValueError: If the tasks file was changed by something that does
+                not record history (an editor, another program)
+        """
+        return self._step("undo")
+
+    def redo(self) -> "Optional[Revision]":
+        """Re-apply the most recently undone change.
+
+        Any new change made after an undo discards the changes that could
+        be redone.
+
+        Returns:
+            The redone revision, or None if there is nothing to redo
+
+        Raises:
+            ValueError: If the tasks file was changed by something that does
+                not record history
+        """
+        return self._step("redo")
+
+    def _step(self, kind: str) -> "Optional[Revision]":
+        """Apply one undo or redo step under the lock.
 
-        # Calculate statistics
-        total = len(tasks)
-        completed = len([t for t in tasks if t.get("status") == "completed"])
-        pending = total - completed
-
-        # Priority breakdown
-        high_priority = len([t for t in tasks if t.get("priority") == "high" and t.get("status") == "pending"])
-        medium_priority = len([t for t in tasks if t.get("priority") == "medium" and t.get("status") == "pending"])
-        low_priority = len([t for t in tasks if t.get("priority") == "low" and t.get("status") == "pending"])
-
-        # Completion percentage
-        completion_pct = (completed / total * 100) if total > 0 else 0
-
-        # Display statistics
-        print(colors.colorize("=" * 50, colors.Colors.BLUE))
-        print(colors.colorize("  Task Statistics", colors.Colors.BLUE, bold=True))
-        print(colors.colorize("=" * 50, colors.Colors.BLUE))
-        print()
-
-        print(f"  Total tasks: {colors.colorize(str(total), colors.Colors.WHITE, bold=True)}")
-        print(f"  Completed:   {colors.colorize(str(completed), colors.Colors.GREEN, bold=True)} ({completion_pct:.1f}%)")
-        print(f"  Pending:     {colors.colorize(str(pending), colors.Colors.YELLOW, bold=True)}")
-        print()
-
-        print("  Pending by priority:")
-        print(f"    {colors.color_priority('high')}: {high_priority}")
-        print(f"    {colors.color_priority('medium')}: {medium_priority}")
-        print(f"    {colors.color_priority('low')}: {low_priority}")
-        print()
-
-        # Tags statistics
-        tag_counts: Dict[str, int] = {}
-        for task in tasks:
-            for tag in task.get("tags", []):
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
-
-        if tag_counts:
-            print(f"  Total tags: {len(tag_counts)}")
-            top_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-            print("  Top tags:")
-            for tag, count in top_tags:
-                tag_colored = colors.colorize(f"#{tag}", colors.Colors.CYAN)
-                print(f"    {tag_colored}: {count}")
-        print()
-
-        print(colors.colorize("=" * 50, colors.Colors.BLUE))
-
-    def export_tasks(self, format: str = "json", output_file: Optional[str] = None) -> None:
+        Args:
+            kind: "undo" or "redo"
+
+        Returns:
+            The revision stepped over, or None if there is none
+        """
+        from .history import Revision, apply_changes, invert
+
+        with file_lock(self.lock_file):
+            applied, undone, _ = self.history.load()
+            stack = applied if kind == "undo" else undone
+            if not stack:
+                return None
+            if not self.history.current(file_signature(self.tasks_file)):
+                raise ValueError("The tasks file was changed outside todo, so its history no longer applies")
+            record = stack[-1]
+            changes = invert(record["changes"]) if kind == "undo" else record["changes"]
+            tasks = self.load_tasks()
+            with span("compute"):
+                apply_changes(tasks, changes, utc_now())
+            self.save_tasks(tasks)
+            self._scheduler = None
+            deleted = [c[2] for c in changes if c[0] == "delete"]
+            self.tombstones.add(tombstones_for(deleted))
+            self.tombstones.discard(task_id(c[2]) for c in changes if c[0] == "insert")
+            self.history.mark(kind, record["rev"], file_signature(self.tasks_file))
+        return Revision(record["rev"], record["op"], record["summary"], record["at"], kind == "undo")
+
+    def revisions(self) -> "List[Revision]":
+        """Return the undo history.
+
+        Returns:
+            Revisions oldest first; undone ones, which redo() would re-apply,
+            come last
+        """
+        return self.history.revisions()
+
+    def export_tasks(self, format: str = "json", output_file: Optional[str] = None) -> int:
         """Export tasks to various formats.
 
+        Nothing is written when there are no tasks.
+
         Args:
             format: Export format (json, csv, or markdown)
-            output_file: Output file path (defaults to tasks.[format])
-        """
-        tasks = self.load_tasks()
+            output_file: Output file path (defaults to tasks_export.[format])
 
-        if not tasks:
-            print(colors.warning("No tasks to export."))
-            return
+        Returns:
+            Number of tasks exported
 
-        if output_file is None:
-            output_file = f"tasks_export.{format}"
-
-        try:
-            if format == "json":
-                with open(output_file, "w") as f:
-                    json.dump(tasks, f, indent=4)
-
-            elif format == "csv":
-                import csv
-                with open(output_file, "w", newline="") as f:
-                    fieldnames = ["task", "status", "priority", "tags", "due_date", "created_at", "completed_at"]
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for task in tasks:
-                        task_copy = task.copy()
-                        task_copy["tags"] = ",".join(task.get("tags", []))
-                        writer.writerow(task_copy)
-
-            elif format == "markdown":
-                with open(output_file, "w") as f:
-                    f.write("# Todo List\n\n")
-
-                    # Pending tasks
-                    pending_tasks = [t for t in tasks if t.get("status") == "pending"]
-                    if pending_tasks:
-                        f.write("## Pending Tasks\n\n")
-                        for task in pending_tasks:
-                            priority = task.get("priority", "medium").upper()
-                            tags_str = " ".join([f"`#{tag}`" for tag in task.get("tags", [])])
-                            due = f" (Due: {task.get('due_date')})" if task.get("due_date") else ""
-                            f.write(f"- [ ] **{task['task']}** [{priority}]{due}\n")
-                            if tags_str:
-                                f.write(f"  - Tags: {tags_str}\n")
-                        f.write("\n")
-
-                    # Completed tasks
-                    completed_tasks = [t for t in tasks if t.get("status") == "completed"]
-                    if completed_tasks:
-                        f.write("## Completed Tasks\n\n")
-                        for task in completed_tasks:
-                            priority = task.get("priority", "medium").upper()
-                            tags_str = " ".join([f"`#{tag}`" for tag in task.get("tags", [])])
-                            f.write(f"- [x] ~~{task['task']}~~ [{priority}]\n")
-                            if tags_str:
-                                f.write(f"  - Tags: {tags_str}\n")
-
-            print(colors.success(f"✓ Exported {len(tasks)} task(s) to {output_file}"))
-
-        except Exception as e:
-            print(colors.error(f"✗ Error exporting tasks: {e}"))
+        Raises:
+            ValueError: If the format is not supported
+            OSError: If the file cannot be written
+        """
+        tasks = self.load_tasks()
+        if tasks:
+            write_export(tasks, format, output_file or default_export_path(format))
+        return len(tasks)
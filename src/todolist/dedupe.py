@@ -0,0 +1,320 @@
+"""Near-duplicate detection with MinHash and locality-sensitive hashing.
+
+Each task is reduced to a set of shingles: character trigrams of its
+normalized description plus one token per tag. A MinHash signature of
+PERMS 16-bit values estimates the Jaccard similarity of two shingle sets
+as the fraction of positions where their signatures agree. Signatures are
+split into BANDS bands; tasks sharing any band land in the same bucket
+and only those candidate pairs are compared, which keeps clustering close
+to linear in the number of tasks.
+
+Signatures are cached in a ``<tasks_file>.minhash`` sidecar: a JSON header
+line followed by the fixed-size signatures in task order. Like the report
+rollups, it records the tasks file signature it matches, is updated in
+place by mutations while current, and is rebuilt when stale.
+
+A task with no shingles (no description words beyond stopwords and no
+tags) gets the all-zero EMPTY signature. Such tasks carry nothing to
+compare, so they are never reported as duplicates of anything.
+"""
+
+import hashlib
+import json
+import re
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .locking import write_atomic
+
+PERMS = 32
+BANDS = 8
+ROWS = PERMS // BANDS
+ENTRY_SIZE = PERMS * 2
+BAND_SIZE = ROWS * 2
+
+DEFAULT_THRESHOLD = 0.7
+
+VERSION = 1
+
+# Words that carry no meaning for duplicate detection
+STOPWORDS = frozenset(
+    "a an and the to of for in on at by with from into is are be it this that my our".split()
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_PACK = struct.Struct(f">{PERMS}H")
+
+# Signature of a task without shingles; excluded from matching
+EMPTY = bytes(ENTRY_SIZE)
+
+# Per-shingle hash values, shared across calls (the trigram vocabulary is small)
+_hash_cache: Dict[str, array] = {}
+
+
+def shingles(description: str, tags: Optional[Iterable[str]] = None) -> Set[str]:
+    """Return the shingle set of a task.
+
+    Args:
+        description: Task description
+        tags: Task tags
+
+    Returns:
+        Character trigrams of the normalized description plus "#tag" tokens
+    """
+    words = [w for w in _WORD.findall(description.lower()) if w not in STOPWORDS]
+    text = " ".join(words)
+    result = {text[i:i + 3] for i in range(max(1, len(text) - 2))} if text else set()
+    result.update(f"#{tag.lower()}" for tag in tags or [])
+    return result
+
+
+def _hashes(shingle: str) -> array:
+    values = _hash_cache.get(shingle)
+    if values is None:
+        values = array("H", hashlib.blake2b(shingle.encode(), digest_size=ENTRY_SIZE).digest())
+        if sys.byteorder == "big":
+            values.byteswap()
+        _hash_cache[shingle] = values
+    return values
+
+
+def signature(description: str, tags: Optional[Iterable[str]] = None) -> bytes:
+    """Compute the MinHash signature of a task.
+
+    Args:
+        description: Task description
+        tags: Task tags
+
+    Returns:
+        ENTRY_SIZE bytes (PERMS big-endian 16-bit minimums), or EMPTY if
+        the task has no shingles
+    """
+    rows = [_hashes(s) for s in shingles(description, tags)]
+    if not rows:
+        return EMPTY
+    return _PACK.pack(*map(min, zip(*rows)))
+
+
+def task_signature(task: Dict) -> bytes:
+    """Compute the MinHash signature of a task dictionary.
+
+    Args:
+        task: Task dictionary
+
+    Returns:
+        Signature bytes
+    """
+    return signature(task.get("task", ""), task.get("tags"))
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimate the Jaccard similarity of two signatures.
+
+    Args:
+        a: Signature bytes
+        b: Signature bytes
+
+    Returns:
+        Fraction of matching positions, between 0 and 1
+    """
+    return sum(x == y for x, y in zip(_PACK.unpack(a), _PACK.unpack(b))) / PERMS
+
+
+def _entry(blob: bytes, position: int) -> bytes:
+    return bytes(blob[position * ENTRY_SIZE:(position + 1) * ENTRY_SIZE])
+
+
+def find_clusters(
+    blob: bytes,
+    positions: Sequence[int],
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[List[int]]:
+    """Group near-duplicate signatures.
+
+    Candidates come from LSH buckets. Each bucket member is verified
+    against the first member of the bucket, and verified pairs are merged
+    with union-find, so a bucket of m identical tasks costs O(m). Tasks
+    with the EMPTY signature are skipped.
+
+    Args:
+        blob: Concatenated signatures in task order
+        positions: 0-based positions to consider
+        threshold: Minimum estimated similarity
+
+    Returns:
+        Clusters of two or more positions, each sorted, ordered by first position
+    """
+    blob = bytes(blob)
+    positions = [p for p in positions if _entry(blob, p) != EMPTY]
+    parent = {p: p for p in positions}
+
+    def find(p: int) -> int:
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
+
+    for band in range(BANDS):
+        buckets: Dict[bytes, List[int]] = {}
+        start = band * BAND_SIZE
+        for p in positions:
+            offset = p * ENTRY_SIZE + start
+            buckets.setdefault(blob[offset:offset + BAND_SIZE], []).append(p)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            head = members[0]
+            head_sig = _entry(blob, head)
+            for other in members[1:]:
+                root_a, root_b = find(head), find(other)
+                if root_a != root_b and similarity(head_sig, _entry(blob, other)) >= threshold:
+                    parent[root_b] = root_a
+
+    groups: Dict[int, List[int]] = {}
+    for p in positions:
+        groups.setdefault(find(p), []).append(p)
+    return sorted((sorted(g) for g in groups.values() if len(g) > 1), key=lambda g: g[0])
+
+
+def find_matches(blob: bytes, sig: bytes, threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[int, float]]:
+    """Find stored signatures similar to one signature.
+
+    Each band of the query is located in the blob with a byte search, so
+    a lookup scans at C speed rather than visiting every task in Python.
+
+    Args:
+        blob: Concatenated signatures in task order
+        sig: Signature to look up
+        threshold: Minimum estimated similarity
+
+    Returns:
+        (position, similarity) pairs, most similar first (none for EMPTY)
+    """
+    found: Dict[int, float] = {}
+    if sig == EMPTY:
+        return []
+    for band in range(BANDS):
+        start = band * BAND_SIZE
+        needle = sig[start:start + BAND_SIZE]
+        offset = blob.find(needle)
+        while offset != -1:
+            position, rem = divmod(offset - start, ENTRY_SIZE)
+            if rem == 0 and position not in found and _entry(blob, position) != EMPTY:
+                found[position] = similarity(sig, _entry(blob, position))
+            offset = blob.find(needle, offset + 1)
+    return sorted(
+        ((p, s) for p, s in found.items() if s >= threshold),
+        key=lambda item: (-item[1], item[0]),
+    )
+
+
+def build_blob(tasks: Iterable[Dict]) -> bytearray:
+    """Compute signatures for a task list.
+
+    Args:
+        tasks: Tasks in file order
+
+    Returns:
+        Concatenated signatures
+    """
+    blob = bytearray()
+    # Imported and automated tasks often repeat verbatim
+    seen: Dict[Tuple[str, Tuple[str, ...]], bytes] = {}
+    for task in tasks:
+        key = (task.get("task", ""), tuple(task.get("tags") or ()))
+        sig = seen.get(key)
+        if sig is None:
+            sig = seen[key] = signature(*key)
+        blob += sig
+    return blob
+
+
+class SignatureIndex:
+    """MinHash signatures persisted in a sidecar file.
+
+    Attributes:
+        path: Path to the index file
+    """
+
+    def __init__(self, path: str):
+        """Initialize the index.
+
+        Args:
+            path: Path to the index file
+        """
+        self.path = path
+
+    def load(self) -> Optional[Tuple[Dict[str, Any], bytearray]]:
+        """Read the stored index.
+
+        Returns:
+            (header, signatures), or None if missing, unreadable or built
+            with different parameters
+        """
+        try:
+            with open(self.path, "rb") as f:
+                header = json.loads(f.readline())
+                blob = bytearray(f.read())
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(header, dict)
+            or header.get("version") != VERSION
+            or header.get("perms") != PERMS
+            or len(blob) % ENTRY_SIZE
+        ):
+            return None
+        return header, blob
+
+    def save(self, blob: bytes, signature: Optional[Tuple[int, ...]]) -> None:
+        """Write signatures along with the tasks file signature they match.
+
+        Args:
+            blob: Concatenated signatures in task order
+            signature: file_signature of the tasks file
+        """
+        header = {"version": VERSION, "perms": PERMS, "signature": list(signature) if signature else None}
+        write_atomic(self.path, json.dumps(header).encode() + b"\n" + bytes(blob))
+
+    @staticmethod
+    def matches(header: Dict[str, Any], signature: Optional[Tuple[int, ...]]) -> bool:
+        """Return whether an index was built from the given file version.
+
+        Args:
+            header: Stored header
+            signature: Current file_signature of the tasks file
+
+        Returns:
+            True if the index is current
+        """
+        return signature is not None and header.get("signature") == list(signature)
+
+    def apply(
+        self,
+        before: Optional[Tuple[int, ...]],
+        after: Optional[Tuple[int, ...]],
+        removed: Sequence[int] = (),
+        added: Sequence[Dict] = ()
+    ) -> None:
+        """Apply a saved mutation to the stored index.
+
+        Nothing happens unless the index exists and was current before the
+        mutation; a stale index is rebuilt the next time it is used.
+
+        Args:
+            before: Tasks file signature before the mutation
+            after: Tasks file signature after the mutation was saved
+            removed: 0-based positions deleted from the previous list
+            added: Tasks appended at the end of the list
+        """
+        loaded = self.load()
+        if loaded is None or not self.matches(loaded[0], before):
+            return
+        blob = loaded[1]
+        for position in sorted(removed, reverse=True):
+            del blob[position * ENTRY_SIZE:(position + 1) * ENTRY_SIZE]
+        for task in added:
+            blob += task_signature(task)
+        self.save(blob, after)
@@ -0,0 +1,581 @@
+"""Human-readable terminal presentation of todo list results."""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from . import colors
+from .core import TaskStatistics
+from .storage import VerifyReport
+from .sync import SyncResult
+
+if TYPE_CHECKING:  # pragma: no cover - only needed for annotations
+    from .hierarchy import TreeRow
+    from .history import Revision
+    from .recurrence import AgendaItem
+    from .rollups import PeriodStats, Report
+
+
+def format_tags(tags: Iterable[str]) -> str:
+    """Format tags as a comma-separated, colored list.
+
+    Args:
+        tags: Tag names
+
+    Returns:
+        Formatted tag string
+    """
+    return ", ".join([colors.colorize(f"#{tag}", colors.Colors.CYAN) for tag in tags])
+
+
+def format_task(index: int, task: Dict) -> List[str]:
+    """Format a task as the lines shown by ``todo list``.
+
+    Args:
+        index: 1-based index of the task
+        task: Task dictionary
+
+    Returns:
+        Output lines for the task, ending with a blank separator line
+    """
+    status_icon = colors.color_status(task.get("status", "pending"))
+    task_text = task['task']
+
+    # Dim completed tasks
+    if task.get("status") == "completed":
+        task_text = colors.dim(task_text)
+
+    lines = [
+        f"{index}. [{status_icon}] {task_text}",
+        f"   Priority: {colors.color_priority(task.get('priority', 'medium'))}",
+    ]
+
+    # Show tags if present
+    if task.get("tags"):
+        lines.append(f"   Tags: {format_tags(task['tags'])}")
+
+    # Show due date if present
+    if task.get("due_date"):
+        due_str = colors.colorize(f"📅 Due: {task['due_date']}", colors.Colors.MAGENTA)
+        lines.append(f"   {due_str}")
+
+    if task.get("completed_at"):
+        completed_time = task['completed_at'].split('T')[0] if 'T' in task['completed_at'] else task['completed_at']
+        lines.append(colors.dim(f"   Completed: {completed_time}"))
+    lines.append("")
+    return lines
+
+
+def print_added(task: Dict) -> None:
+    """Print confirmation for a newly added task.
+
+    Args:
+        task: The added task
+    """
+    msg = colors.success("✓ Added task: ") + f"{task['task']} [{colors.color_priority(task['priority'])}]"
+    if task.get("tags"):
+        msg += f" {format_tags(task['tags'])}"
+    if task.get("due_date"):
+        msg += colors.colorize(f" 📅 Due: {task['due_date']}", colors.Colors.MAGENTA)
+    print(msg)
+
+
+def print_tasks(results: Iterable[Tuple[int, Dict]], filtered: bool = False) -> int:
+    """Print tasks as they are produced.
+
+    Args:
+        results: (index, task) pairs to print
+        filtered: Whether filters were applied (changes the empty message)
+
+    Returns:
+        Number of tasks printed
+    """
+    count = 0
+    for index, task in results:
+        print("\n".join(format_task(index, task)))
+        count += 1
+
+    if count == 0:
+        if filtered:
+            print(colors.warning("No tasks match the filter criteria."))
+        else:
+            print(colors.info("No tasks found."))
+    return count
+
+
+def format_view(results: Iterable[Tuple[int, Dict]], header: str, filtered: bool = False) -> List[str]:
+    """Format the screen shown by ``todo watch``.
+
+    Args:
+        results: (index, task) pairs to show
+        header: Title line
+        filtered: Whether filters were applied (changes the empty message)
+
+    Returns:
+        Screen lines
+    """
+    lines = [colors.colorize(header, colors.Colors.BLUE, bold=True), ""]
+    count = 0
+    for index, task in results:
+        lines.extend(format_task(index, task))
+        count += 1
+    if count == 0:
+        if filtered:
+            lines.append(colors.warning("No tasks match the filter criteria."))
+        else:
+            lines.append(colors.info("No tasks found."))
+    return lines
+
+
+def print_next(results: Iterable[Tuple[int, Dict]]) -> int:
+    """Print the most urgent tasks.
+
+    Args:
+        results: (index, task) pairs, most urgent first
+
+    Returns:
+        Number of tasks printed
+    """
+    count = 0
+    for index, task in results:
+        print("\n".join(format_task(index, task)))
+        count += 1
+    if count == 0:
+        print(colors.info("No pending tasks."))
+    return count
+
+
+def print_similar(matches: List[Tuple[int, Dict, float]], limit: int = 5) -> None:
+    """Warn about existing tasks that look like a newly added one.
+
+    Args:
+        matches: (index, task, similarity) triples, most similar first
+        limit: Maximum number of tasks to list
+    """
+    if not matches:
+        return
+    print(colors.warning("⚠ Similar pending task(s) already exist:"))
+    for index, task, score in matches[:limit]:
+        print(f"   {index}. {task['task']} ({score:.0%} similar)")
+    if len(matches) > limit:
+        print(colors.dim(f"   ... and {len(matches) - limit} more"))
+
+
+def print_duplicates(clusters: List[List[Tuple[int, Dict]]]) -> int:
+    """Print groups of near-duplicate tasks.
+
+    Args:
+        clusters: Groups of (index, task) pairs
+
+    Returns:
+        Number of groups printed
+    """
+    if not clusters:
+        print(colors.success("✓ No near-duplicate tasks found."))
+        return 0
+
+    print(colors.info(f"Found {len(clusters)} group(s) of near-duplicate tasks:\n"))
+    for number, cluster in enumerate(clusters, 1):
+        print(colors.colorize(f"Group {number}", colors.Colors.BLUE, bold=True))
+        for index, task in cluster:
+            line = f"   {index}. {task['task']} [{colors.color_priority(task.get('priority', 'medium'))}]"
+            if task.get("tags"):
+                line += f" {format_tags(task['tags'])}"
+            print(line)
+        print()
+    return len(clusters)
+
+
+def print_removed(task: Dict) -> None:
+    """Print confirmation for a removed task.
+
+    Args:
+        task: The removed task
+    """
+    print(colors.success("✓ Removed task: ") + f"{task['task']}")
+
+
+def print_completed(task: Dict) -> None:
+    """Print confirmation for a completed task.
+
+    Args:
+        task: The completed task
+    """
+    print(colors.success("✓ Completed task: ") + f"{task['task']}")
+
+
+def print_moved(task: Dict, parent: Optional[int]) -> None:
+    """Print confirmation for a task given a new parent.
+
+    Args:
+        task: The moved task
+        parent: 1-based index of the new parent (None for top level)
+    """
+    where = f"under task {parent}" if parent is not None else "to the top level"
+    print(colors.success("✓ Moved task: ") + f"{task['task']} {where}")
+
+
+def print_invalid_index() -> None:
+    """Print the message for an out-of-range task number."""
+    print(colors.error("✗ Invalid task number."))
+
+
+def print_search_results(query: str, results: Iterable[Tuple[int, Dict]]) -> int:
+    """Print search matches with a summary header.
+
+    Args:
+        query: The search query
+        results: Matching (index, task) pairs
+
+    Returns:
+        Number of matches
+    """
+    matching_tasks = list(results)
+
+    if not matching_tasks:
+        print(colors.warning(f"No tasks found matching '{query}'."))
+        return 0
+
+    print(colors.info(f"Found {len(matching_tasks)} task(s) matching '{query}':\n"))
+    for i, task in matching_tasks:
+        status_icon = colors.color_status(task.get("status", "pending"))
+        task_text = task['task']
+        if task.get("status") == "completed":
+            task_text = colors.dim(task_text)
+        print(f"{i}. [{status_icon}] {task_text}")
+        print(f"   Priority: {colors.color_priority(task.get('priority', 'medium'))}\n")
+    return len(matching_tasks)
+
+
+def print_tag_suggestions(suggestions: Dict[str, List[str]]) -> None:
+    """Print "did you mean" hints for unknown tags.
+
+    Args:
+        suggestions: Unknown tag mapped to close existing tags
+    """
+    for tag, candidates in suggestions.items():
+        if candidates:
+            options = ", ".join(colors.colorize(f"#{c}", colors.Colors.CYAN) for c in candidates)
+            print(colors.info(f"No task is tagged #{tag}. Did you mean: ") + options + "?")
+        else:
+            print(colors.info(f"No task is tagged #{tag}."))
+
+
+def print_cleared(removed_count: int) -> None:
+    """Print the result of clearing completed tasks.
+
+    Args:
+        removed_count: Number of tasks removed
+    """
+    if removed_count == 0:
+        print(colors.info("No completed tasks to clear."))
+    else:
+        print(colors.success(f"✓ Cleared {removed_count} completed task(s)."))
+
+
+def print_tags(tag_counts: Dict[str, int]) -> None:
+    """Print all tags with task counts.
+
+    Args:
+        tag_counts: Dictionary mapping tag to number of tasks
+    """
+    if not tag_counts:
+        print(colors.info("No tags found."))
+        return
+
+    print(colors.info("Available tags:\n"))
+    for tag, count in sorted(tag_counts.items()):
+        tag_colored = colors.colorize(f"#{tag}", colors.Colors.CYAN, bold=True)
+        print(f"  {tag_colored} ({count} task{'s' if count != 1 else ''})")
+
+
+def print_statistics(stats: TaskStatistics) -> None:
+    """Print the statistics dashboard.
+
+    Args:
+        stats: Statistics to display
+    """
+    if stats.total == 0:
+        print(colors.info("No tasks found."))
+        return
+
+    print(colors.colorize("=" * 50, colors.Colors.BLUE))
+    print(colors.colorize("  Task Statistics", colors.Colors.BLUE, bold=True))
+    print(colors.colorize("=" * 50, colors.Colors.BLUE))
+    print()
+
+    print(f"  Total tasks: {colors.colorize(str(stats.total), colors.Colors.WHITE, bold=True)}")
+    print(f"  Completed:   {colors.colorize(str(stats.completed), colors.Colors.GREEN, bold=True)} ({stats.completion_pct:.1f}%)")
+    print(f"  Pending:     {colors.colorize(str(stats.pending), colors.Colors.YELLOW, bold=True)}")
+    print()
+
+    print("  Pending by priority:")
+    for priority in ("high", "medium", "low"):
+        print(f"    {colors.color_priority(priority)}: {stats.pending_by_priority[priority]}")
+    print()
+
+    # Tags statistics
+    if stats.tag_counts:
+        print(f"  Total tags: {len(stats.tag_counts)}")
+        print("  Top tags:")
+        for tag, count in stats.top_tags(5):
+            tag_colored = colors.colorize(f"#{tag}", colors.Colors.CYAN)
+            print(f"    {tag_colored}: {count}")
+    print()
+
+    print(colors.colorize("=" * 50, colors.Colors.BLUE))
+
+
+def print_exported(count: int, output_file: str) -> None:
+    """Print the result of an export.
+
+    Args:
+        count: Number of tasks exported
+        output_file: Path written to
+    """
+    if count == 0:
+        print(colors.warning("No tasks to export."))
+    else:
+        print(colors.success(f"✓ Exported {count} task(s) to {output_file}"))
+
+
+def print_step(revision: "Optional[Revision]", kind: str) -> None:
+    """Print the result of an undo or redo.
+
+    Args:
+        revision: Revision stepped over, or None if there was none
+        kind: "undo" or "redo"
+    """
+    if revision is None:
+        print(colors.info(f"Nothing to {kind}."))
+        return
+    verb = "Undid" if kind == "undo" else "Redid"
+    print(colors.success(f"✓ {verb} {revision.op}: {revision.summary}"))
+
+
+def print_history(revisions: "List[Revision]", limit: int = 10) -> None:
+    """Print recent revisions, newest first.
+
+    Args:
+        revisions: Revisions oldest first, as returned by TodoList.revisions
+        limit: Maximum number of revisions to show
+    """
+    if not revisions:
+        print(colors.info("No history yet."))
+        return
+    for revision in reversed(revisions[-limit:]):
+        when = revision.at[:19].replace("T", " ")
+        line = f"{revision.rev:>4}  {when}  {revision.op:<8}  {revision.summary}"
+        if revision.undone:
+            print(colors.dim(line + "  (undone)"))
+        else:
+            print(line)
+
+
+def print_recurring_added(template: Dict) -> None:
+    """Print confirmation for a new recurring task template.
+
+    Args:
+        template: The added template
+    """
+    msg = colors.success("✓ Added recurring task: ") + f"{template['task']} ({template['rule']}"
+    msg += f", from {template['start']})"
+    if template.get("tags"):
+        msg += f" {format_tags(template['tags'])}"
+    print(msg)
+
+
+def print_recurring(templates: List[Tuple[int, Dict]]) -> int:
+    """Print recurring task templates.
+
+    Args:
+        templates: (index, template) pairs
+
+    Returns:
+        Number of templates printed
+    """
+    if not templates:
+        print(colors.info("No recurring tasks."))
+        return 0
+    for index, template in templates:
+        line = f"R{index}. {template['task']} [{colors.color_priority(template.get('priority', 'medium'))}]"
+        if template.get("tags"):
+            line += f" {format_tags(template['tags'])}"
+        print(line)
+        print(colors.dim(f"   {template['rule']}, from {template['start']}"))
+    return len(templates)
+
+
+def print_agenda(items: "Iterable[AgendaItem]") -> int:
+    """Print an agenda grouped by day.
+
+    Occurrences of recurring tasks are numbered R1, R2, ... after their
+    template, so ``todo recur done N`` completes them.
+
+    Args:
+        items: Agenda items in date order
+
+    Returns:
+        Number of items printed
+    """
+    count = 0
+    current = None
+    for item in items:
+        if item.on != current:
+            if current is not None:
+                print()
+            current = item.on
+            print(colors.colorize(item.on.strftime("%a %Y-%m-%d"), colors.Colors.BLUE, bold=True))
+        task = item.task
+        status_icon = colors.color_status(task.get("status", "pending"))
+        task_text = task["task"]
+        if task.get("status") == "completed":
+            task_text = colors.dim(task_text)
+        number = f"R{item.index}" if item.recurring else str(item.index)
+        line = f"  {number}. [{status_icon}] {task_text} [{colors.color_priority(task.get('priority', 'medium'))}]"
+        if task.get("tags"):
+            line += f" {format_tags(task['tags'])}"
+        print(line)
+        count += 1
+    if count == 0:
+        print(colors.info("Nothing due in this period."))
+    return count
+
+
+def print_tree(rows: "List[TreeRow]") -> int:
+    """Print tasks with their subtasks and progress.
+
+    Args:
+        rows: Rows in display order, as returned by TodoList.tree
+
+    Returns:
+        Number of rows printed
+    """
+    if not rows:
+        print(colors.info("No subtasks yet. Add one with: todo add \"...\" --parent N"))
+        return 0
+    # A row is the last of its siblings if no later row at the same depth
+    # comes before one at a shallower depth; scan backwards to find out
+    last = [False] * len(rows)
+    seen = set()
+    for position in range(len(rows) - 1, -1, -1):
+        depth = rows[position].depth
+        last[position] = depth not in seen
+        seen = {d for d in seen if d < depth}
+        seen.add(depth)
+    guides: List[str] = []
+    for position, row in enumerate(rows):
+        del guides[max(row.depth - 1, 0):]
+        prefix = ""
+        if row.depth:
+            prefix = "".join(guides) + ("└── " if last[position] else "├── ")
+            guides.append("    " if last[position] else "│   ")
+        task = row.task
+        task_text = task["task"]
+        if task.get("status") == "completed":
+            task_text = colors.dim(task_text)
+        status_icon = colors.color_status(task.get("status", "pending"))
+        line = f"{prefix}{row.index}. [{status_icon}] {task_text} [{colors.color_priority(task.get('priority', 'medium'))}]"
+        if row.total:
+            line += colors.colorize(f" {row.done}/{row.total} ({row.completion_pct:.0f}%)", colors.Colors.CYAN)
+        print(line)
+    return len(rows)
+
+
+def print_sync(result: SyncResult, other: str, dry_run: bool = False) -> None:
+    """Print what a sync changed on each side.
+
+    Args:
+        result: Sync result
+        other: Path of the other task list
+        dry_run: Whether nothing was written
+    """
+    if result.in_sync:
+        print(colors.info(f"Already in sync with {other}."))
+        return
+    verb = "Would sync" if dry_run else "Synced"
+    print(colors.success(f"✓ {verb} with {other}"))
+    print(f"  Pulled: {result.pulled_added} added, {result.pulled_updated} updated, "
+          f"{result.pulled_removed} removed")
+    print(f"  Pushed: {result.pushed_added} added, {result.pushed_updated} updated, "
+          f"{result.pushed_removed} removed")
+
+
+def print_verify(report: VerifyReport, limit: int = 20) -> None:
+    """Print the result of verifying the tasks file.
+
+    Args:
+        report: Verification report
+        limit: Maximum number of damaged records to list
+    """
+    checked = {
+        "verified": "checksums verified",
+        "stale": "checksums out of date (file edited outside todo), records parsed",
+        "missing": "no checksums yet, records parsed",
+    }[report.checksums]
+    if report.ok:
+        print(colors.success(f"✓ {report.path}: {report.records} record(s) OK ({checked})"))
+        return
+    print(colors.error(f"✗ {report.path}: damage found ({report.records} record(s), {checked})"))
+    for error in report.errors:
+        print(f"   {error}")
+    for damage in report.damaged[:limit]:
+        print(f"   record {damage.index} (line {damage.line}): {damage.reason}")
+    if len(report.damaged) > limit:
+        print(colors.dim(f"   ... and {len(report.damaged) - limit} more damaged record(s)"))
+    if report.backup:
+        print(colors.info("The last good copy is in the backup and will be loaded automatically."))
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Format a lead time compactly.
+
+    Args:
+        seconds: Duration in seconds, or None
+
+    Returns:
+        String such as "45s", "12m", "3.5h" or "4.2d" ("-" for None)
+    """
+    if seconds is None:
+        return "-"
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
+
+
+def _print_periods(periods: "List[PeriodStats]") -> None:
+    print(f"  {'Period':<12} {'Created':>8} {'Done':>6} {'Net':>6} {'Done/day':>9} {'Lead p50':>9} {'Lead p90':>9}")
+    for p in periods:
+        net = p.created - p.completed
+        print(
+            f"  {p.period:<12} {p.created:>8} {p.completed:>6} {net:>+6} {p.throughput:>9.2f}"
+            f" {format_duration(p.lead_p50):>9} {format_duration(p.lead_p90):>9}"
+        )
+
+
+def print_report(report: "Report") -> None:
+    """Print created/completed activity per period, overall and per tag.
+
+    Args:
+        report: Report to display
+    """
+    if not report.periods:
+        print(colors.info("No activity to report."))
+        return
+
+    print(colors.colorize("=" * 70, colors.Colors.BLUE))
+    print(colors.colorize(f"  Activity by {report.by}", colors.Colors.BLUE, bold=True))
+    print(colors.colorize("=" * 70, colors.Colors.BLUE))
+    print()
+    _print_periods(report.periods)
+
+    for tag, periods in report.tags.items():
+        if not periods:
+            continue
+        print()
+        print("  " + colors.colorize(f"#{tag}", colors.Colors.CYAN, bold=True))
+        _print_periods(periods)
+    print()
+    print(colors.colorize("=" * 70, colors.Colors.BLUE))
@@ -0,0 +1,356 @@
+"""Typo-tolerant matching with BK-trees over tags and description terms.
+
+A BK-tree stores words so that every child edge is labelled with its edit
+distance to the parent. By the triangle inequality, a search for words
+within distance k of a query only needs to follow edges labelled within k
+of the query's distance to the current node. That prunes most of the tree,
+so lookups stay fast with tens of thousands of words.
+
+The trees are kept in a ``<tasks_file>.terms`` sidecar. A tree only has to
+contain every word currently in use, so words are added as they appear and
+words that disappear are left in place. Matches are always checked against
+the current tasks. The trees are rebuilt once stale words outnumber live ones.
+"""
+
+import json
+import re
+from typing import Any, Container, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .locking import write_atomic
+
+VERSION = 1
+
+# Stale words tolerated before a tree is rebuilt from the live vocabulary
+REBUILD_MIN = 1000
+
+_WORD = re.compile(r"\w+")
+
+
+def terms(text: str) -> List[str]:
+    """Split text into lowercase search terms.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Words in order of appearance
+    """
+    return _WORD.findall(text.lower())
+
+
+def default_max_distance(term: str) -> int:
+    """Return how many typos to tolerate in a term of this length.
+
+    Args:
+        term: Query term
+
+    Returns:
+        0 for up to 2 characters, 1 for up to 5, otherwise 2
+    """
+    if len(term) <= 2:
+        return 0
+    return 1 if len(term) <= 5 else 2
+
+
+def _pattern(word: str) -> Dict[str, int]:
+    """Return the character bitmasks of a word for _distance."""
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def _distance(masks: Dict[str, int], length: int, text: str, limit: Optional[int] = None) -> int:
+    """Edit distance between a pattern and text, computed bit-parallel.
+
+    Myers' algorithm keeps a whole column of the dynamic-programming
+    matrix as vertical +1/-1 delta bit vectors in two integers, so each
+    text character costs a handful of integer operations instead of a
+    loop over the pattern.
+    """
+    if limit is not None and abs(length - len(text)) > limit:
+        return limit + 1
+    if length == 0:
+        return len(text)
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    pv, mv, score = full, 0, length
+    remaining = len(text)
+    for char in text:
+        eq = masks.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        remaining -= 1
+        if limit is not None and score - remaining > limit:
+            return limit + 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score if limit is None or score <= limit else limit + 1
+
+
+def levenshtein(a: str, b: str, limit: Optional[int] = None) -> int:
+    """Compute the edit distance between two strings.
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Stop early once the distance is known to exceed this
+
+    Returns:
+        Number of insertions, deletions and substitutions, or limit + 1
+        if that is exceeded
+    """
+    return _distance(_pattern(a), len(a), b, limit)
+
+
+class BKTree:
+    """Burkhard-Keller tree over words under edit distance.
+
+    Nodes are stored in flat lists: ``words[i]`` is the word of node i and
+    ``children[i]`` maps an edit distance to the child node index.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        """Build a tree.
+
+        Args:
+            words: Initial words
+        """
+        self.words: List[str] = []
+        self.children: List[Dict[int, int]] = []
+        self._known: Set[str] = set()
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._known
+
+    def add(self, word: str) -> bool:
+        """Insert a word.
+
+        Args:
+            word: Word to insert
+
+        Returns:
+            True if the word was new
+        """
+        if word in self._known:
+            return False
+        self._known.add(word)
+        self.words.append(word)
+        self.children.append({})
+        node = len(self.words) - 1
+        if node == 0:
+            return True
+        masks = _pattern(word)
+        current = 0
+        while True:
+            distance = _distance(masks, len(word), self.words[current])
+            child = self.children[current].get(distance)
+            if child is None:
+                self.children[current][distance] = node
+                return True
+            current = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """Find words within an edit distance.
+
+        Args:
+            word: Query word
+            max_distance: Largest distance to accept
+
+        Returns:
+            (distance, word) pairs, closest first
+        """
+        if not self.words:
+            return []
+        masks = _pattern(word)
+        results = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            kids = self.children[node]
+            # Past this distance neither the node nor any child can match
+            cap = max(kids, default=0) + max_distance
+            distance = _distance(masks, len(word), self.words[node], cap)
+            if distance <= max_distance:
+                results.append((distance, self.words[node]))
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for d, child in kids.items() if low <= d <= high)
+        results.sort()
+        return results
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the tree as JSON-serializable data."""
+        return {"words": self.words, "children": [[[d, c] for d, c in kids.items()] for kids in self.children]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BKTree":
+        """Rebuild a tree saved with to_dict.
+
+        Args:
+            data: Saved tree
+
+        Returns:
+            The tree
+        """
+        tree = cls()
+        tree.words = list(data["words"])
+        tree.children = [{d: c for d, c in kids} for kids in data["children"]]
+        tree._known = set(tree.words)
+        return tree
+
+
+def vocabulary(tasks: Sequence[Dict]) -> Tuple[Dict[str, Set[int]], Dict[str, Set[int]]]:
+    """Index the tags and description terms of a task list.
+
+    Args:
+        tasks: Tasks in file order
+
+    Returns:
+        (tag postings, term postings) mapping each tag, or each lowercase
+        term of a description or tag, to the 0-based positions of the tasks
+        using it
+    """
+    tags: Dict[str, Set[int]] = {}
+    words: Dict[str, Set[int]] = {}
+    for position, task in enumerate(tasks):
+        for tag in task.get("tags") or []:
+            tags.setdefault(tag, set()).add(position)
+            for term in terms(tag):
+                words.setdefault(term, set()).add(position)
+        for term in terms(task.get("task", "")):
+            words.setdefault(term, set()).add(position)
+    return tags, words
+
+
+def suggest(tree: BKTree, word: str, known: Container[str], limit: int = 3) -> List[str]:
+    """Suggest close alternatives for an unknown word.
+
+    Args:
+        tree: BK-tree to search
+        word: Word that matched nothing
+        known: Words currently in use (the tree may hold stale ones)
+        limit: Maximum number of suggestions
+
+    Returns:
+        Up to limit words, closest first
+    """
+    max_distance = max(1, default_max_distance(word))
+    return [w for _, w in tree.search(word, max_distance) if w in known and w != word][:limit]
+
+
+def rank(
+    query: str,
+    tree: BKTree,
+    postings: Dict[str, Set[int]],
+    max_distance: Optional[int] = None
+) -> List[Tuple[int, float]]:
+    """Rank tasks by how well their words match a query.
+
+    Each query term contributes 1 for an exact match and less for each
+    typo, taking the best match among the task's words. Tasks matching
+    more query terms rank first, then by total score.
+
+    Args:
+        query: Search text
+        tree: BK-tree containing every word in postings
+        postings: Word to task positions
+        max_distance: Typos tolerated per term (defaults by term length)
+
+    Returns:
+        (position, score) pairs, best first; score is between 0 and 1
+    """
+    query_terms = terms(query)
+    if not query_terms:
+        return []
+    best: Dict[int, Dict[str, float]] = {}
+    for term in query_terms:
+        limit = default_max_distance(term) if max_distance is None else max_distance
+        for distance, word in tree.search(term, limit):
+            weight = 1 - distance / (len(term) + 1)
+            for position in postings.get(word, ()):
+                scores = best.setdefault(position, {})
+                if weight > scores.get(term, 0):
+                    scores[term] = weight
+    ranked = [
+        (position, len(scores), sum(scores.values()) / len(query_terms))
+        for position, scores in best.items()
+    ]
+    ranked.sort(key=lambda item: (-item[1], -item[2], item[0]))
+    return [(position, round(score, 3)) for position, _, score in ranked]
+
+
+class TermIndex:
+    """BK-trees over tags and description terms, persisted in a sidecar.
+
+    Attributes:
+        path: Path to the index file
+        tags: Tree over tags
+        terms: Tree over description terms
+    """
+
+    def __init__(self, path: str):
+        """Initialize an empty index.
+
+        Args:
+            path: Path to the index file
+        """
+        self.path = path
+        self.tags = BKTree()
+        self.terms = BKTree()
+
+    def load(self) -> bool:
+        """Read the stored trees.
+
+        Returns:
+            True if the file existed and was readable
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get("version") != VERSION:
+                return False
+            self.tags = BKTree.from_dict(data["tags"])
+            self.terms = BKTree.from_dict(data["terms"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return False
+        return True
+
+    def save(self) -> None:
+        """Write the trees."""
+        data = {"version": VERSION, "tags": self.tags.to_dict(), "terms": self.terms.to_dict()}
+        write_atomic(self.path, json.dumps(data, separators=(",", ":")))
+
+    def sync(self, tags: Iterable[str], words: Iterable[str]) -> bool:
+        """Make sure the trees contain the current vocabulary.
+
+        Args:
+            tags: Tags in use
+            words: Description terms in use
+
+        Returns:
+            True if a tree changed and should be saved
+        """
+        changed = False
+        for attr, vocab in (("tags", set(tags)), ("terms", set(words))):
+            tree = getattr(self, attr)
+            stale = len(tree) - len(vocab & tree._known)
+            if stale > REBUILD_MIN and stale > len(vocab):
+                setattr(self, attr, BKTree(sorted(vocab)))
+                changed = True
+                continue
+            for word in vocab:
+                changed = tree.add(word) or changed
+        return changed
@@ -0,0 +1,361 @@
+"""Parent/child task hierarchy with rolled-up progress.
+
+A task becomes a subtask by storing its parent's stable ``id`` in a
+``parent`` field, so the link survives reordering, removals, undo and sync.
+A reference to a task that is no longer in the list is ignored (the task
+shows as a top-level one again), and so is any link that would close a
+cycle, which a merge of two edited copies could otherwise produce.
+
+The ``<tasks_file>.tree`` sidecar indexes only the tasks that take part in
+a hierarchy. Each node keeps its position, its children in list order and
+how many of its descendants exist and are completed. Adding, completing,
+removing or moving a task updates those counts along the path to the root,
+so showing a project and its progress costs the size of that subtree, not
+the length of the list. Like the rollups, the sidecar records the tasks
+file signature it matches and is rebuilt when the file changed behind its
+back.
+"""
+
+import bisect
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .locking import write_atomic
+from .sync import task_id
+
+VERSION = 1
+
+Node = Dict[str, Any]
+Tree = Dict[str, Any]
+
+
+@dataclass
+class TreeRow:
+    """One task shown by ``todo tree``.
+
+    Attributes:
+        depth: Nesting level (0 for the task the view starts from)
+        index: 1-based task index
+        task: Task summary (id, task, status, priority)
+        total: Number of descendants
+        done: Number of completed descendants
+    """
+    depth: int
+    index: int
+    task: Dict
+    total: int = 0
+    done: int = 0
+
+    @property
+    def completion_pct(self) -> float:
+        """Percentage of descendants completed (0 without descendants)."""
+        return self.done / self.total * 100 if self.total else 0.0
+
+
+def _node(index: int, task: Dict) -> Node:
+    """Build a tree node for a task without links."""
+    return {
+        "index": index,
+        "parent": None,
+        "children": [],
+        "task": task.get("task", ""),
+        "status": task.get("status", "pending"),
+        "priority": task.get("priority", "medium"),
+        "total": 0,
+        "done": 0,
+    }
+
+
+def _completed(node: Node) -> int:
+    return 1 if node["status"] == "completed" else 0
+
+
+def _propagate(nodes: Dict[str, Node], start: Optional[str], total: int, done: int) -> None:
+    """Add to the descendant counts of a node and all of its ancestors."""
+    while start is not None:
+        node = nodes[start]
+        node["total"] += total
+        node["done"] += done
+        start = node["parent"]
+
+
+def _prune(nodes: Dict[str, Node], tid: Optional[str]) -> None:
+    """Drop a node that no longer has a parent or children."""
+    if tid is not None and tid in nodes and nodes[tid]["parent"] is None and not nodes[tid]["children"]:
+        del nodes[tid]
+
+
+def _attach(nodes: Dict[str, Node], tid: str, parent: str) -> None:
+    """Link an unlinked node under a parent, keeping children in list order."""
+    node = nodes[tid]
+    children = nodes[parent]["children"]
+    position = bisect.bisect([nodes[c]["index"] for c in children], node["index"])
+    children.insert(position, tid)
+    node["parent"] = parent
+    _propagate(nodes, parent, 1 + node["total"], _completed(node) + node["done"])
+
+
+def _detach(nodes: Dict[str, Node], tid: str) -> None:
+    """Unlink a node (and its subtree) from its parent."""
+    node = nodes[tid]
+    parent = node["parent"]
+    if parent is None:
+        return
+    _propagate(nodes, parent, -(1 + node["total"]), -(_completed(node) + node["done"]))
+    nodes[parent]["children"].remove(tid)
+    node["parent"] = None
+    _prune(nodes, parent)
+
+
+def build_tree(tasks: Sequence[Dict]) -> Tree:
+    """Index the hierarchy of a task list.
+
+    Args:
+        tasks: Task dictionaries in file order
+
+    Returns:
+        Tree with a node for every task that has a parent or children
+    """
+    positions = {task_id(task): index for index, task in enumerate(tasks, 1)}
+    nodes: Dict[str, Node] = {}
+    for index, task in enumerate(tasks, 1):
+        parent = task.get("parent")
+        tid = task_id(task)
+        if not parent or parent == tid or parent not in positions:
+            continue
+        if tid not in nodes:
+            nodes[tid] = _node(index, task)
+        if parent not in nodes:
+            nodes[parent] = _node(positions[parent], tasks[positions[parent] - 1])
+        nodes[tid]["parent"] = parent
+        nodes[parent]["children"].append(tid)
+    for node in nodes.values():
+        node["children"].sort(key=lambda c: nodes[c]["index"])
+
+    # Count descendants bottom-up from each root; nodes left unvisited sit on
+    # or below a cycle, which is broken above its earliest task
+    visited = set()
+    pending = [tid for tid, node in nodes.items() if node["parent"] is None]
+    remaining = iter(sorted(nodes, key=lambda t: nodes[t]["index"]))
+    while True:
+        if not pending:
+            start = next((t for t in remaining if t not in visited), None)
+            if start is None:
+                break
+            path, seen = [], set()
+            while start not in seen:
+                path.append(start)
+                seen.add(start)
+                start = nodes[start]["parent"]
+            cycle = path[path.index(start):]
+            root = min(cycle, key=lambda t: nodes[t]["index"])
+            nodes[nodes[root]["parent"]]["children"].remove(root)
+            nodes[root]["parent"] = None
+            pending.append(root)
+        order = []
+        stack = [pending.pop()]
+        while stack:
+            tid = stack.pop()
+            visited.add(tid)
+            order.append(tid)
+            stack.extend(nodes[tid]["children"])
+        for tid in reversed(order):
+            node = nodes[tid]
+            for child in node["children"]:
+                node["total"] += 1 + nodes[child]["total"]
+                node["done"] += _completed(nodes[child]) + nodes[child]["done"]
+    for tid in [t for t, node in nodes.items() if node["parent"] is None and not node["children"]]:
+        del nodes[tid]
+    return {"version": VERSION, "nodes": nodes}
+
+
+def add_task(tree: Tree, index: int, task: Dict, parent: Optional[Tuple[int, Dict]] = None) -> None:
+    """Apply an appended task to a tree.
+
+    Args:
+        tree: Tree to update in place
+        index: 1-based index of the new task
+        task: New task
+        parent: (index, task) of its parent, if it has one
+    """
+    if parent is None:
+        return
+    nodes = tree["nodes"]
+    parent_id = task_id(parent[1])
+    if parent_id not in nodes:
+        nodes[parent_id] = _node(parent[0], parent[1])
+    tid = task_id(task)
+    nodes[tid] = _node(index, task)
+    _attach(nodes, tid, parent_id)
+
+
+def update_task(tree: Tree, task: Dict) -> None:
+    """Apply an in-place change of a task (e.g. completion) to a tree.
+
+    Args:
+        tree: Tree to update in place
+        task: Task as saved
+    """
+    nodes = tree["nodes"]
+    node = nodes.get(task_id(task))
+    if node is None:
+        return
+    before = _completed(node)
+    node.update(task=task.get("task", ""), status=task.get("status", "pending"), priority=task.get("priority", "medium"))
+    _propagate(nodes, node["parent"], 0, _completed(node) - before)
+
+
+def remove_tasks(tree: Tree, removed: Iterable[Tuple[int, Dict]]) -> None:
+    """Apply removed tasks to a tree; their subtasks become top-level.
+
+    Args:
+        tree: Tree to update in place
+        removed: (1-based index before removal, task) pairs
+    """
+    nodes = tree["nodes"]
+    positions = []
+    for index, task in removed:
+        positions.append(index)
+        tid = task_id(task)
+        if tid not in nodes:
+            continue
+        _detach(nodes, tid)
+        for child in nodes[tid]["children"]:
+            nodes[child]["parent"] = None
+        children = nodes.pop(tid)["children"]
+        for child in children:
+            _prune(nodes, child)
+    positions.sort()
+    for node in nodes.values():
+        node["index"] -= bisect.bisect_left(positions, node["index"])
+
+
+def move_task(tree: Tree, index: int, task: Dict, parent: Optional[Tuple[int, Dict]]) -> None:
+    """Apply a change of parent to a tree.
+
+    Args:
+        tree: Tree to update in place
+        index: 1-based index of the moved task
+        task: Moved task
+        parent: (index, task) of the new parent, or None for top level
+    """
+    nodes = tree["nodes"]
+    tid = task_id(task)
+    if tid in nodes:
+        _detach(nodes, tid)
+    if parent is None:
+        _prune(nodes, tid)
+        return
+    parent_id = task_id(parent[1])
+    if parent_id not in nodes:
+        nodes[parent_id] = _node(parent[0], parent[1])
+    if tid not in nodes:
+        nodes[tid] = _node(index, task)
+    _attach(nodes, tid, parent_id)
+
+
+def roots(tree: Tree) -> List[str]:
+    """Return the ids of top-level tasks that have subtasks, in list order."""
+    nodes = tree["nodes"]
+    return sorted((tid for tid, node in nodes.items() if node["parent"] is None), key=lambda t: nodes[t]["index"])
+
+
+def find(tree: Tree, index: int) -> Optional[str]:
+    """Return the id of the node at a task index, if it is in the hierarchy."""
+    for tid, node in tree["nodes"].items():
+        if node["index"] == index:
+            return tid
+    return None
+
+
+def walk(tree: Tree, start: Iterable[str], depth: Optional[int] = None) -> Iterator[TreeRow]:
+    """Yield the subtrees under some nodes, depth first in list order.
+
+    Args:
+        tree: Tree to read
+        start: Ids of the nodes to start from (shown at depth 0)
+        depth: Deepest level to show (None for all)
+
+    Yields:
+        Rows in display order
+    """
+    nodes = tree["nodes"]
+    stack = [(tid, 0) for tid in reversed(list(start))]
+    while stack:
+        tid, level = stack.pop()
+        node = nodes[tid]
+        summary = {"id": tid, "task": node["task"], "status": node["status"], "priority": node["priority"]}
+        yield TreeRow(level, node["index"], summary, node["total"], node["done"])
+        if depth is None or level < depth:
+            stack.extend((child, level + 1) for child in reversed(node["children"]))
+
+
+class TreeStore:
+    """Hierarchy index persisted in a sidecar JSON file.
+
+    Attributes:
+        path: Path to the tree file
+    """
+
+    def __init__(self, path: str):
+        """Initialize the store.
+
+        Args:
+            path: Path to the tree file
+        """
+        self.path = path
+
+    def load(self, signature: Optional[Tuple[int, ...]]) -> Optional[Tree]:
+        """Read the tree if it matches a tasks file version.
+
+        Args:
+            signature: Current file_signature of the tasks file
+
+        Returns:
+            The tree, or None if missing, unreadable or outdated
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != VERSION:
+            return None
+        if signature is None or data.get("signature") != list(signature):
+            return None
+        return data
+
+    def save(self, tree: Tree, signature: Optional[Tuple[int, ...]]) -> None:
+        """Write the tree along with the tasks file signature it matches.
+
+        Args:
+            tree: Tree to store
+            signature: file_signature of the tasks file it was computed from
+        """
+        tree["signature"] = list(signature) if signature else None
+        write_atomic(self.path, json.dumps(tree, separators=(",", ":")))
+
+    def apply(self, before: Optional[Tuple[int, ...]], after: Optional[Tuple[int, ...]], ops: List[Tuple]) -> None:
+        """Apply a saved mutation to the stored tree, if it was current.
+
+        Args:
+            before: Tasks file signature before the mutation
+            after: Tasks file signature after the mutation was saved
+            ops: ("add", index, task, parent), ("update", task),
+                ("remove", pairs) or ("move", index, task, parent) tuples,
+                applied with the functions of the same name
+        """
+        tree = self.load(before)
+        if tree is None:
+            return
+        for op in ops:
+            if op[0] == "add":
+                add_task(tree, *op[1:])
+            elif op[0] == "update":
+                update_task(tree, *op[1:])
+            elif op[0] == "remove":
+                remove_tasks(tree, *op[1:])
+            elif op[0] == "move":
+                move_task(tree, *op[1:])
+        self.save(tree, after)
@@ -0,0 +1,350 @@
+"""Revision log behind undo and redo.
+
+Each mutation is recorded as a delta: the list of primitive changes it made
+to the task list, with enough data to reverse them.
+
+- ``["insert", position, task]`` inserts a task at a 0-based position.
+- ``["delete", position, task]`` deletes it again, keeping the removed task.
+- ``["replace", position, old, new]`` swaps one version of a task for another.
+
+Undoing a revision applies its inverse and redoing it re-applies the
+changes, so both cost time proportional to the delta rather than the list.
+
+The log lives in ``<tasks_file>.history`` as one JSON record per line, so
+recording a revision appends to the file rather than rewriting it. Undo
+and redo append marker lines. Each write ends with a short trailer line
+holding the tasks file signature the log leads up to, which detects
+changes made behind its back. Once the file holds more than three times
+MAX_REVISIONS lines it is rewritten as a checkpoint: one line holding the
+replayed state of the log, keeping only the newest MAX_REVISIONS
+revisions that can still be undone.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .locking import write_atomic
+from .sync import task_id, touch
+
+# Revisions that can be undone; older ones are dropped at the next checkpoint
+MAX_REVISIONS = 50
+
+VERSION = 1
+
+Change = List[Any]
+
+_TAIL_BLOCK = 4096
+
+
+@dataclass
+class Revision:
+    """One recorded mutation.
+
+    Attributes:
+        rev: Revision number, increasing over the life of the log
+        op: Command that made the change (add, remove, complete, clear, sync)
+        summary: Short human-readable description
+        at: ISO timestamp of the change
+        undone: Whether the revision has been undone and can be redone
+    """
+    rev: int
+    op: str
+    summary: str
+    at: str
+    undone: bool = False
+
+
+def invert(changes: Sequence[Change]) -> List[Change]:
+    """Return the changes that reverse a delta.
+
+    Args:
+        changes: Changes in the order they were applied
+
+    Returns:
+        Reversing changes, in the order to apply them
+    """
+    inverse: List[Change] = []
+    for change in reversed(changes):
+        kind = change[0]
+        if kind == "insert":
+            inverse.append(["delete", change[1], change[2]])
+        elif kind == "delete":
+            inverse.append(["insert", change[1], change[2]])
+        else:
+            inverse.append(["replace", change[1], change[3], change[2]])
+    return inverse
+
+
+def apply_changes(tasks: List[Dict], changes: Sequence[Change], when: Optional[str] = None) -> None:
+    """Apply a delta to a task list in place.
+
+    Args:
+        tasks: Task list to update
+        changes: Changes to apply in order
+        when: If given, inserted and replaced tasks are stamped as changed
+            at this time, so sync treats an undo or redo as a new edit
+
+    Raises:
+        ValueError: If a change does not fit the list, i.e. the list is not
+            the one the delta was recorded against
+    """
+    for change in changes:
+        kind, position = change[0], change[1]
+        if kind == "insert":
+            if not 0 <= position <= len(tasks):
+                raise ValueError("Task list does not match the revision history")
+            task = dict(change[2])
+            if when:
+                touch(task, ["status"], when)
+            tasks.insert(position, task)
+            continue
+        current = tasks[position] if 0 <= position < len(tasks) else None
+        if current is None or task_id(current) != task_id(change[2]):
+            raise ValueError("Task list does not match the revision history")
+        if kind == "delete":
+            del tasks[position]
+            continue
+        task = dict(change[3])
+        if when:
+            touch(task, [k for k in task if k != "modified" and task[k] != current.get(k)], when)
+        tasks[position] = task
+
+
+def rebase(tasks: List[Dict], changes: Sequence[Change]) -> List[Change]:
+    """Re-apply a delta to a task list that has been changed since.
+
+    Tasks are matched by id rather than position, and a replaced task only
+    takes the fields the delta changed, so edits made to its other fields
+    in the meantime are kept. Inserted tasks go back at their position, or
+    at the end if the list has become shorter. Changes to tasks that have
+    since been removed are dropped, as removals win in sync.
+
+    Args:
+        tasks: Task list to update in place
+        changes: Changes recorded against an older version of the list
+
+    Returns:
+        The changes actually applied, with positions in the updated list
+    """
+    applied: List[Change] = []
+    for change in changes:
+        kind = change[0]
+        if kind == "insert":
+            position = min(change[1], len(tasks))
+            tasks.insert(position, dict(change[2]))
+            applied.append(["insert", position, dict(change[2])])
+            continue
+        tid = task_id(change[2])
+        position = next((i for i, task in enumerate(tasks) if task_id(task) == tid), None)
+        if position is None:
+            continue
+        current = tasks[position]
+        if kind == "delete":
+            del tasks[position]
+            applied.append(["delete", position, current])
+            continue
+        old, new = change[2], change[3]
+        task = dict(current)
+        for key in set(old) | set(new):
+            if key not in new:
+                task.pop(key, None)
+            elif key == "modified":
+                stamps = dict(current.get("modified") or {})
+                stamps.update(
+                    (name, when) for name, when in (new["modified"] or {}).items()
+                    if (old.get("modified") or {}).get(name) != when
+                )
+                task["modified"] = stamps
+            elif key not in old or old[key] != new[key]:
+                task[key] = new[key]
+        tasks[position] = task
+        applied.append(["replace", position, current, dict(task)])
+    return applied
+
+
+def diff(old: Sequence[Dict], new: Sequence[Dict]) -> List[Change]:
+    """Compute the delta between two versions of a task list.
+
+    Handles the changes sync makes: tasks deleted anywhere, tasks replaced
+    in place and tasks appended at the end, matched by id.
+
+    Args:
+        old: Previous list
+        new: Current list
+
+    Returns:
+        Changes turning old into new
+    """
+    new_ids = {task_id(t) for t in new}
+    changes: List[Change] = []
+    survivors = []
+    for position in range(len(old) - 1, -1, -1):
+        if task_id(old[position]) not in new_ids:
+            changes.append(["delete", position, old[position]])
+        else:
+            survivors.append(old[position])
+    survivors.reverse()
+    for position, (before, after) in enumerate(zip(survivors, new)):
+        if before != after:
+            changes.append(["replace", position, before, after])
+    for position in range(len(survivors), len(new)):
+        changes.append(["insert", position, new[position]])
+    return changes
+
+
+def _read_tail(path: str) -> Optional[Dict]:
+    """Parse the last line of a file without reading the lines before it."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            data = b""
+            position = end
+            while position > 0:
+                step = min(_TAIL_BLOCK, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+                if data.rstrip(b"\n").rfind(b"\n") != -1:
+                    break
+        return json.loads(data.rstrip(b"\n").rsplit(b"\n", 1)[-1])
+    except (OSError, ValueError):
+        return None
+
+
+class RevisionLog:
+    """Undo/redo history persisted as an append-only sidecar file.
+
+    Attributes:
+        path: Path to the log file
+    """
+
+    def __init__(self, path: str):
+        """Initialize the log.
+
+        Args:
+            path: Path to the log file
+        """
+        self.path = path
+
+    def load(self) -> Tuple[List[Dict], List[Dict], Optional[List[int]]]:
+        """Replay the log.
+
+        Returns:
+            (applied revisions, oldest first; undone revisions, next redo
+            last; tasks file signature the log leads up to)
+        """
+        applied: List[Dict] = []
+        undone: List[Dict] = []
+        record: Dict = {}
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    record = json.loads(line)
+                    if "checkpoint" in record:
+                        applied, undone = record["applied"], record["undone"]
+                    elif "undo" in record:
+                        undone.append(applied.pop())
+                    elif "redo" in record:
+                        applied.append(undone.pop())
+                    elif "op" in record:
+                        applied.append(record)
+                        undone = []
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            return [], [], None
+        return applied, undone, record.get("after")
+
+    def current(self, signature: Optional[Tuple[int, ...]]) -> bool:
+        """Return whether the log leads up to a given tasks file version.
+
+        Args:
+            signature: Current file_signature of the tasks file
+
+        Returns:
+            True if undo/redo may be applied to that version
+        """
+        tail = _read_tail(self.path)
+        return tail is not None and signature is not None and tail.get("after") == list(signature)
+
+    def _append(self, records: List[Dict]) -> None:
+        with open(self.path, "a") as f:
+            f.write("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records))
+
+    def _checkpoint(self, trailer: Dict) -> None:
+        """Rewrite the log as one line holding its replayed state."""
+        applied, undone, _ = self.load()
+        record = {"checkpoint": VERSION, "seq": 0, "applied": applied[-MAX_REVISIONS:], "undone": undone}
+        trailer = dict(trailer, seq=1)
+        write_atomic(self.path, "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in (record, trailer)))
+
+    def _write(self, records: List[Dict], after: Optional[Tuple[int, ...]]) -> None:
+        """Number and append records, then checkpoint if the log has grown.
+
+        Every write ends with a small trailer line carrying the counters and
+        the tasks file signature, so reading the tail never has to parse a
+        large delta.
+        """
+        tail = _read_tail(self.path) or {}
+        seq, last = tail.get("seq", 0), tail.get("last", 0)
+        for record in records:
+            if "op" in record:
+                last += 1
+                record["rev"] = last
+        seq += len(records) + 1
+        trailer = {"seq": seq, "last": last, "after": list(after) if after else None}
+        self._append(records + [trailer])
+        if seq > 3 * MAX_REVISIONS:
+            self._checkpoint(trailer)
+
+    def record(
+        self,
+        before: Optional[Tuple[int, ...]],
+        after: Optional[Tuple[int, ...]],
+        entries: Sequence[Tuple[str, str, List[Change]]]
+    ) -> None:
+        """Append revisions for a saved mutation.
+
+        If the log does not lead up to the version the mutation started
+        from, the older history no longer applies and is discarded.
+
+        Args:
+            before: Tasks file signature before the mutation
+            after: Tasks file signature after the mutation was saved
+            entries: (op, summary, changes) per revision, oldest first
+        """
+        if not entries or before == after:
+            return
+        if not self.current(before):
+            # Keep numbering revisions where the discarded history left off
+            tail = _read_tail(self.path) or {}
+            write_atomic(self.path, json.dumps({"seq": 0, "last": tail.get("last", 0)}) + "\n")
+        at = datetime.now().isoformat()
+        records = [
+            {"op": op, "summary": summary, "at": at, "changes": changes}
+            for op, summary, changes in entries
+        ]
+        self._write(records, after)
+
+    def mark(self, kind: str, rev: int, after: Optional[Tuple[int, ...]]) -> None:
+        """Append an undo or redo marker.
+
+        Args:
+            kind: "undo" or "redo"
+            rev: Revision undone or redone
+            after: Tasks file signature after the change was saved
+        """
+        self._write([{kind: rev}], after)
+
+    def revisions(self) -> List[Revision]:
+        """Return the recorded revisions.
+
+        Returns:
+            Revisions oldest first; undone ones (redo candidates) come last
+        """
+        applied, undone, _ = self.load()
+        result = [Revision(r["rev"], r["op"], r["summary"], r["at"]) for r in applied]
+        result += [Revision(r["rev"], r["op"], r["summary"], r["at"], True) for r in reversed(undone)]
+        return result
@@ -0,0 +1,87 @@
+"""Advisory inter-process file locking and helper-file utilities."""
+
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple, Union
+
+from .profiling import span
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+def sidecar_path(tasks_file: str, suffix: str) -> str:
+    """Return the path of a helper file stored next to a tasks file.
+
+    Args:
+        tasks_file: Path to the tasks file
+        suffix: Helper file suffix (e.g. "lock")
+
+    Returns:
+        Path such as ``tasks.json.lock``
+    """
+    return f"{tasks_file}.{suffix}"
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """Return a cheap fingerprint of a file's current version.
+
+    Used to tell whether in-memory state derived from a file is still
+    current without re-reading the file.
+
+    Args:
+        path: File to fingerprint
+
+    Returns:
+        (mtime_ns, size, inode), or None if the file does not exist
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+@contextmanager
+def file_lock(lock_file: str) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a lock file.
+
+    Time spent waiting for the lock is recorded as the ``lock-wait`` phase.
+    On platforms without ``fcntl`` this is a no-op.
+
+    Args:
+        lock_file: Path of the lock file (created if missing)
+
+    Yields:
+        None while the lock is held
+    """
+    if fcntl is None:
+        yield
+        return
+    with span("lock-wait"):
+        fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(fd)
+            raise
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def write_atomic(path: str, text: Union[str, bytes]) -> None:
+    """Write text to a file via rename so readers never see partial output.
+
+    Args:
+        path: Destination path
+        text: Content to write (bytes are written as-is)
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb" if isinstance(text, bytes) else "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
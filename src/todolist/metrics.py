@@ -0,0 +1,232 @@
+"""Persistent operational metrics with OpenMetrics/Prometheus exposition.
+
+When ``TODO_METRICS_FILE`` names a file, every CLI run adds its command,
+outcome and latency to that file. Lock-wait and save durations go in as
+histogram observations. A run only reads and rewrites one small JSON
+document. Task counts by status and priority are computed when the
+metrics are exposed (``todo metrics``), so ordinary runs never pay for them.
+"""
+
+import json
+import os
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .locking import file_lock, sidecar_path, write_atomic
+
+# Upper bounds (seconds) shared by all latency histograms
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+FORMATS = ["prometheus", "openmetrics"]
+
+
+def metrics_path_from_env() -> Optional[str]:
+    """Read the TODO_METRICS_FILE environment variable.
+
+    Returns:
+        Path of the metrics file, or None when metrics are disabled
+    """
+    return os.environ.get("TODO_METRICS_FILE") or None
+
+
+def new_histogram() -> Dict[str, Any]:
+    """Return an empty histogram record.
+
+    Returns:
+        Dictionary with per-bucket counts (last bucket is +Inf), sum and count
+    """
+    return {"buckets": [0] * (len(BUCKETS) + 1), "sum": 0.0, "count": 0}
+
+
+def observe(histogram: Dict[str, Any], value: float) -> None:
+    """Add an observation to a histogram record.
+
+    Args:
+        histogram: Histogram created by new_histogram
+        value: Observed value in seconds
+    """
+    histogram["buckets"][bisect_left(BUCKETS, value)] += 1
+    histogram["sum"] += value
+    histogram["count"] += 1
+
+
+def empty_metrics() -> Dict[str, Any]:
+    """Return the metrics structure for a store with no recorded runs.
+
+    Returns:
+        Metrics dictionary with no commands and empty histograms
+    """
+    return {"commands": {}, "save_duration": new_histogram(), "lock_wait": new_histogram()}
+
+
+class MetricsStore:
+    """Metrics persisted in a small JSON file.
+
+    Attributes:
+        path: Path to the metrics file
+        lock_file: Lock guarding concurrent updates
+    """
+
+    def __init__(self, path: str):
+        """Initialize the store.
+
+        Args:
+            path: Path to the metrics file
+        """
+        self.path = path
+        self.lock_file = sidecar_path(path, "lock")
+
+    def load(self) -> Dict[str, Any]:
+        """Read the stored metrics.
+
+        Returns:
+            Metrics dictionary (empty structure if the file is missing or unreadable)
+        """
+        data = empty_metrics()
+        try:
+            with open(self.path) as f:
+                data.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        return data
+
+    def record_run(
+        self,
+        command: str,
+        duration: float,
+        ok: bool,
+        save_seconds: Optional[float] = None,
+        lock_wait_seconds: Optional[float] = None,
+        file_size: Optional[int] = None
+    ) -> None:
+        """Add one CLI run to the stored metrics.
+
+        Args:
+            command: Command name
+            duration: Wall time of the run in seconds
+            ok: Whether the run succeeded
+            save_seconds: Time spent saving the tasks file, if it was saved
+            lock_wait_seconds: Time spent waiting for the tasks lock, if taken
+            file_size: Size of the tasks file after the run, if it exists
+        """
+        with file_lock(self.lock_file):
+            data = self.load()
+            entry = data["commands"].setdefault(
+                command, {"ok": 0, "error": 0, "duration": new_histogram()}
+            )
+            entry["ok" if ok else "error"] += 1
+            observe(entry["duration"], duration)
+            if save_seconds is not None:
+                observe(data["save_duration"], save_seconds)
+            if lock_wait_seconds is not None:
+                observe(data["lock_wait"], lock_wait_seconds)
+            if file_size is not None:
+                data["tasks_file_size_bytes"] = file_size
+            data["last_run_timestamp"] = time.time()
+            write_atomic(self.path, json.dumps(data))
+
+
+def count_by_status_priority(tasks: Iterable[Dict]) -> Dict[Tuple[str, str], int]:
+    """Count tasks by (status, priority).
+
+    Args:
+        tasks: Tasks to count
+
+    Returns:
+        Dictionary mapping (status, priority) to count
+    """
+    counts: Dict[Tuple[str, str], int] = {}
+    for task in tasks:
+        key = (task.get("status", "pending"), task.get("priority", "medium"))
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name: str, histogram: Dict[str, Any], **labels: str) -> List[str]:
+    lines = []
+    cumulative = 0
+    bounds = [repr(b) for b in BUCKETS] + ["+Inf"]
+    for bound, count in zip(bounds, histogram["buckets"]):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_sum{_labels(**labels)} {_format_value(histogram['sum'])}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram['count']}")
+    return lines
+
+
+def render(
+    data: Dict[str, Any],
+    task_counts: Optional[Dict[Tuple[str, str], int]] = None,
+    file_size: Optional[int] = None,
+    fmt: str = "prometheus"
+) -> str:
+    """Render metrics in the Prometheus or OpenMetrics text format.
+
+    Args:
+        data: Stored metrics from MetricsStore.load
+        task_counts: Current task counts by (status, priority)
+        file_size: Current tasks file size (falls back to the stored value)
+        fmt: "prometheus" (text format 0.0.4) or "openmetrics"
+
+    Returns:
+        Exposition text
+    """
+    openmetrics = fmt == "openmetrics"
+    lines: List[str] = []
+
+    def family(name: str, kind: str, help_text: str) -> None:
+        # Prometheus text format names counters by their sample name
+        type_name = name if openmetrics or kind != "counter" else f"{name}_total"
+        lines.append(f"# HELP {type_name} {help_text}")
+        lines.append(f"# TYPE {type_name} {kind}")
+
+    commands = data.get("commands", {})
+    family("todo_command_runs", "counter", "Number of todo runs by command and outcome.")
+    for command in sorted(commands):
+        for outcome in ("ok", "error"):
+            lines.append(f"todo_command_runs_total{_labels(command=command, outcome=outcome)} {commands[command][outcome]}")
+
+    family("todo_command_duration_seconds", "histogram", "Wall time of todo runs by command.")
+    for command in sorted(commands):
+        lines.extend(_histogram_lines("todo_command_duration_seconds", commands[command]["duration"], command=command))
+
+    family("todo_save_duration_seconds", "histogram", "Time spent writing the tasks file.")
+    lines.extend(_histogram_lines("todo_save_duration_seconds", data.get("save_duration", new_histogram())))
+
+    family("todo_lock_wait_seconds", "histogram", "Time spent waiting for the tasks file lock.")
+    lines.extend(_histogram_lines("todo_lock_wait_seconds", data.get("lock_wait", new_histogram())))
+
+    if file_size is None:
+        file_size = data.get("tasks_file_size_bytes")
+    if file_size is not None:
+        family("todo_tasks_file_size_bytes", "gauge", "Size of the tasks file in bytes.")
+        lines.append(f"todo_tasks_file_size_bytes {file_size}")
+
+    if task_counts is not None:
+        family("todo_tasks", "gauge", "Number of tasks by status and priority.")
+        for (status, priority), count in sorted(task_counts.items()):
+            lines.append(f"todo_tasks{_labels(status=status, priority=priority)} {count}")
+
+    if "last_run_timestamp" in data:
+        family("todo_last_run_timestamp_seconds", "gauge", "Unix time of the last recorded run.")
+        lines.append(f"todo_last_run_timestamp_seconds {_format_value(data['last_run_timestamp'])}")
+
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
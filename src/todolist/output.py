@@ -0,0 +1,276 @@
+"""Machine-readable (JSON and NDJSON) output for CLI results."""
+
+import json
+import sys
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .core import TaskStatistics
+from .storage import VerifyReport
+from .sync import SyncResult
+
+if TYPE_CHECKING:  # pragma: no cover - only needed for annotations
+    from .hierarchy import TreeRow
+    from .history import Revision
+    from .recurrence import AgendaItem
+    from .rollups import Report
+
+FORMATS = ["text", "json", "ndjson"]
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def task_record(index: int, task: Dict) -> Dict:
+    """Build the output record for a task.
+
+    Args:
+        index: 1-based index of the task
+        task: Task dictionary
+
+    Returns:
+        Task fields with the index added
+    """
+    record = {"index": index}
+    record.update(task)
+    return record
+
+
+def statistics_record(stats: TaskStatistics) -> Dict:
+    """Build the output record for task statistics.
+
+    Args:
+        stats: Statistics to serialize
+
+    Returns:
+        Statistics fields plus the completion percentage
+    """
+    record = asdict(stats)
+    record["completion_pct"] = round(stats.completion_pct, 1)
+    return record
+
+
+def report_records(report: "Report") -> Iterator[Dict]:
+    """Flatten a report into one record per period.
+
+    Args:
+        report: Report to serialize
+
+    Yields:
+        Period fields plus "by" and "tag" (None for the overall rows)
+    """
+    for tag, periods in [(None, report.periods)] + list(report.tags.items()):
+        for period in periods:
+            record = {"by": report.by, "tag": tag}
+            record.update(asdict(period))
+            yield record
+
+
+def scored_records(matches: Iterable[Tuple[int, Dict, float]]) -> Iterator[Dict]:
+    """Build task records for ranked matches.
+
+    Args:
+        matches: (index, task, score) triples
+
+    Yields:
+        Task records with the score added
+    """
+    for index, task, score in matches:
+        record = task_record(index, task)
+        record["score"] = score
+        yield record
+
+
+def duplicate_records(clusters: Iterable[List[Tuple[int, Dict]]]) -> Iterator[Dict]:
+    """Flatten duplicate clusters into one record per task.
+
+    Args:
+        clusters: Groups of (index, task) pairs
+
+    Yields:
+        Task records with a 1-based "group" number added
+    """
+    for number, cluster in enumerate(clusters, 1):
+        for index, task in cluster:
+            record = {"group": number}
+            record.update(task_record(index, task))
+            yield record
+
+
+def revision_record(revision: "Revision") -> Dict:
+    """Build the output record for an undo history entry.
+
+    Args:
+        revision: Revision to serialize
+
+    Returns:
+        Revision fields
+    """
+    return asdict(revision)
+
+
+def view_record(results: Iterable[Tuple[int, Dict]], updated: str) -> Dict:
+    """Build the record emitted by ``todo watch`` for each new view.
+
+    Args:
+        results: (index, task) pairs in the view
+        updated: ISO time the view was loaded
+
+    Returns:
+        The load time and the task records
+    """
+    return {"updated": updated, "tasks": [task_record(i, task) for i, task in results]}
+
+
+def agenda_record(item: "AgendaItem") -> Dict:
+    """Build the output record for an agenda item.
+
+    Args:
+        item: Agenda item
+
+    Returns:
+        Task fields plus "date", "index" and "recurring"; for recurring
+        items the index is the template's
+    """
+    record = {"date": item.on.isoformat(), "recurring": item.recurring}
+    record.update(task_record(item.index, item.task))
+    return record
+
+
+def tree_record(row: "TreeRow") -> Dict:
+    """Build the output record for a row of a task tree.
+
+    Args:
+        row: Tree row
+
+    Returns:
+        Task summary plus "index", "depth", the descendant counts and
+        their completion percentage
+    """
+    record = task_record(row.index, row.task)
+    record.update(depth=row.depth, total=row.total, done=row.done, completion_pct=round(row.completion_pct, 1))
+    return record
+
+
+def sync_record(result: SyncResult, dry_run: bool = False) -> Dict:
+    """Build the output record for a sync.
+
+    Args:
+        result: Sync result
+        dry_run: Whether nothing was written
+
+    Returns:
+        Sync counters plus in_sync and dry_run flags
+    """
+    record = asdict(result)
+    record["in_sync"] = result.in_sync
+    record["dry_run"] = dry_run
+    return record
+
+
+def verify_record(report: VerifyReport) -> Dict:
+    """Build the output record for a verification.
+
+    Args:
+        report: Verification report
+
+    Returns:
+        Report fields plus an "ok" flag
+    """
+    record = asdict(report)
+    record["ok"] = report.ok
+    return record
+
+
+def write_records(records: Iterable[Any], fmt: str, stream: Optional[TextIO] = None) -> int:
+    """Stream a sequence of records as a JSON array or as NDJSON.
+
+    Records are encoded and written one at a time as they are produced, so
+    the sequence is never held in memory. Each record is encoded in one call
+    rather than chunk by chunk, which keeps per-record overhead low.
+
+    If producing a record raises, the output is deliberately left
+    incomplete: in JSON mode the array is not closed, so a consumer cannot
+    mistake a partial result for a complete one, and nothing at all is
+    written if the error comes before the first record. The error itself
+    is left to the caller, which reports it on stderr.
+
+    Args:
+        records: JSON-serializable records
+        fmt: Output format (json or ndjson)
+        stream: Stream to write to (defaults to stdout)
+
+    Returns:
+        Number of records written
+    """
+    out = stream or sys.stdout
+    count = 0
+    if fmt == "ndjson":
+        for record in records:
+            out.write(_encoder.encode(record))
+            out.write("\n")
+            count += 1
+        return count
+
+    for record in records:
+        encoded = _encoder.encode(record)
+        out.write("," if count else "[")
+        out.write(encoded)
+        count += 1
+    out.write("]\n" if count else "[]\n")
+    return count
+
+
+def write_record(record: Any, fmt: str, stream: Optional[TextIO] = None) -> None:
+    """Write a single record as one JSON document.
+
+    Args:
+        record: JSON-serializable record
+        fmt: Output format (json or ndjson)
+        stream: Stream to write to (defaults to stdout)
+    """
+    out = stream or sys.stdout
+    out.write(_encoder.encode(record))
+    out.write("\n")
+
+
+def write_tasks(results: Iterable[Tuple[int, Dict]], fmt: str, stream: Optional[TextIO] = None) -> int:
+    """Stream (index, task) pairs as task records.
+
+    Args:
+        results: (index, task) pairs, typically a TodoList generator
+        fmt: Output format (json or ndjson)
+        stream: Stream to write to (defaults to stdout)
+
+    Returns:
+        Number of tasks written
+    """
+    return write_records((task_record(i, task) for i, task in results), fmt, stream)
+
+
+def write_tags(tag_counts: Dict[str, int], fmt: str, stream: Optional[TextIO] = None) -> int:
+    """Write tag counts as {"tag", "count"} records sorted by tag.
+
+    Args:
+        tag_counts: Dictionary mapping tag to number of tasks
+        fmt: Output format (json or ndjson)
+        stream: Stream to write to (defaults to stdout)
+
+    Returns:
+        Number of tags written
+    """
+    records = ({"tag": tag, "count": count} for tag, count in sorted(tag_counts.items()))
+    return write_records(records, fmt, stream)
+
+
+def write_error(message: str, fmt: str, stream: Optional[TextIO] = None, **details: Any) -> None:
+    """Write an error record.
+
+    Args:
+        message: Error message
+        fmt: Output format (json or ndjson)
+        stream: Stream to write to (defaults to stdout)
+        **details: Extra fields to include in the record
+    """
+    record = {"error": message}
+    record.update(details)
+    write_record(record, fmt, stream)
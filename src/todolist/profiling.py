@@ -0,0 +1,247 @@
+"""Lightweight per-phase timing instrumentation.
+
+Code marks phases with ``span("name")`` blocks. While the module-level
+tracer is disabled, ``span`` hands back one shared no-op context manager,
+so instrumented code pays a function call and nothing more. Once enabled,
+each phase accumulates its call count and its total and self (exclusive)
+wall time. Nested spans are subtracted from their parent's self time.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, TextIO, TypeVar
+
+T = TypeVar("T")
+
+_NULL = nullcontext()
+
+
+class PhaseStats:
+    """Accumulated timings for one phase.
+
+    Attributes:
+        calls: Number of times the phase was entered
+        total: Inclusive wall time in seconds
+        self_time: Wall time in seconds excluding nested phases
+    """
+
+    __slots__ = ("calls", "total", "self_time")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.self_time = 0.0
+
+
+class _Span:
+    """Context manager timing one entry into a phase."""
+
+    __slots__ = ("tracer", "name", "start", "child")
+
+    def __init__(self, tracer: "Tracer", name: str) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.child = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.tracer._stack().append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        stack = self.tracer._stack()
+        stack.pop()
+        if stack:
+            stack[-1].child += elapsed
+        self.tracer.record(self.name, elapsed, elapsed - self.child)
+
+
+class Tracer:
+    """Collects phase timings while enabled.
+
+    Attributes:
+        enabled: Whether spans are being recorded
+        per_item: Whether timed_iter wraps iterators (one span per item)
+        phases: PhaseStats keyed by phase name, in first-seen order
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.per_item = False
+        self.phases: Dict[str, PhaseStats] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enable(self, per_item: bool = True) -> None:
+        """Start recording spans.
+
+        Args:
+            per_item: Also time lazy iterators item by item. Callers that
+                only need coarse phases (such as metrics) can skip this cost.
+        """
+        self.enabled = True
+        self.per_item = self.per_item or per_item
+
+    def reset(self) -> None:
+        """Disable the tracer and discard recorded phases."""
+        self.enabled = False
+        self.per_item = False
+        self.phases = {}
+        self._local = threading.local()
+
+    def span(self, name: str) -> ContextManager[Any]:
+        """Return a context manager timing the named phase.
+
+        Args:
+            name: Phase name
+
+        Returns:
+            A timing context manager, or a shared no-op one when disabled
+        """
+        if not self.enabled:
+            return _NULL
+        return _Span(self, name)
+
+    def record(self, name: str, elapsed: float, self_time: Optional[float] = None) -> None:
+        """Add a measurement to a phase directly.
+
+        Args:
+            name: Phase name
+            elapsed: Inclusive wall time in seconds
+            self_time: Exclusive wall time (defaults to elapsed)
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = PhaseStats()
+            stats.calls += 1
+            stats.total += elapsed
+            stats.self_time += elapsed if self_time is None else self_time
+
+    def timed_iter(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Wrap an iterator so time spent producing items counts as a phase.
+
+        Time the consumer spends between items is not included, which lets
+        a lazy pipeline's filtering be separated from the rendering of its
+        results.
+
+        Args:
+            name: Phase name
+            iterable: Iterable to wrap
+
+        Returns:
+            The iterable unchanged unless per-item timing is on,
+            otherwise a timed iterator
+        """
+        if not self.per_item:
+            return iter(iterable)
+        return self._timed_iter(name, iter(iterable))
+
+    def _timed_iter(self, name: str, iterator: Iterator[T]) -> Iterator[T]:
+        while True:
+            with self.span(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def summary(self, total: Optional[float] = None, startup_cpu: Optional[float] = None) -> Dict[str, Any]:
+        """Return recorded timings as plain data.
+
+        Args:
+            total: Overall wall time in seconds, if known
+            startup_cpu: CPU seconds spent before main() started, if known
+
+        Returns:
+            Dictionary with per-phase milliseconds and call counts
+        """
+        result: Dict[str, Any] = {
+            "phases": {
+                name: {
+                    "calls": stats.calls,
+                    "self_ms": round(stats.self_time * 1000, 3),
+                    "total_ms": round(stats.total * 1000, 3),
+                }
+                for name, stats in self.phases.items()
+            }
+        }
+        if total is not None:
+            result["total_ms"] = round(total * 1000, 3)
+        if startup_cpu is not None:
+            result["startup_cpu_ms"] = round(startup_cpu * 1000, 3)
+        return result
+
+    def report(
+        self,
+        fmt: str = "table",
+        stream: Optional[TextIO] = None,
+        total: Optional[float] = None,
+        startup_cpu: Optional[float] = None
+    ) -> None:
+        """Write a timing breakdown.
+
+        Args:
+            fmt: "table" for a human-readable table or "json"
+            stream: Stream to write to (defaults to stderr)
+            total: Overall wall time in seconds, if known
+            startup_cpu: CPU seconds spent before main() started, if known
+        """
+        out = stream or sys.stderr
+        data = self.summary(total, startup_cpu)
+        if fmt == "json":
+            out.write(json.dumps(data) + "\n")
+            return
+
+        out.write(f"{'phase':<14} {'self ms':>10} {'total ms':>10} {'calls':>7} {'%':>6}\n")
+        wall = data.get("total_ms")
+        for name, phase in data["phases"].items():
+            pct = f"{phase['self_ms'] / wall * 100:.1f}" if wall else ""
+            out.write(f"{name:<14} {phase['self_ms']:>10.3f} {phase['total_ms']:>10.3f} {phase['calls']:>7} {pct:>6}\n")
+        if wall is not None:
+            out.write(f"{'total':<14} {wall:>10.3f}\n")
+        if startup_cpu is not None:
+            out.write(f"{'startup (cpu)':<14} {data['startup_cpu_ms']:>10.3f}\n")
+
+
+# Process-wide tracer used by the instrumented code paths
+tracer = Tracer()
+
+
+def span(name: str) -> ContextManager[Any]:
+    """Time a phase with the process-wide tracer.
+
+    Args:
+        name: Phase name
+
+    Returns:
+        A timing context manager, or a shared no-op one when disabled
+    """
+    if not tracer.enabled:
+        return _NULL
+    return _Span(tracer, name)
+
+
+def trace_format_from_env() -> Optional[str]:
+    """Read the TODO_TRACE environment variable.
+
+    Returns:
+        "json" or "table" when tracing is requested, otherwise None
+    """
+    value = os.environ.get("TODO_TRACE", "").strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return None
+    return "json" if value == "json" else "table"
@@ -0,0 +1,311 @@
+"""Recurring task templates with lazily generated occurrences.
+
+A template stores a description, priority, tags, a start date and a rule:
+
+- ``daily``, ``weekly``, ``monthly`` or ``yearly``
+- ``every N days``, ``every N weeks`` or ``every N months``
+- ``cron: DOM MON DOW``, the day fields of a crontab line, e.g.
+  ``cron: * * mon-fri`` or ``cron: 1,15 * *``
+
+Weekly and monthly rules repeat on the start date's weekday or day of the
+month (clamped to the end of shorter months). Occurrences are never
+stored: occurrences() generates the dates falling in a window on demand,
+jumping straight to the first one for interval rules. Only completing an
+occurrence adds a task to the tasks file, marked with the template and
+date it came from, so the file grows with activity rather than with the
+calendar.
+
+Templates are kept in ``<tasks_file>.recurring``.
+"""
+
+import calendar
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, FrozenSet, Iterator, List, Optional
+
+from .locking import write_atomic
+
+_MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_abbr) if name}
+_DAYS = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+_NAMED = {"daily": (1, "days"), "weekly": (1, "weeks"), "monthly": (1, "months"), "yearly": (12, "months")}
+_EVERY = re.compile(r"every\s+(\d+)\s+(day|week|month)s?$")
+
+# Search limit in days when looking for the previous or next occurrence
+_HORIZON = 366 * 12
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A parsed recurrence rule.
+
+    Attributes:
+        text: Normalized rule text
+        interval: Step between occurrences, for interval rules
+        unit: "days" or "months" for interval rules, "cron" otherwise
+        days_of_month: Allowed days of the month (cron rules)
+        months: Allowed months (cron rules)
+        weekdays: Allowed weekdays, 0 = Sunday (cron rules)
+        any_day_of_month: Whether the day-of-month field was "*"
+        any_weekday: Whether the day-of-week field was "*"
+    """
+    text: str
+    interval: int = 1
+    unit: str = "days"
+    days_of_month: FrozenSet[int] = field(default_factory=frozenset)
+    months: FrozenSet[int] = field(default_factory=frozenset)
+    weekdays: FrozenSet[int] = field(default_factory=frozenset)
+    any_day_of_month: bool = True
+    any_weekday: bool = True
+
+    def matches(self, day: date) -> bool:
+        """Return whether a cron rule fires on a date.
+
+        As in cron, when both day fields are restricted a date matching
+        either one fires.
+
+        Args:
+            day: Date to test
+
+        Returns:
+            True if the rule fires
+        """
+        if day.month not in self.months:
+            return False
+        dom = day.day in self.days_of_month
+        dow = (day.isoweekday() % 7) in self.weekdays
+        if self.any_day_of_month or self.any_weekday:
+            return dom and dow
+        return dom or dow
+
+
+def _cron_field(text: str, low: int, high: int, names: Dict[str, int]) -> FrozenSet[int]:
+    """Expand one cron field (lists, ranges, steps and names) into values."""
+    values = set()
+    for part in text.lower().split(","):
+        spec, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if spec == "*":
+            start, end = low, high
+        else:
+            first, _, last = spec.partition("-")
+            start = names[first] if first in names else int(first)
+            end = (names[last] if last in names else int(last)) if last else (high if step_text else start)
+        if not low <= start <= end <= high or step < 1:
+            raise ValueError(f"Invalid cron field: {text}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+def parse_rule(text: str) -> Rule:
+    """Parse a recurrence rule.
+
+    Args:
+        text: Rule text, e.g. "weekly", "every 2 weeks" or "cron: * * mon-fri"
+
+    Returns:
+        The rule
+
+    Raises:
+        ValueError: If the rule is not understood
+    """
+    normalized = " ".join(text.lower().split())
+    if normalized in _NAMED:
+        interval, unit = _NAMED[normalized]
+        return Rule(normalized, interval * (7 if unit == "weeks" else 1), "days" if unit == "weeks" else unit)
+    match = _EVERY.match(normalized)
+    if match:
+        count, unit = int(match.group(1)), match.group(2)
+        if count < 1:
+            raise ValueError(f"Invalid recurrence rule: {text}")
+        if unit == "month":
+            return Rule(normalized, count, "months")
+        return Rule(normalized, count * (7 if unit == "week" else 1), "days")
+    if normalized.startswith("cron"):
+        fields = normalized[4:].lstrip(":").split()
+        if len(fields) == 3:
+            try:
+                weekdays = _cron_field(fields[2], 0, 7, _DAYS)
+                return Rule(
+                    "cron: " + " ".join(fields),
+                    unit="cron",
+                    days_of_month=_cron_field(fields[0], 1, 31, {}),
+                    months=_cron_field(fields[1], 1, 12, _MONTHS),
+                    # 7 is Sunday too
+                    weekdays=frozenset(d % 7 for d in weekdays),
+                    any_day_of_month=fields[0] == "*",
+                    any_weekday=fields[2] == "*",
+                )
+            except (KeyError, ValueError):
+                pass
+    raise ValueError(
+        f"Invalid recurrence rule: {text} "
+        "(use daily, weekly, monthly, yearly, 'every N days|weeks|months' or 'cron: DOM MON DOW')"
+    )
+
+
+def add_months(day: date, months: int, anchor: int) -> date:
+    """Move a date by whole months, keeping an anchor day where possible.
+
+    Args:
+        day: Starting date
+        months: Months to add
+        anchor: Preferred day of the month
+
+    Returns:
+        The date, clamped to the last day of shorter months
+    """
+    total = day.year * 12 + day.month - 1 + months
+    year, month = divmod(total, 12)
+    month += 1
+    return date(year, month, min(anchor, calendar.monthrange(year, month)[1]))
+
+
+def occurrences(rule: Rule, start: date, begin: date, end: date) -> Iterator[date]:
+    """Generate the dates a rule fires on within a window.
+
+    Args:
+        rule: Recurrence rule
+        start: First possible occurrence (the template's start date)
+        begin: First day of the window
+        end: Last day of the window (inclusive)
+
+    Yields:
+        Occurrence dates in order
+    """
+    first = max(start, begin)
+    if first > end:
+        return
+    if rule.unit == "days":
+        step = rule.interval
+        k = -(-(first - start).days // step)
+        day = start + timedelta(days=k * step)
+        while day <= end:
+            yield day
+            day += timedelta(days=step)
+    elif rule.unit == "months":
+        months = (first.year - start.year) * 12 + first.month - start.month
+        k = max(0, months // rule.interval)
+        while True:
+            day = add_months(start, k * rule.interval, start.day)
+            if day > end:
+                return
+            if day >= first:
+                yield day
+            k += 1
+    else:
+        day = first
+        while day <= end:
+            if rule.matches(day):
+                yield day
+            day += timedelta(days=1)
+
+
+def previous_occurrence(rule: Rule, start: date, on_or_before: date) -> Optional[date]:
+    """Return the latest occurrence on or before a date.
+
+    Args:
+        rule: Recurrence rule
+        start: The template's start date
+        on_or_before: Upper bound
+
+    Returns:
+        The date, or None if the rule has not fired yet
+    """
+    if on_or_before < start:
+        return None
+    if rule.unit == "days":
+        return start + timedelta(days=(on_or_before - start).days // rule.interval * rule.interval)
+    if rule.unit == "months":
+        k = ((on_or_before.year - start.year) * 12 + on_or_before.month - start.month) // rule.interval
+        for step in range(k, -1, -1):
+            day = add_months(start, step * rule.interval, start.day)
+            if day <= on_or_before:
+                return day
+        return None
+    # Every satisfiable cron rule fires within twelve years (29 Feb included)
+    day, limit = on_or_before, max(start, on_or_before - timedelta(days=_HORIZON))
+    while day >= limit:
+        if rule.matches(day):
+            return day
+        day -= timedelta(days=1)
+    return None
+
+
+def next_occurrence(rule: Rule, start: date, after: date) -> Optional[date]:
+    """Return the first occurrence after a date.
+
+    Args:
+        rule: Recurrence rule
+        start: The template's start date
+        after: Exclusive lower bound
+
+    Returns:
+        The date, or None if there is none within twelve years
+    """
+    begin = after + timedelta(days=1)
+    return next(occurrences(rule, start, begin, begin + timedelta(days=_HORIZON)), None)
+
+
+@dataclass
+class AgendaItem:
+    """One entry of an agenda.
+
+    Attributes:
+        on: Date the item is due
+        index: 1-based task index, or template index for recurring items
+        task: Task dictionary (synthesized for pending occurrences)
+        recurring: Whether the item is an occurrence of a template
+    """
+    on: date
+    index: int
+    task: Dict
+    recurring: bool = False
+
+
+class RecurringStore:
+    """Recurring task templates persisted in a sidecar file.
+
+    Attributes:
+        path: Path to the templates file
+    """
+
+    def __init__(self, path: str):
+        """Initialize the store.
+
+        Args:
+            path: Path to the templates file
+        """
+        self.path = path
+
+    def load(self) -> List[Dict]:
+        """Read the templates.
+
+        A file that exists but cannot be read is an error rather than an
+        empty list, so that the next save does not discard the templates.
+
+        Returns:
+            Templates in creation order (empty if the file is missing)
+
+        Raises:
+            ValueError: If the file is not a JSON list of templates
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return []
+        except ValueError as e:
+            raise ValueError(f"Recurring tasks file {self.path} is damaged: {e}") from e
+        if not isinstance(data, list):
+            raise ValueError(f"Recurring tasks file {self.path} is damaged: expected a list")
+        return data
+
+    def save(self, templates: List[Dict]) -> None:
+        """Write the templates.
+
+        Args:
+            templates: Templates to store
+        """
+        write_atomic(self.path, json.dumps(templates, indent=4))
@@ -0,0 +1,395 @@
+"""Time-bucketed rollups of task activity for reports.
+
+Per-day counts of created and completed tasks, plus a histogram of lead
+times (created to completed), are kept overall and per tag in a
+``<tasks_file>.rollups`` sidecar. Every figure is a count, so adding,
+completing or removing a task applies a small delta instead of rescanning
+the file, and weeks and months are built by merging days at report time.
+The sidecar records the signature of the tasks file it matches; when the
+file has changed behind its back the rollups are rebuilt on the next report.
+"""
+
+import calendar
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .locking import write_atomic
+
+PERIODS = ["day", "week", "month"]
+
+# Lead-time histogram buckets grow by 10%, so percentiles are within ~5%
+GROWTH = 1.1
+
+VERSION = 1
+
+Bucket = Dict[str, Any]
+
+
+@dataclass
+class PeriodStats:
+    """Activity during one report period.
+
+    Attributes:
+        period: Period label (2024-06-15, 2024-W24 or 2024-06)
+        created: Tasks created during the period
+        completed: Tasks completed during the period
+        throughput: Completed tasks per day over the period
+        lead_p50: Median lead time in seconds of tasks completed in the period
+        lead_p90: 90th percentile lead time in seconds
+    """
+    period: str
+    created: int = 0
+    completed: int = 0
+    throughput: float = 0.0
+    lead_p50: Optional[float] = None
+    lead_p90: Optional[float] = None
+
+
+@dataclass
+class Report:
+    """Created/completed activity grouped by period.
+
+    Attributes:
+        by: Period length (day, week or month)
+        periods: Overall statistics, oldest period first
+        tags: Per-tag statistics keyed by tag
+    """
+    by: str
+    periods: List[PeriodStats] = field(default_factory=list)
+    tags: Dict[str, List[PeriodStats]] = field(default_factory=dict)
+
+
+def lead_bucket(seconds: float) -> int:
+    """Return the histogram bucket for a lead time.
+
+    Args:
+        seconds: Lead time in seconds
+
+    Returns:
+        Bucket index (0 for anything under a second)
+    """
+    if seconds < 1:
+        return 0
+    return max(1, math.ceil(math.log(seconds, GROWTH)))
+
+
+def bucket_seconds(index: int) -> float:
+    """Return the representative lead time of a histogram bucket.
+
+    Args:
+        index: Bucket index from lead_bucket
+
+    Returns:
+        Geometric midpoint of the bucket in seconds
+    """
+    if index <= 0:
+        return 0.0
+    return GROWTH ** (index - 0.5)
+
+
+def percentile(histogram: Dict[str, int], pct: float) -> Optional[float]:
+    """Estimate a percentile from a lead-time histogram.
+
+    Args:
+        histogram: Counts keyed by bucket index (as strings)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Lead time in seconds, or None for an empty histogram
+    """
+    total = sum(histogram.values())
+    if not total:
+        return None
+    rank = max(1, math.ceil(total * pct / 100))
+    seen = 0
+    for index in sorted(histogram, key=int):
+        seen += histogram[index]
+        if seen >= rank:
+            return round(bucket_seconds(int(index)), 1)
+    return None  # pragma: no cover - unreachable
+
+
+def _day(timestamp: Optional[str]) -> Optional[str]:
+    """Return the YYYY-MM-DD day of a stored timestamp, or None if invalid."""
+    if not timestamp:
+        return None
+    try:
+        return date.fromisoformat(timestamp[:10]).isoformat()
+    except ValueError:
+        return None
+
+
+def lead_seconds(task: Dict) -> Optional[float]:
+    """Return the time from creation to completion of a task.
+
+    Args:
+        task: Task dictionary
+
+    Returns:
+        Seconds (never negative), or None if either timestamp is missing
+        or invalid
+    """
+    try:
+        created = datetime.fromisoformat(task["created_at"])
+        completed = datetime.fromisoformat(task["completed_at"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return max(0.0, (completed - created).total_seconds())
+
+
+def empty_rollups() -> Dict[str, Any]:
+    """Return rollups for an empty task list.
+
+    Returns:
+        Rollups dictionary with no days and no tags
+    """
+    return {"version": VERSION, "signature": None, "days": {}, "tags": {}}
+
+
+def _bump(days: Dict[str, Bucket], day: str, key: str, sign: int, lead: Optional[int] = None) -> None:
+    bucket = days.setdefault(day, {"created": 0, "completed": 0, "lead": {}})
+    bucket[key] += sign
+    if lead is not None:
+        slot = str(lead)
+        count = bucket["lead"].get(slot, 0) + sign
+        if count:
+            bucket["lead"][slot] = count
+        else:
+            del bucket["lead"][slot]
+    if not bucket["created"] and not bucket["completed"]:
+        del days[day]
+
+
+def apply_task(rollups: Dict[str, Any], task: Dict, sign: int = 1) -> None:
+    """Add a task's contribution to rollups, or remove it.
+
+    Args:
+        rollups: Rollups to update in place
+        task: Task dictionary
+        sign: 1 to add the task, -1 to remove it
+    """
+    scopes = [rollups["days"]]
+    for tag in task.get("tags") or []:
+        scopes.append(rollups["tags"].setdefault(tag, {}))
+
+    created = _day(task.get("created_at"))
+    completed = _day(task.get("completed_at")) if task.get("status") == "completed" else None
+    lead = None
+    if completed:
+        seconds = lead_seconds(task)
+        lead = lead_bucket(seconds) if seconds is not None else None
+
+    for days in scopes:
+        if created:
+            _bump(days, created, "created", sign)
+        if completed:
+            _bump(days, completed, "completed", sign, lead)
+
+    for tag in task.get("tags") or []:
+        if not rollups["tags"].get(tag):
+            rollups["tags"].pop(tag, None)
+
+
+def build_rollups(tasks: Iterable[Dict]) -> Dict[str, Any]:
+    """Compute rollups from scratch.
+
+    Args:
+        tasks: Tasks to roll up
+
+    Returns:
+        Rollups dictionary (signature unset)
+    """
+    rollups = empty_rollups()
+    for task in tasks:
+        apply_task(rollups, task)
+    return rollups
+
+
+def period_key(day: str, by: str) -> str:
+    """Return the label of the period containing a day.
+
+    Args:
+        day: YYYY-MM-DD
+        by: day, week (ISO week) or month
+
+    Returns:
+        Period label such as 2024-06-15, 2024-W24 or 2024-06
+    """
+    if by == "month":
+        return day[:7]
+    if by == "week":
+        year, week, _ = date.fromisoformat(day).isocalendar()
+        return f"{year}-W{week:02d}"
+    return day
+
+
+def period_days(period: str, by: str) -> int:
+    """Return the number of days in a period.
+
+    Args:
+        period: Period label from period_key
+        by: day, week or month
+
+    Returns:
+        Length of the period in days
+    """
+    if by == "month":
+        year, month = period.split("-")
+        return calendar.monthrange(int(year), int(month))[1]
+    return 7 if by == "week" else 1
+
+
+def summarize(days: Dict[str, Bucket], by: str, last: Optional[int] = None) -> List[PeriodStats]:
+    """Merge daily buckets into report periods.
+
+    Args:
+        days: Daily buckets keyed by YYYY-MM-DD
+        by: day, week or month
+        last: Only keep the most recent N periods
+
+    Returns:
+        PeriodStats for each period with activity, oldest first
+    """
+    merged: Dict[str, Bucket] = {}
+    for day, bucket in days.items():
+        target = merged.setdefault(period_key(day, by), {"created": 0, "completed": 0, "lead": {}})
+        target["created"] += bucket["created"]
+        target["completed"] += bucket["completed"]
+        for slot, count in bucket["lead"].items():
+            target["lead"][slot] = target["lead"].get(slot, 0) + count
+
+    periods = sorted(merged)
+    if last is not None:
+        periods = periods[-last:] if last > 0 else []
+    return [
+        PeriodStats(
+            period=period,
+            created=merged[period]["created"],
+            completed=merged[period]["completed"],
+            throughput=round(merged[period]["completed"] / period_days(period, by), 3),
+            lead_p50=percentile(merged[period]["lead"], 50),
+            lead_p90=percentile(merged[period]["lead"], 90),
+        )
+        for period in periods
+    ]
+
+
+def make_report(
+    rollups: Dict[str, Any],
+    by: str = "week",
+    tags: Optional[Sequence[str]] = None,
+    last: Optional[int] = None
+) -> Report:
+    """Build a report from rollups.
+
+    Args:
+        rollups: Rollups from build_rollups or RollupStore.load
+        by: day, week or month
+        tags: Tags to break down (defaults to every tag)
+        last: Only keep the most recent N periods with any activity
+
+    Returns:
+        Report with overall and per-tag periods
+
+    Raises:
+        ValueError: If the period is not supported
+    """
+    if by not in PERIODS:
+        raise ValueError(f"Unknown period: {by}")
+    selected = sorted(rollups["tags"]) if tags is None else list(tags)
+    periods = summarize(rollups["days"], by, last)
+    # Tag breakdowns cover the same window as the overall periods
+    window = {p.period for p in periods} if last is not None else None
+    return Report(
+        by=by,
+        periods=periods,
+        tags={
+            tag: [
+                p for p in summarize(rollups["tags"].get(tag, {}), by)
+                if window is None or p.period in window
+            ]
+            for tag in selected
+        },
+    )
+
+
+class RollupStore:
+    """Rollups persisted in a sidecar JSON file.
+
+    Attributes:
+        path: Path to the rollups file
+    """
+
+    def __init__(self, path: str):
+        """Initialize the store.
+
+        Args:
+            path: Path to the rollups file
+        """
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the stored rollups.
+
+        Returns:
+            Rollups dictionary, or None if missing, unreadable or outdated
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != VERSION:
+            return None
+        return data
+
+    def save(self, rollups: Dict[str, Any], signature: Optional[Tuple[int, ...]]) -> None:
+        """Write rollups along with the tasks file signature they match.
+
+        Args:
+            rollups: Rollups to store
+            signature: file_signature of the tasks file they were computed from
+        """
+        rollups["signature"] = list(signature) if signature else None
+        write_atomic(self.path, json.dumps(rollups, separators=(",", ":")))
+
+    @staticmethod
+    def matches(rollups: Dict[str, Any], signature: Optional[Tuple[int, ...]]) -> bool:
+        """Return whether rollups were computed from the given file version.
+
+        Args:
+            rollups: Stored rollups
+            signature: Current file_signature of the tasks file
+
+        Returns:
+            True if the rollups are current
+        """
+        return signature is not None and rollups.get("signature") == list(signature)
+
+    def apply(
+        self,
+        before: Optional[Tuple[int, ...]],
+        after: Optional[Tuple[int, ...]],
+        changes: Iterable[Tuple[Dict, int]]
+    ) -> None:
+        """Apply a saved mutation to the stored rollups.
+
+        Nothing happens unless the rollups exist and were current before
+        the mutation. Stale rollups are left alone; the next report
+        rebuilds them.
+
+        Args:
+            before: Tasks file signature before the mutation
+            after: Tasks file signature after the mutation was saved
+            changes: (task, sign) pairs; sign is 1 for added task
+                versions and -1 for removed ones
+        """
+        rollups = self.load()
+        if rollups is None or not self.matches(rollups, before):
+            return
+        for task, sign in changes:
+            apply_task(rollups, task, sign)
+        self.save(rollups, after)
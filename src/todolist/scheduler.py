@@ -0,0 +1,206 @@
+"""Priority-queue scheduler for picking the most urgent pending tasks.
+
+Tasks are ordered by (overdue, priority, due date, age): overdue tasks come
+first, then higher priority, then earlier due dates (tasks without one
+last), then older tasks. Pending tasks live in two binary heaps, one for
+overdue tasks and one for the rest. A third heap keyed by due date moves
+tasks into the overdue heap once their date has passed. Updates use lazy
+deletion: a changed task gets a fresh heap entry and its old entry is
+flagged dead. Reading the top K walks each heap with a small frontier heap
+and leaves the queues unchanged, so it costs O(K log K) no matter how many
+tasks are queued.
+"""
+
+import heapq
+from datetime import date
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+# Sorts after every real date ordinal
+NO_DUE = float("inf")
+
+# Entry layout: [priority rank, due ordinal, created_at, seq, key, alive]
+_ALIVE = 5
+
+
+def parse_due(due_date: Optional[str]) -> Optional[date]:
+    """Parse a task's due date.
+
+    Args:
+        due_date: Stored due date string (ISO date or datetime)
+
+    Returns:
+        The date, or None if missing or not in ISO format
+    """
+    if not due_date:
+        return None
+    try:
+        return date.fromisoformat(due_date[:10])
+    except ValueError:
+        return None
+
+
+def _top(heap: List[list], count: int) -> Iterable[list]:
+    """Yield up to count live entries from a heap in order, without popping."""
+    if not heap or count <= 0:
+        return
+    frontier: List[Tuple[list, int]] = [(heap[0], 0)]
+    found = 0
+    size = len(heap)
+    while frontier and found < count:
+        entry, i = heapq.heappop(frontier)
+        if entry[_ALIVE]:
+            yield entry
+            found += 1
+        for child in (2 * i + 1, 2 * i + 2):
+            if child < size:
+                heapq.heappush(frontier, (heap[child], child))
+
+
+class TaskScheduler:
+    """Incrementally maintained priority queue over pending tasks.
+
+    Keys are chosen by the caller (TodoList uses 1-based indices) and
+    identify tasks across updates.
+    """
+
+    def __init__(self, today: Optional[date] = None):
+        """Initialize an empty scheduler.
+
+        Args:
+            today: Date used to decide what is overdue (defaults to today)
+        """
+        self._today = (today or date.today()).toordinal()
+        self._overdue: List[list] = []
+        self._upcoming: List[list] = []
+        self._due: List[Tuple[int, int, list]] = []
+        self._entries: Dict[Hashable, list] = {}
+        self._seq = 0
+        self._dead = 0
+
+    @classmethod
+    def from_tasks(cls, items: Iterable[Tuple[Hashable, Dict]], today: Optional[date] = None) -> "TaskScheduler":
+        """Build a scheduler in O(n) with heapify.
+
+        Args:
+            items: (key, task) pairs
+            today: Date used to decide what is overdue
+
+        Returns:
+            Scheduler containing the pending tasks
+        """
+        scheduler = cls(today)
+        for key, task in items:
+            scheduler._insert(key, task, heapify=True)
+        heapq.heapify(scheduler._overdue)
+        heapq.heapify(scheduler._upcoming)
+        heapq.heapify(scheduler._due)
+        return scheduler
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _insert(self, key: Hashable, task: Dict, heapify: bool = False) -> None:
+        if task.get("status", "pending") != "pending":
+            return
+        due = parse_due(task.get("due_date"))
+        due_ord = due.toordinal() if due else NO_DUE
+        self._seq += 1
+        entry = [
+            PRIORITY_RANK.get(task.get("priority", "medium"), 1),
+            due_ord,
+            task.get("created_at") or "",
+            self._seq,
+            key,
+            True,
+        ]
+        self._entries[key] = entry
+        overdue = due_ord < self._today
+        heap = self._overdue if overdue else self._upcoming
+        if heapify:
+            heap.append(entry)
+            if due and not overdue:
+                self._due.append((due_ord, self._seq, entry))
+        else:
+            heapq.heappush(heap, entry)
+            if due and not overdue:
+                heapq.heappush(self._due, (due_ord, self._seq, entry))
+
+    def add(self, key: Hashable, task: Dict) -> None:
+        """Add or replace a task in O(log n).
+
+        Args:
+            key: Identifier of the task
+            task: Task dictionary; non-pending tasks are not queued
+        """
+        self.discard(key)
+        self._insert(key, task)
+
+    def discard(self, key: Hashable) -> None:
+        """Remove a task in O(1) if present.
+
+        Args:
+            key: Identifier of the task
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        entry[_ALIVE] = False
+        self._dead += 1
+        if self._dead > 64 and self._dead > len(self._entries):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop dead entries from the heaps."""
+        self._overdue = [e for e in self._overdue if e[_ALIVE]]
+        self._upcoming = [e for e in self._upcoming if e[_ALIVE]]
+        self._due = [d for d in self._due if d[2][_ALIVE]]
+        heapq.heapify(self._overdue)
+        heapq.heapify(self._upcoming)
+        heapq.heapify(self._due)
+        self._dead = 0
+
+    def _advance(self, today: date) -> None:
+        """Move tasks whose due date has passed into the overdue heap."""
+        self._today = today.toordinal()
+        while self._due and self._due[0][0] < self._today:
+            _, _, entry = heapq.heappop(self._due)
+            if not entry[_ALIVE]:
+                continue
+            entry[_ALIVE] = False
+            self._dead += 1
+            moved = entry[:_ALIVE] + [True]
+            self._entries[entry[4]] = moved
+            heapq.heappush(self._overdue, moved)
+
+    def peek(self, count: int = 1, today: Optional[date] = None) -> List[Hashable]:
+        """Return the keys of the most urgent tasks without removing them.
+
+        Args:
+            count: Maximum number of keys to return
+            today: Date used to decide what is overdue (defaults to today)
+
+        Returns:
+            Up to count keys, most urgent first
+        """
+        self._advance(today or date.today())
+        keys = [entry[4] for entry in _top(self._overdue, count)]
+        if len(keys) < count:
+            keys.extend(entry[4] for entry in _top(self._upcoming, count - len(keys)))
+        return keys
+
+    def is_overdue(self, key: Hashable) -> bool:
+        """Return whether a queued task is overdue as of the last peek.
+
+        Args:
+            key: Identifier of the task
+
+        Returns:
+            True if the task is queued and overdue
+        """
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] < self._today
@@ -0,0 +1,461 @@
+"""Crash-safe storage for the tasks file.
+
+The tasks file stays a plain JSON array, written one task per line so it
+can be checked and diffed record by record. A save never modifies the
+file in place:
+
+1. the new list is written to ``<tasks_file>.tmp`` and fsynced;
+2. the current file, if it was last read intact, is hard-linked to
+   ``<tasks_file>.bak`` as the last good state;
+3. the temporary file is renamed over the tasks file and the directory
+   is fsynced, so after a crash the file is either the old or the new
+   version, never a mix;
+4. ``<tasks_file>.sums`` records the file's signature, a CRC-32 of the
+   whole file and a CRC-32 per record.
+
+Loading checks the whole-file CRC whenever the checksums describe the
+current version (a single pass over bytes already in memory). A file
+that fails the check or does not parse is never replaced by an empty
+list: it is copied aside, the last good state is loaded from the backup
+with a warning, and if there is no usable backup loading fails instead.
+verify() walks a file of any size record by record with bounded memory
+and reports exactly which records are damaged.
+"""
+
+import json
+import os
+import re
+import shutil
+import warnings
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .locking import file_signature, sidecar_path, write_atomic
+
+VERSION = 1
+
+# Read size for verify(), and the largest record it will buffer
+CHUNK = 1 << 16
+MAX_RECORD = 1 << 20
+
+_encoder = json.JSONEncoder()
+# Where the next record (a line starting with "{") or the closing "]" begins
+_BOUNDARY = re.compile(r"\n[ \t]*\{|\n\]")
+_SPACE = " \t\r\n"
+
+
+class CorruptTasksError(ValueError):
+    """The tasks file is damaged and no good copy is available."""
+
+
+class RecoveredTasksWarning(UserWarning):
+    """The tasks file was damaged and the last good copy was loaded instead."""
+
+
+@dataclass
+class Damage:
+    """A damaged record found by verify().
+
+    Attributes:
+        index: 1-based record number
+        line: 1-based line the record starts on
+        reason: What is wrong with it
+    """
+    index: int
+    line: int
+    reason: str
+
+
+@dataclass
+class VerifyReport:
+    """Result of verifying a tasks file.
+
+    Attributes:
+        path: File checked
+        records: Number of records found
+        checksums: "verified" if per-record checksums were checked,
+            "stale" if the file changed since they were written (edited
+            outside todo) or "missing"
+        damaged: Damaged records
+        errors: Problems with the file as a whole
+        backup: Whether a backup of the last good state exists
+    """
+    path: str
+    records: int = 0
+    checksums: str = "missing"
+    damaged: List[Damage] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    backup: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Whether no damage was found."""
+        return not self.damaged and not self.errors
+
+
+def encode_tasks(tasks: List[Dict]) -> Tuple[bytes, List[int]]:
+    """Serialize tasks one per line and checksum each record.
+
+    Args:
+        tasks: Task dictionaries
+
+    Returns:
+        (file contents, CRC-32 of each record's line without its comma)
+    """
+    if not tasks:
+        return b"[]\n", []
+    lines = [_encoder.encode(task) for task in tasks]
+    data = ("[\n" + ",\n".join(lines) + "\n]\n").encode()
+    view = memoryview(data)
+    crcs = []
+    # ensure_ascii output, so character and byte offsets agree
+    start = 2
+    for line in lines:
+        end = start + len(line)
+        crcs.append(zlib.crc32(view[start:end]))
+        start = end + 2
+    return data, crcs
+
+
+def _signature(st: os.stat_result) -> Tuple[int, int, int]:
+    """Return the file_signature of an open file from its fstat result."""
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _fsync_directory(path: str) -> None:
+    """Flush a rename to disk (not possible on Windows, where it is skipped)."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class TaskStore:
+    """Reads and writes a tasks file with checksums, backups and recovery.
+
+    Attributes:
+        path: Path to the tasks file
+        sums_path: Path to the checksums sidecar
+        backup_path: Path to the copy of the last good state
+        verified: Signature of the version last read intact by this store
+    """
+
+    def __init__(self, path: str):
+        """Initialize the store.
+
+        Args:
+            path: Path to the tasks file
+        """
+        self.path = path
+        self.sums_path = sidecar_path(path, "sums")
+        self.backup_path = sidecar_path(path, "bak")
+        self.verified: Optional[Tuple[int, int, int]] = None
+
+    def _header(self) -> Optional[Dict]:
+        """Read the checksums header, or None if there is none."""
+        header, stream = self._open_sums()
+        if stream is not None:
+            stream.close()
+        return header
+
+    def _open_sums(self) -> Tuple[Optional[Dict], Optional[TextIO]]:
+        """Open the checksums file and read its header.
+
+        Returns:
+            (header, stream positioned at the first record checksum), or
+            (None, None) if there is no usable checksums file
+        """
+        try:
+            stream = open(self.sums_path)
+        except OSError:
+            return None, None
+        try:
+            header = json.loads(stream.readline())
+        except (OSError, ValueError):
+            header = None
+        if not isinstance(header, dict) or header.get("version") != VERSION:
+            stream.close()
+            return None, None
+        return header, stream
+
+    def read(self) -> List[Dict]:
+        """Load the tasks, recovering from a damaged file.
+
+        Returns:
+            Task dictionaries (empty if the file does not exist)
+
+        Raises:
+            CorruptTasksError: If the file is damaged and there is no usable backup
+        """
+        try:
+            with open(self.path, "rb") as f:
+                # Fingerprint the version actually read: a writer may rename
+                # a new one into place before its checksums are written
+                signature = _signature(os.fstat(f.fileno()))
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        header = self._header()
+        if header is not None and header.get("signature") == list(signature) \
+                and zlib.crc32(data) != header.get("crc"):
+            return self._recover("checksum mismatch")
+        if not data.strip():
+            # An empty file is a new list unless something was lost (a
+            # truncating writer interrupted), which the backup shows
+            if os.path.exists(self.backup_path):
+                return self._recover("file is empty")
+            self.verified = signature
+            return []
+        try:
+            tasks = json.loads(data)
+        except ValueError as e:
+            return self._recover(str(e))
+        if not isinstance(tasks, list):
+            return self._recover("not a JSON array")
+        # A file edited outside todo has stale checksums but is still good
+        self.verified = signature
+        return tasks
+
+    def _recover(self, reason: str) -> List[Dict]:
+        """Keep the damaged file aside and fall back to the last good state.
+
+        Args:
+            reason: What was wrong with the file
+
+        Returns:
+            Tasks from the backup
+
+        Warns:
+            RecoveredTasksWarning: When the backup is loaded
+
+        Raises:
+            CorruptTasksError: If there is no usable backup
+        """
+        kept = self._preserve()
+        try:
+            with open(self.backup_path, "rb") as f:
+                tasks = json.loads(f.read())
+        except (OSError, ValueError):
+            tasks = None
+        if not isinstance(tasks, list):
+            raise CorruptTasksError(
+                f"{self.path} is damaged ({reason}) and there is no usable backup; "
+                f"the file was left as is. Run `todo verify` to see which records are affected."
+            )
+        warnings.warn(
+            f"{self.path} is damaged ({reason}); loaded the last good copy from "
+            f"{self.backup_path}. The damaged file was kept as {kept}.",
+            RecoveredTasksWarning,
+            stacklevel=2,
+        )
+        return tasks
+
+    def _preserve(self) -> str:
+        """Copy the current file aside once per damaged version.
+
+        Returns:
+            Path of the copy
+        """
+        signature = file_signature(self.path)
+        kept = sidecar_path(self.path, f"corrupt-{signature[0] if signature else 0}")
+        if not os.path.exists(kept):
+            try:
+                shutil.copy2(self.path, kept)
+            except OSError:
+                pass
+        return kept
+
+    def write(self, tasks: List[Dict]) -> None:
+        """Replace the tasks file durably.
+
+        Args:
+            tasks: Task dictionaries to store
+        """
+        data, crcs = encode_tasks(tasks)
+        tmp = sidecar_path(self.path, "tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if self.verified is not None and self.verified == file_signature(self.path):
+                self._backup()
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        _fsync_directory(self.path)
+        signature = file_signature(self.path)
+        self.verified = signature
+        header = {
+            "version": VERSION,
+            "signature": list(signature or ()),
+            "size": len(data),
+            "crc": zlib.crc32(data),
+            "records": len(crcs),
+        }
+        write_atomic(self.sums_path, json.dumps(header) + "\n" + "".join(f"{crc:08x}\n" for crc in crcs))
+
+    def _backup(self) -> None:
+        """Keep the current (intact) file as the last good state.
+
+        A hard link costs nothing; where links are unsupported the file is
+        copied instead.
+        """
+        tmp = sidecar_path(self.backup_path, "tmp")
+        try:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            os.link(self.path, tmp)
+        except (OSError, AttributeError):
+            shutil.copy2(self.path, tmp)
+        os.replace(tmp, self.backup_path)
+
+    def verify(self) -> VerifyReport:
+        """Check the tasks file record by record.
+
+        Works in one streaming pass holding at most one record (plus a read
+        buffer) in memory, so it suits files of any size. Records are
+        checked against their stored checksums when those describe the
+        current file, and are otherwise checked for being valid task
+        objects.
+
+        Returns:
+            The report (a missing file reports no records and no damage)
+        """
+        report = VerifyReport(self.path, backup=os.path.exists(self.backup_path))
+        try:
+            f = open(self.path, encoding="utf-8", errors="replace")
+        except FileNotFoundError:
+            return report
+        signature = _signature(os.fstat(f.fileno()))
+        header, sums = self._open_sums()
+        if header is not None and header.get("signature") != list(signature):
+            report.checksums = "stale"
+            sums.close()  # type: ignore[union-attr]
+            sums = None
+        elif header is not None:
+            report.checksums = "verified"
+        try:
+            with f:
+                for index, line, text, reason in _scan(f, report.errors):
+                    report.records = index
+                    if reason is None and sums is not None:
+                        expected = sums.readline().strip()
+                        if expected != f"{zlib.crc32(text.encode()):08x}":
+                            reason = "checksum mismatch" if expected else "not in the checksums"
+                    elif sums is not None:
+                        sums.readline()
+                    if reason is not None:
+                        report.damaged.append(Damage(index, line, reason))
+            if sums is not None and sums.readline().strip():
+                report.errors.append(f"{header['records'] - report.records} record(s) missing at the end")
+        finally:
+            if sums is not None:
+                sums.close()
+        return report
+
+
+def _scan(stream: TextIO, errors: List[str]) -> Iterator[Tuple[int, int, str, Optional[str]]]:
+    """Split a JSON array of tasks into records without loading it whole.
+
+    Damaged records are skipped by resynchronizing on the next line that
+    starts with "{", which works for the one-per-line layout written by
+    TaskStore as well as for indented files.
+
+    Args:
+        stream: Text stream positioned at the start of the file
+        errors: List that problems with the file as a whole are added to
+
+    Yields:
+        (1-based record number, 1-based start line, record text, reason it is
+        damaged or None)
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    line, line_pos = 1, 0
+
+    def fill() -> None:
+        nonlocal buf, pos, eof, line_pos
+        chunk = stream.read(CHUNK)
+        if not chunk:
+            eof = True
+        buf, line_pos, pos = buf[pos:] + chunk, line_pos - pos, 0
+
+    def advance(to: int) -> None:
+        nonlocal pos, line, line_pos
+        line += buf.count("\n", line_pos, to)
+        pos = line_pos = to
+
+    def skip(chars: str) -> None:
+        while True:
+            end = pos
+            while end < len(buf) and buf[end] in chars:
+                end += 1
+            advance(end)
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    fill()
+    skip(_SPACE)
+    if buf[pos:pos + 1] != "[":
+        errors.append("file does not start with '['")
+    else:
+        advance(pos + 1)
+    index = 0
+    resync = False
+    while True:
+        if resync:
+            # Skip the rest of an oversized record up to the next boundary
+            match = _BOUNDARY.search(buf, pos)
+            while match is None and not eof:
+                advance(len(buf))
+                fill()
+                match = _BOUNDARY.search(buf, pos)
+            advance(match.start() if match else len(buf))
+            resync = False
+        skip(_SPACE + ",")
+        if pos >= len(buf):
+            errors.append("file is truncated (no closing ']')")
+            return
+        if buf[pos] == "]":
+            advance(pos + 1)
+            skip(_SPACE)
+            if pos < len(buf):
+                errors.append(f"unexpected data after the closing ']' on line {line}")
+            return
+        # Buffer up to the start of the next record so a damaged one can be skipped
+        match = _BOUNDARY.search(buf, pos + 1)
+        while match is None and not eof and len(buf) - pos <= MAX_RECORD:
+            fill()
+            match = _BOUNDARY.search(buf, pos + 1)
+        boundary = match.start() if match else len(buf)
+        index += 1
+        start_line = line
+        reason = None
+        try:
+            record, end = decoder.raw_decode(buf, pos)
+            # Records may also share a line, as in a compact one-line array
+            trailer = buf[end:boundary].lstrip(_SPACE)
+            if trailer[:1] not in ("", ",", "]"):
+                reason = "unexpected data after the record"
+            elif not isinstance(record, dict) or not isinstance(record.get("task"), str):
+                reason = "not a task object"
+        except ValueError as e:
+            reason = f"invalid JSON ({e.msg})"
+            end = boundary
+            resync = match is None and not eof
+        text = buf[pos:end]
+        advance(max(end, boundary) if reason is not None else end)
+        yield index, start_line, text, reason
@@ -0,0 +1,590 @@
+"""Two-way sync between task files with per-field last-writer-wins merging.
+
+Every task has a stable ``id``. Fields changed after creation carry their
+own timestamp in the task's ``modified`` map (fields without an entry date
+from ``created_at``), and removed tasks leave a tombstone in the
+``<tasks_file>.tombstones`` sidecar. Change and removal times are stored
+in UTC and compared as instants; ``created_at`` and stamps written before
+that are naive local times and are read in the local timezone, so replicas
+in different timezones still agree on which change came last.
+
+Each side's state (tasks plus tombstones) is summarized by a two-level
+hash tree: entries are hashed individually and XORed into one of BUCKETS
+leaves chosen by id prefix, and the root hashes the leaves. Because XOR is
+order-independent and its own inverse, mutations update the tree in place
+(``<tasks_file>.synctree``) without rehashing the list. A sync first
+compares roots, then leaves, and merges only ids in leaves that differ.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .locking import write_atomic
+
+# Leaves are selected by the first ID_PREFIX hex characters of an id
+ID_PREFIX = 3
+BUCKETS = 16 ** ID_PREFIX
+
+# Tombstones older than this are dropped; replicas must sync more often
+TOMBSTONE_DAYS = 180
+
+VERSION = 1
+
+# Fields that describe a task version rather than being merged themselves
+_META_FIELDS = ("id", "modified")
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class SyncResult:
+    """What a sync changed on each side.
+
+    Attributes:
+        pulled_added: Tasks copied from the other file
+        pulled_updated: Local tasks updated with newer fields from the other file
+        pulled_removed: Local tasks removed because of the other file's tombstones
+        pushed_added: Tasks copied to the other file
+        pushed_updated: Tasks in the other file updated with newer local fields
+        pushed_removed: Tasks removed from the other file because of local tombstones
+        changed_buckets: Hash tree leaves that differed (0 when already in sync)
+    """
+    pulled_added: int = 0
+    pulled_updated: int = 0
+    pulled_removed: int = 0
+    pushed_added: int = 0
+    pushed_updated: int = 0
+    pushed_removed: int = 0
+    changed_buckets: int = 0
+
+    @property
+    def in_sync(self) -> bool:
+        """Whether both sides already matched."""
+        return self.changed_buckets == 0
+
+
+def task_id(task: Dict) -> str:
+    """Return a task's stable id.
+
+    Tasks created before ids existed get one derived from their creation
+    time and description, so every copy of such a task agrees on it.
+
+    Args:
+        task: Task dictionary
+
+    Returns:
+        32-character hex id
+    """
+    if task.get("id"):
+        return task["id"]
+    seed = f"{task.get('created_at', '')}\0{task.get('task', '')}"
+    return hashlib.blake2b(seed.encode(), digest_size=16).hexdigest()
+
+
+def ensure_ids(tasks: Iterable[Dict]) -> bool:
+    """Store derived ids on tasks that lack one.
+
+    Args:
+        tasks: Tasks to update in place
+
+    Returns:
+        True if any task changed
+    """
+    changed = False
+    for task in tasks:
+        if not task.get("id"):
+            task["id"] = task_id(task)
+            changed = True
+    return changed
+
+
+def utc_now() -> str:
+    """Return the current time as a UTC ISO timestamp."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+@lru_cache(maxsize=4096)
+def instant(stamp: str) -> datetime:
+    """Parse an ISO timestamp into an aware datetime for comparison.
+
+    Naive timestamps (``created_at`` and stamps written by older versions)
+    are taken to be local time.
+
+    Args:
+        stamp: ISO timestamp, or "" for none
+
+    Returns:
+        Aware datetime in UTC (the earliest possible one for "")
+    """
+    if not stamp:
+        return _EPOCH
+    return datetime.fromisoformat(stamp).astimezone(timezone.utc)
+
+
+def touch(task: Dict, fields: Sequence[str], when: Optional[str] = None) -> None:
+    """Record that fields of a task changed.
+
+    Args:
+        task: Task to update in place
+        fields: Names of the changed fields
+        when: ISO timestamp of the change (defaults to now, in UTC)
+    """
+    if not fields:
+        return
+    when = when or utc_now()
+    # Copy so shallow copies of the task taken earlier keep their timestamps
+    modified = dict(task.get("modified") or {})
+    for name in fields:
+        modified[name] = when
+    task["modified"] = modified
+
+
+def field_time(task: Dict, name: str) -> str:
+    """Return when a field of a task last changed.
+
+    Args:
+        task: Task dictionary
+        name: Field name
+
+    Returns:
+        ISO timestamp (created_at for fields never changed)
+    """
+    return (task.get("modified") or {}).get(name) or task.get("created_at") or ""
+
+
+def last_modified(task: Dict) -> str:
+    """Return when any field of a task last changed.
+
+    Args:
+        task: Task dictionary
+
+    Returns:
+        ISO timestamp
+    """
+    return max([task.get("created_at") or ""] + list((task.get("modified") or {}).values()), key=instant)
+
+
+def _digest(data: str) -> int:
+    return int.from_bytes(hashlib.blake2b(data.encode(), digest_size=16).digest(), "big")
+
+
+def entry_hash(task: Dict) -> int:
+    """Hash a task's content.
+
+    Args:
+        task: Task dictionary
+
+    Returns:
+        128-bit hash of the canonical JSON form
+    """
+    return _digest(json.dumps(task, sort_keys=True, separators=(",", ":")))
+
+
+def tombstone_hash(tid: str, removed_at: str) -> int:
+    """Hash a tombstone.
+
+    Args:
+        tid: Removed task id
+        removed_at: ISO removal time
+
+    Returns:
+        128-bit hash
+    """
+    return _digest(f"tombstone\0{tid}\0{removed_at}")
+
+
+def bucket_of(tid: str) -> int:
+    """Return the hash tree leaf holding an id.
+
+    Args:
+        tid: Task id
+
+    Returns:
+        Leaf index
+    """
+    try:
+        return int(tid[:ID_PREFIX], 16)
+    except ValueError:
+        return _digest(tid) % BUCKETS
+
+
+class SyncTree:
+    """XOR hash tree over tasks and tombstones.
+
+    Attributes:
+        leaves: One 128-bit hash per bucket
+    """
+
+    def __init__(self, leaves: Optional[List[int]] = None):
+        """Initialize a tree.
+
+        Args:
+            leaves: Existing leaf hashes (defaults to an empty tree)
+        """
+        self.leaves = leaves if leaves is not None else [0] * BUCKETS
+
+    @classmethod
+    def from_state(cls, tasks: Iterable[Dict], tombstones: Dict[str, str]) -> "SyncTree":
+        """Build a tree from scratch.
+
+        Args:
+            tasks: Tasks
+            tombstones: Removal time keyed by task id
+
+        Returns:
+            The tree
+        """
+        tree = cls()
+        for task in tasks:
+            tree.toggle(task_id(task), entry_hash(task))
+        for tid, removed_at in tombstones.items():
+            tree.toggle(tid, tombstone_hash(tid, removed_at))
+        return tree
+
+    def toggle(self, tid: str, value: int) -> None:
+        """Add an entry hash to the tree, or remove it if already present.
+
+        Args:
+            tid: Task id choosing the leaf
+            value: Entry hash
+        """
+        self.leaves[bucket_of(tid)] ^= value
+
+    def root(self) -> str:
+        """Return the root hash.
+
+        Returns:
+            Hex digest of all leaves
+        """
+        data = b"".join(leaf.to_bytes(16, "big") for leaf in self.leaves)
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def differing(self, other: "SyncTree") -> List[int]:
+        """Return the leaves that differ from another tree.
+
+        Args:
+            other: Tree to compare with
+
+        Returns:
+            Leaf indices
+        """
+        return [i for i, (a, b) in enumerate(zip(self.leaves, other.leaves)) if a != b]
+
+
+class SyncTreeStore:
+    """Hash tree persisted in a sidecar file.
+
+    Attributes:
+        path: Path to the tree file
+    """
+
+    def __init__(self, path: str):
+        """Initialize the store.
+
+        Args:
+            path: Path to the tree file
+        """
+        self.path = path
+
+    def load(self, signature: Optional[Tuple[int, ...]]) -> Optional[SyncTree]:
+        """Read the stored tree if it matches a tasks file version.
+
+        Args:
+            signature: Current file_signature of the tasks file
+
+        Returns:
+            The tree, or None if missing, unreadable or stale
+        """
+        if signature is None:
+            return None
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get("version") != VERSION or data.get("signature") != list(signature):
+                return None
+            leaves = [int(leaf, 16) for leaf in data["leaves"]]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        return SyncTree(leaves) if len(leaves) == BUCKETS else None
+
+    def save(self, tree: SyncTree, signature: Optional[Tuple[int, ...]]) -> None:
+        """Write a tree along with the tasks file signature it matches.
+
+        Args:
+            tree: Tree to store
+            signature: file_signature of the tasks file
+        """
+        data = {
+            "version": VERSION,
+            "signature": list(signature) if signature else None,
+            "leaves": [format(leaf, "x") for leaf in tree.leaves],
+        }
+        write_atomic(self.path, json.dumps(data, separators=(",", ":")))
+
+    def apply(
+        self,
+        before: Optional[Tuple[int, ...]],
+        after: Optional[Tuple[int, ...]],
+        toggles: Iterable[Tuple[str, int]]
+    ) -> None:
+        """Apply a saved mutation to the stored tree, if it was current.
+
+        Args:
+            before: Tasks file signature before the mutation
+            after: Tasks file signature after the mutation was saved
+            toggles: (task id, entry hash) pairs for entries added or removed
+        """
+        tree = self.load(before)
+        if tree is None:
+            return
+        for tid, value in toggles:
+            tree.toggle(tid, value)
+        self.save(tree, after)
+
+
+class TombstoneStore:
+    """Removal times of deleted tasks, persisted in a sidecar file.
+
+    Attributes:
+        path: Path to the tombstones file
+    """
+
+    def __init__(self, path: str):
+        """Initialize the store.
+
+        Args:
+            path: Path to the tombstones file
+        """
+        self.path = path
+
+    def load(self) -> Dict[str, str]:
+        """Read the tombstones.
+
+        A file that exists but cannot be read is an error rather than no
+        tombstones, so that removed tasks are not brought back by a sync and
+        the next save does not discard the rest.
+
+        Returns:
+            Removal time keyed by task id (empty if the file is missing)
+
+        Raises:
+            ValueError: If the file is not a JSON object of removal times
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            raise ValueError(f"Tombstones file {self.path} is damaged: {e}") from e
+        if not isinstance(data, dict):
+            raise ValueError(f"Tombstones file {self.path} is damaged: expected an object")
+        return data
+
+    def save(self, tombstones: Dict[str, str]) -> None:
+        """Write tombstones.
+
+        Args:
+            tombstones: Removal time keyed by task id
+        """
+        write_atomic(self.path, json.dumps(tombstones, separators=(",", ":")))
+
+    def add(self, entries: Dict[str, str]) -> Dict[str, str]:
+        """Record removed tasks.
+
+        Args:
+            entries: Removal time keyed by task id
+
+        Returns:
+            Tombstones that were replaced, keyed by task id
+        """
+        if not entries:
+            return {}
+        tombstones = self.load()
+        replaced = {tid: tombstones[tid] for tid in entries if tid in tombstones}
+        tombstones.update(entries)
+        self.save(tombstones)
+        return replaced
+
+    def discard(self, ids: Iterable[str]) -> None:
+        """Forget tombstones, e.g. for tasks that were restored.
+
+        Args:
+            ids: Task ids
+        """
+        tombstones = self.load()
+        if any([tombstones.pop(tid, None) is not None for tid in ids]):
+            self.save(tombstones)
+
+
+def tombstones_for(tasks: Iterable[Dict], when: Optional[str] = None) -> Dict[str, str]:
+    """Build tombstones for removed tasks.
+
+    Args:
+        tasks: Removed tasks
+        when: ISO removal time (defaults to now)
+
+    Returns:
+        Removal time keyed by task id
+    """
+    when = when or utc_now()
+    return {task_id(task): when for task in tasks}
+
+
+def prune(tombstones: Dict[str, str], now: Optional[datetime] = None) -> Dict[str, str]:
+    """Drop tombstones older than TOMBSTONE_DAYS.
+
+    Args:
+        tombstones: Removal time keyed by task id (updated in place)
+        now: Current time (defaults to now; naive values are local time)
+
+    Returns:
+        The dropped tombstones
+    """
+    cutoff = (now or datetime.now()).astimezone(timezone.utc) - timedelta(days=TOMBSTONE_DAYS)
+    expired = {tid: ts for tid, ts in tombstones.items() if instant(ts) < cutoff}
+    for tid in expired:
+        del tombstones[tid]
+    return expired
+
+
+def _value_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+def merge_task(a: Dict, b: Dict) -> Dict:
+    """Merge two versions of a task field by field.
+
+    For each field the version changed at the later instant wins. Equal
+    timestamps with different values are broken by comparing the values,
+    so both sides pick the same result.
+
+    Args:
+        a: One version
+        b: The other version
+
+    Returns:
+        Merged task (a new dictionary)
+    """
+    merged: Dict[str, Any] = {"id": task_id(a)}
+    modified: Dict[str, str] = {}
+    names = [n for n in dict.fromkeys(list(a) + list(b)) if n not in _META_FIELDS]
+    for name in names:
+        time_a, time_b = instant(field_time(a, name)), instant(field_time(b, name))
+        if name not in b:
+            winner = a
+        elif name not in a:
+            winner = b
+        elif time_a != time_b:
+            winner = a if time_a > time_b else b
+        else:
+            winner = a if _value_key(a[name]) >= _value_key(b[name]) else b
+        merged[name] = winner[name]
+        stamp = (winner.get("modified") or {}).get(name)
+        if stamp:
+            modified[name] = stamp
+    if modified:
+        merged["modified"] = modified
+    return merged
+
+
+@dataclass
+class Replica:
+    """One side's state during a sync.
+
+    Attributes:
+        tasks: Tasks in file order
+        tombstones: Removal time keyed by task id
+        tree: Hash tree over tasks and tombstones
+        changed: Whether anything needs to be written back
+    """
+    tasks: List[Dict]
+    tombstones: Dict[str, str]
+    tree: SyncTree
+    changed: bool = False
+
+
+def merge(local: Replica, remote: Replica, result: SyncResult) -> None:
+    """Merge two replicas in place.
+
+    Only ids in differing tree leaves are examined. Each side keeps its
+    own task order; tasks new to a side are appended.
+
+    Args:
+        local: Local replica (updated in place)
+        remote: Other replica (updated in place)
+        result: Counters to fill in
+    """
+    buckets = set(local.tree.differing(remote.tree))
+    result.changed_buckets = len(buckets)
+    if not buckets:
+        return
+
+    def index(side: Replica) -> Dict[str, int]:
+        return {task_id(t): i for i, t in enumerate(side.tasks) if bucket_of(task_id(t)) in buckets}
+
+    local_index, remote_index = index(local), index(remote)
+    # Visit ids in file order so tasks copied across keep their relative order
+    ids = list(dict.fromkeys(
+        sorted(local_index, key=local_index.__getitem__)
+        + sorted(remote_index, key=remote_index.__getitem__)
+        + sorted(tid for side in (local, remote) for tid in side.tombstones if bucket_of(tid) in buckets)
+    ))
+
+    removals: Dict[int, List[int]] = {0: [], 1: []}
+    for tid in ids:
+        mine = local.tasks[local_index[tid]] if tid in local_index else None
+        theirs = remote.tasks[remote_index[tid]] if tid in remote_index else None
+        removed_at = max(local.tombstones.get(tid, ""), remote.tombstones.get(tid, ""), key=instant)
+
+        if mine is not None and theirs is not None:
+            merged = merge_task(mine, theirs)
+        else:
+            merged = mine if mine is not None else theirs
+
+        if merged is not None and removed_at and instant(removed_at) >= instant(last_modified(merged)):
+            merged = None
+        elif merged is not None:
+            removed_at = ""
+
+        for n, (side, current, position, stats) in enumerate((
+            (local, mine, local_index.get(tid), ("pulled_added", "pulled_updated", "pulled_removed")),
+            (remote, theirs, remote_index.get(tid), ("pushed_added", "pushed_updated", "pushed_removed")),
+        )):
+            old_tomb = side.tombstones.get(tid)
+            if removed_at and old_tomb != removed_at:
+                if old_tomb:
+                    side.tree.toggle(tid, tombstone_hash(tid, old_tomb))
+                side.tombstones[tid] = removed_at
+                side.tree.toggle(tid, tombstone_hash(tid, removed_at))
+                side.changed = True
+            elif not removed_at and old_tomb:
+                del side.tombstones[tid]
+                side.tree.toggle(tid, tombstone_hash(tid, old_tomb))
+                side.changed = True
+
+            if merged is None:
+                if current is not None:
+                    removals[n].append(position)
+                    side.tree.toggle(tid, entry_hash(current))
+                    setattr(result, stats[2], getattr(result, stats[2]) + 1)
+                    side.changed = True
+            elif current is None:
+                side.tasks.append(dict(merged))
+                side.tree.toggle(tid, entry_hash(merged))
+                setattr(result, stats[0], getattr(result, stats[0]) + 1)
+                side.changed = True
+            elif entry_hash(current) != entry_hash(merged):
+                side.tree.toggle(tid, entry_hash(current))
+                side.tasks[position] = dict(merged)
+                side.tree.toggle(tid, entry_hash(merged))
+                setattr(result, stats[1], getattr(result, stats[1]) + 1)
+                side.changed = True
+
+    for n, side in ((0, local), (1, remote)):
+        for position in sorted(removals[n], reverse=True):
+            del side.tasks[position]
@@ -0,0 +1,226 @@
+"""Change detection and incremental redraw for ``todo watch``.
+
+FileWatcher blocks until the tasks file's signature (mtime, size, inode)
+changes. On Linux it sleeps on inotify events for the file's directory, so
+a change wakes it immediately and an idle list costs nothing; elsewhere,
+or if inotify is unavailable, it polls os.stat at a fixed interval. Either
+way the signature is the source of truth, so the file is only reloaded
+when it really changed.
+
+LiveScreen keeps the lines currently on the terminal and, given a new
+view, rewrites only the rows that differ using cursor-positioning escape
+sequences, so an update touching one task redraws a few lines instead of
+the whole screen.
+"""
+
+import os
+import select
+import shutil
+import struct
+import time
+from typing import List, Optional, TextIO, Tuple
+
+from .locking import file_signature
+
+DEFAULT_INTERVAL = 1.0
+
+# inotify event masks (see inotify(7))
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal inotify binding for one directory (Linux only)."""
+
+    def __init__(self, directory: str):
+        # Imported here so that other commands do not pay for loading ctypes
+        import ctypes
+        import ctypes.util
+
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify not supported")
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def wait(self, timeout: Optional[float]) -> None:
+        """Block until an event arrives or the timeout passes, then drain events."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if ready:
+            try:
+                while os.read(self.fd, 64 * _EVENT.size):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Waits for a file to change.
+
+    Attributes:
+        path: File to watch
+        interval: Seconds between checks when polling
+        signature: Signature of the version last reported
+    """
+
+    def __init__(self, path: str, interval: float = DEFAULT_INTERVAL, use_inotify: bool = True):
+        """Start watching a file.
+
+        Args:
+            path: File to watch (need not exist yet)
+            interval: Seconds between checks when polling
+            use_inotify: Use inotify where available instead of polling
+        """
+        self.path = path
+        self.interval = interval
+        self.signature = file_signature(path)
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify(os.path.dirname(os.path.abspath(path)))
+            except (OSError, AttributeError):
+                self._inotify = None
+
+    @property
+    def mode(self) -> str:
+        """How changes are detected: "inotify" or "poll"."""
+        return "inotify" if self._inotify is not None else "poll"
+
+    def changed(self) -> bool:
+        """Check once whether the file changed since it was last reported.
+
+        Returns:
+            True if it did (the new version becomes the reported one)
+        """
+        current = file_signature(self.path)
+        if current == self.signature:
+            return False
+        self.signature = current
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the file changes.
+
+        Args:
+            timeout: Give up after this many seconds (None waits forever)
+
+        Returns:
+            True if the file changed, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.changed():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            if self._inotify is not None:
+                # Events for other files in the directory just cause a cheap re-check
+                self._inotify.wait(remaining)
+            else:
+                time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+        return True
+
+    def close(self) -> None:
+        """Release the inotify descriptor, if any."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+def diff_lines(old: List[str], new: List[str]) -> Tuple[List[int], bool]:
+    """Compare two screens line by line.
+
+    Args:
+        old: Lines currently shown
+        new: Lines to show
+
+    Returns:
+        (0-based rows to rewrite, whether rows past the new end must be cleared)
+    """
+    rows = [i for i, line in enumerate(new) if i >= len(old) or old[i] != line]
+    return rows, len(new) < len(old)
+
+
+class LiveScreen:
+    """A terminal region redrawn in place.
+
+    Attributes:
+        stream: Terminal to write to
+        lines: Lines currently shown
+    """
+
+    def __init__(self, stream: TextIO):
+        """Initialize an empty screen.
+
+        Args:
+            stream: Terminal to write to
+        """
+        self.stream = stream
+        self.lines: Optional[List[str]] = None
+
+    def height(self) -> int:
+        """Return the number of usable terminal rows."""
+        return max(shutil.get_terminal_size().lines, 2)
+
+    def fit(self, lines: List[str]) -> List[str]:
+        """Truncate a view to the terminal height.
+
+        Args:
+            lines: Full view
+
+        Returns:
+            Lines that fit, ending with a note if some were cut
+        """
+        height = self.height()
+        if len(lines) <= height:
+            return lines
+        return lines[:height - 1] + [f"... {len(lines) - height + 1} more line(s)"]
+
+    def update(self, lines: List[str]) -> int:
+        """Show a new view, rewriting only the rows that changed.
+
+        Args:
+            lines: Lines to show
+
+        Returns:
+            Number of rows written
+        """
+        lines = self.fit(lines)
+        out = []
+        if self.lines is None:
+            # First frame: clear the screen and hide the cursor
+            out.append("\x1b[?25l\x1b[H\x1b[2J")
+            rows, clear_tail = list(range(len(lines))), False
+        else:
+            rows, clear_tail = diff_lines(self.lines, lines)
+        for row in rows:
+            out.append(f"\x1b[{row + 1};1H{lines[row]}\x1b[K")
+        if clear_tail:
+            out.append(f"\x1b[{len(lines) + 1};1H\x1b[J")
+        if out:
+            self.stream.write("".join(out))
+            self.stream.flush()
+        self.lines = lines
+        return len(rows)
+
+    def close(self) -> None:
+        """Move below the view and show the cursor again."""
+        if self.lines is not None:
+            self.stream.write(f"\x1b[{len(self.lines) + 1};1H\x1b[?25h")
+            self.stream.flush()
@@ -0,0 +1,185 @@
+"""Unit tests for the asyncio TodoList interface."""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist.aio import AsyncTodoList
+from todolist.core import TodoList
+
+
+class TestAsyncTodoList(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncTodoList."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks_file = os.path.join(self.tmpdir.name, "tasks.json")
+        self.todo = AsyncTodoList(self.tasks_file, flush_delay=0.01)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    async def test_add_returns_task(self):
+        """Test that add_task returns the created task instead of printing."""
+        task = await self.todo.add_task("Async task", priority="high", tags=["work"])
+
+        self.assertEqual(task["task"], "Async task")
+        self.assertEqual(task["priority"], "high")
+        self.assertEqual(task["tags"], ["work"])
+        await self.todo.aclose()
+
+    async def test_mutations_persist_after_close(self):
+        """Test that pending mutations are flushed on close."""
+        await self.todo.add_task("Task 1")
+        await self.todo.add_task("Task 2")
+        await self.todo.complete_task(1)
+        await self.todo.aclose()
+
+        tasks = TodoList(self.tasks_file).load_tasks()
+        self.assertEqual([t["task"] for t in tasks], ["Task 1", "Task 2"])
+        self.assertEqual(tasks[0]["status"], "completed")
+
+    async def test_concurrent_adds_coalesce_into_one_write(self):
+        """Test that a burst of concurrent mutations is written once."""
+        with mock.patch.object(self.todo._store, "save_tasks",
+                               wraps=self.todo._store.save_tasks) as save:
+            await asyncio.gather(*(self.todo.add_task(f"Task {i}") for i in range(50)))
+            await asyncio.sleep(0.05)
+            await self.todo.aclose()
+
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(len(TodoList(self.tasks_file).load_tasks()), 50)
+
+    async def test_loads_file_once(self):
+        """Test that concurrent readers share a single load."""
+        TodoList(self.tasks_file).save_tasks([{"task": "Existing", "status": "pending"}])
+        with mock.patch.object(self.todo._store, "load_tasks",
+                               wraps=self.todo._store.load_tasks) as load:
+            results = await asyncio.gather(*(self.todo.list_tasks() for _ in range(10)))
+
+        self.assertEqual(load.call_count, 1)
+        self.assertTrue(all(len(r) == 1 for r in results))
+
+    async def test_list_and_search_return_indices(self):
+        """Test filtering and searching return (index, task) pairs."""
+        await self.todo.add_task("Buy milk", priority="low")
+        await self.todo.add_task("Write report", priority="high")
+        await self.todo.add_task("Buy bread", priority="high")
+
+        high = await self.todo.list_tasks(priority="high")
+        self.assertEqual([i for i, _ in high], [2, 3])
+
+        found = await self.todo.search_tasks("buy")
+        self.assertEqual([t["task"] for _, t in found], ["Buy milk", "Buy bread"])
+        await self.todo.aclose()
+
+    async def test_returned_tasks_are_copies(self):
+        """Test that modifying returned tasks does not change shared state."""
+        await self.todo.add_task("Original")
+        (_, task), = await self.todo.list_tasks()
+        task["task"] = "Changed"
+
+        (_, again), = await self.todo.list_tasks()
+        self.assertEqual(again["task"], "Original")
+        await self.todo.aclose()
+
+    async def test_flush_keeps_changes_from_other_writers(self):
+        """Test that a flush replays its changes onto a file changed since loading."""
+        TodoList(self.tasks_file).add_task("Shared")
+        await self.todo.complete_task(1)
+        await self.todo.add_task("From async")
+        other = TodoList(self.tasks_file)
+        other.add_task("From other")
+        other.move_task(1, 2)
+        await self.todo.aclose()
+
+        tasks = TodoList(self.tasks_file).load_tasks()
+        self.assertEqual([t["task"] for t in tasks], ["Shared", "From async", "From other"])
+        self.assertEqual(tasks[0]["status"], "completed")
+        self.assertEqual(tasks[0]["parent"], tasks[2]["id"])
+        self.assertEqual(len(await self.todo.list_tasks()), 3)
+
+    async def test_scans_run_in_executor(self):
+        """Test that reports and fuzzy searches do not run on the event loop."""
+        await self.todo.add_task("Write report", tags=["work"])
+        with mock.patch.object(self.todo, "_run", wraps=self.todo._run) as run:
+            await self.todo.report("day")
+            found = await self.todo.fuzzy_search("reprot")
+
+        self.assertEqual([t["task"] for _, t, _ in found], ["Write report"])
+        self.assertEqual(run.call_count, 3)
+        await self.todo.aclose()
+
+    async def test_file_operations_see_pending_mutations(self):
+        """Test that sidecar-backed operations flush first and reload after writing."""
+        await self.todo.add_task("Parent")
+        await self.todo.add_task("Child")
+
+        moved = await self.todo.move_task(2, 1)
+        rows = await self.todo.tree()
+
+        self.assertIsNotNone(moved["parent"])
+        self.assertEqual([(r.task["task"], r.depth) for r in rows], [("Parent", 0), ("Child", 1)])
+        self.assertEqual((await self.todo.undo()).op, "move")
+        (_, child), = await self.todo.search_tasks("Child")
+        self.assertIsNone(child.get("parent"))
+        self.assertEqual([r.op for r in await self.todo.revisions()], ["add", "add", "move"])
+        self.assertTrue((await self.todo.verify()).ok)
+        await self.todo.aclose()
+
+    async def test_recurring_and_agenda(self):
+        """Test recurring templates and the agenda through the async API."""
+        await self.todo.add_recurring("Water plants", "daily", "medium", None, date(2026, 10, 1))
+        await self.todo.complete_occurrence(1, date(2026, 10, 1))
+
+        items = await self.todo.agenda(date(2026, 10, 1), 2)
+
+        self.assertEqual([i.task["status"] for i in items], ["completed", "pending"])
+        self.assertEqual(len(await self.todo.list_tasks()), 1)
+        await self.todo.aclose()
+
+    async def test_invalid_index_returns_none(self):
+        """Test that invalid indices return None."""
+        self.assertIsNone(await self.todo.remove_task(3))
+        self.assertIsNone(await self.todo.complete_task(0))
+
+    async def test_statistics_and_tags(self):
+        """Test statistics and tag counts are returned as data."""
+        await self.todo.add_task("A", priority="high", tags=["work"])
+        await self.todo.add_task("B", tags=["work", "home"])
+        await self.todo.complete_task(2)
+
+        stats = await self.todo.get_statistics()
+        self.assertEqual(stats.total, 2)
+        self.assertEqual(stats.completed, 1)
+        self.assertEqual(stats.pending_by_priority["high"], 1)
+        self.assertEqual(await self.todo.list_tags(), {"work": 2, "home": 1})
+
+        self.assertEqual(await self.todo.clear_completed(), 1)
+        await self.todo.aclose()
+        self.assertEqual(len(TodoList(self.tasks_file).load_tasks()), 1)
+
+    async def test_export(self):
+        """Test exporting runs without printing and writes the file."""
+        await self.todo.add_task("Exported")
+        out = self.tasks_file + ".export.json"
+        try:
+            self.assertEqual(await self.todo.export_tasks("json", out), 1)
+            with open(out) as f:
+                self.assertEqual(json.load(f)[0]["task"], "Exported")
+        finally:
+            os.unlink(out)
+        await self.todo.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Unit tests for the benchmark data generator and regression check."""
+
+import os
+import tempfile
+import unittest
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from benchmarks.datagen import generate_tasks, write_dataset
+from benchmarks.run import compare
+from todolist.core import TodoList
+
+
+class TestDatagen(unittest.TestCase):
+    """Test cases for the synthetic task generator."""
+
+    def test_deterministic(self):
+        """Test that the same seed produces the same tasks."""
+        self.assertEqual(list(generate_tasks(200, seed=7)), list(generate_tasks(200, seed=7)))
+        self.assertNotEqual(list(generate_tasks(200, seed=7)), list(generate_tasks(200, seed=8)))
+
+    def test_parameters(self):
+        """Test tag cardinality, completion ratio and due-date options."""
+        tasks = list(generate_tasks(2000, tag_cardinality=5, completion_ratio=0.5, due_spread_days=0))
+        tags = {tag for t in tasks for tag in t["tags"]}
+        completed = sum(t["status"] == "completed" for t in tasks)
+
+        self.assertLessEqual(len(tags), 5)
+        self.assertTrue(800 < completed < 1200)
+        self.assertTrue(all(t["due_date"] is None for t in tasks))
+        self.assertTrue(all(t["completed_at"] for t in tasks if t["status"] == "completed"))
+
+    def test_dataset_is_loadable(self):
+        """Test that written datasets load through TodoList."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tasks.json")
+            write_dataset(path, 50)
+            self.assertEqual(len(TodoList(path).load_tasks()), 50)
+
+
+class TestCompare(unittest.TestCase):
+    """Test cases for baseline comparison."""
+
+    baseline = {"1000": {"list": {"cold": 0.050, "warm": 0.010, "peak_rss_kb": 20000}}}
+
+    def test_regression_detected(self):
+        """Test that a slowdown beyond the threshold is reported."""
+        results = {"1000": {"list": {"warm": 0.020, "peak_rss_kb": 20000}}}
+
+        regressions = compare(results, self.baseline, 0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("list @ 1000: warm", regressions[0])
+
+    def test_cold_regression_detected(self):
+        """Test that a slower start-up is reported even if warm runs are unchanged."""
+        results = {"1000": {"list": {"cold": 0.150, "warm": 0.010, "peak_rss_kb": 20000}}}
+
+        regressions = compare(results, self.baseline, 0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("list @ 1000: cold", regressions[0])
+
+    def test_within_threshold_or_noise(self):
+        """Test that small or noise-level changes pass."""
+        results = {"1000": {"list": {"cold": 0.055, "warm": 0.0115, "peak_rss_kb": 21000}}}
+
+        self.assertEqual(compare(results, self.baseline, 0.25), [])
+
+    def test_missing_baseline_entry_reported(self):
+        """Test that cases without a baseline are not silently skipped."""
+        results = {"5000": {"list": {"warm": 1.0, "peak_rss_kb": 1}}, "1000": {"tree": {"warm": 1.0}}}
+
+        self.assertEqual(compare(results, self.baseline, 0.25), ["list @ 5000: no baseline", "tree @ 1000: no baseline"])
+
+    def test_bytes_written_gated(self):
+        """Test that writing more, or writing at all, beyond the floor is reported."""
+        baseline = {"1000": {"add": {"bytes_written": 275000}, "list": {"bytes_written": 0}}}
+        results = {"1000": {"add": {"bytes_written": 469000}, "list": {"bytes_written": 8192}}}
+
+        regressions = compare(results, baseline, 0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertIn("add @ 1000: bytes_written", regressions[0])
+        self.assertIn("(new)", regressions[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
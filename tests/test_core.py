@@ -9,7 +9,7 @@ from datetime import datetime
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from todolist.core import TodoList
+from todolist.core import TaskStatistics, TodoList
 
 
 class TestTodoList(unittest.TestCase):
@@ -17,16 +17,13 @@ class TestTodoList(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        # Create a temporary file for testing
-        self.temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-        self.temp_file.close()
-        self.todo_list = TodoList(self.temp_file.name)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks_file = os.path.join(self.tmpdir.name, "tasks.json")
+        self.todo_list = TodoList(self.tasks_file)
 
     def tearDown(self):
         """Clean up test fixtures."""
-        # Remove the temporary file
-        if os.path.exists(self.temp_file.name):
-            os.unlink(self.temp_file.name)
+        self.tmpdir.cleanup()
 
     def test_add_task_default_priority(self):
         """Test adding a task with default priority."""
@@ -138,7 +135,7 @@ class TestTodoList(unittest.TestCase):
         self.todo_list.add_task("Persistent task")
 
         # Create a new TodoList instance with the same file
-        new_todo_list = TodoList(self.temp_file.name)
+        new_todo_list = TodoList(self.tasks_file)
         tasks = new_todo_list.load_tasks()
 
         self.assertEqual(len(tasks), 1)
@@ -163,15 +160,32 @@ class TestTodoList(unittest.TestCase):
         self.assertIsInstance(task["priority"], str)
         self.assertIsInstance(task["created_at"], str)
 
+    def test_concurrent_adds_are_not_lost(self):
+        """Test that the file lock serializes concurrent read-modify-write cycles."""
+        import threading
+
+        def worker(n):
+            todo = TodoList(self.tasks_file)
+            for i in range(10):
+                todo.add_task(f"Worker {n} task {i}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(self.todo_list.load_tasks()), 40)
+
 
 class TestTodoListOutput(unittest.TestCase):
     """Test cases for TodoList output methods (list, search)."""
 
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-        self.temp_file.close()
-        self.todo_list = TodoList(self.temp_file.name)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks_file = os.path.join(self.tmpdir.name, "tasks.json")
+        self.todo_list = TodoList(self.tasks_file)
 
         # Add some test tasks
         self.todo_list.add_task("Buy groceries", priority="high")
@@ -181,8 +195,7 @@ class TestTodoListOutput(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test fixtures."""
-        if os.path.exists(self.temp_file.name):
-            os.unlink(self.temp_file.name)
+        self.tmpdir.cleanup()
 
     def test_list_all_tasks(self):
         """Test listing all tasks (should not crash)."""
@@ -218,5 +231,102 @@ class TestTodoListOutput(unittest.TestCase):
             self.fail(f"search_tasks() raised {e}")
 
 
+class TestTodoListData(unittest.TestCase):
+    """Test cases for the data returned by TodoList methods."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks_file = os.path.join(self.tmpdir.name, "tasks.json")
+        self.todo_list = TodoList(self.tasks_file)
+
+        self.todo_list.add_task("Buy groceries", priority="high", tags=["home"])
+        self.todo_list.add_task("Read book", priority="low", tags=["home", "fun"])
+        self.todo_list.add_task("Write code", priority="high", tags=["work"])
+        self.todo_list.complete_task(2)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    def test_add_returns_task(self):
+        """Test that add_task returns the stored task."""
+        task = self.todo_list.add_task("New task", tags=["x"])
+
+        self.assertEqual(task["task"], "New task")
+        self.assertEqual(task["tags"], ["x"])
+        self.assertEqual(self.todo_list.load_tasks()[-1], task)
+
+    def test_list_is_lazy_generator(self):
+        """Test that list_tasks yields results without loading up front."""
+        results = self.todo_list.list_tasks(priority="high")
+        os.unlink(self.tasks_file)
+
+        # The file is only read once iteration starts
+        self.assertEqual(list(results), [])
+
+    def test_list_yields_original_indices(self):
+        """Test that filtered results keep their position in the list."""
+        results = list(self.todo_list.list_tasks(priority="high"))
+
+        self.assertEqual([i for i, _ in results], [1, 3])
+        self.assertEqual(results[1][1]["task"], "Write code")
+
+    def test_list_filters_combine(self):
+        """Test that status and tag filters combine."""
+        results = list(self.todo_list.list_tasks(status="pending", tags=["home"]))
+
+        self.assertEqual([t["task"] for _, t in results], ["Buy groceries"])
+
+    def test_search_returns_matches(self):
+        """Test that search_tasks yields matching tasks."""
+        results = list(self.todo_list.search_tasks("BOOK"))
+
+        self.assertEqual(results, [(2, self.todo_list.load_tasks()[1])])
+
+    def test_complete_and_remove_return_task(self):
+        """Test that mutations return the affected task or None."""
+        self.assertEqual(self.todo_list.complete_task(1)["status"], "completed")
+        self.assertEqual(self.todo_list.remove_task(3)["task"], "Write code")
+        self.assertIsNone(self.todo_list.remove_task(10))
+        self.assertIsNone(self.todo_list.complete_task(0))
+
+    def test_clear_returns_count(self):
+        """Test that clear_completed returns the number removed."""
+        self.assertEqual(self.todo_list.clear_completed(), 1)
+        self.assertEqual(self.todo_list.clear_completed(), 0)
+
+    def test_list_tags_returns_counts(self):
+        """Test that list_tags returns tag counts."""
+        self.assertEqual(self.todo_list.list_tags(), {"home": 2, "fun": 1, "work": 1})
+
+    def test_statistics_dataclass(self):
+        """Test that get_statistics returns a TaskStatistics."""
+        stats = self.todo_list.get_statistics()
+
+        self.assertIsInstance(stats, TaskStatistics)
+        self.assertEqual(stats.total, 3)
+        self.assertEqual(stats.completed, 1)
+        self.assertEqual(stats.pending, 2)
+        self.assertEqual(stats.pending_by_priority, {"high": 2, "medium": 0, "low": 0})
+        self.assertAlmostEqual(stats.completion_pct, 100 / 3)
+        self.assertEqual(stats.top_tags(1), [("home", 2)])
+
+    def test_export_returns_count(self):
+        """Test that export_tasks writes the file and returns the count."""
+        out = self.tasks_file + ".md"
+        try:
+            self.assertEqual(self.todo_list.export_tasks("markdown", out), 3)
+            with open(out) as f:
+                self.assertIn("- [x] ~~Read book~~ [LOW]", f.read())
+        finally:
+            os.unlink(out)
+
+    def test_export_unknown_format(self):
+        """Test that an unknown export format raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.todo_list.export_tasks("xml", self.tasks_file + ".xml")
+
+
 if __name__ == "__main__":
     unittest.main()
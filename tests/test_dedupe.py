@@ -0,0 +1,200 @@
+"""Unit tests for near-duplicate detection."""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import dedupe
+from todolist.__main__ import main
+from todolist.aio import AsyncTodoList
+from todolist.core import TodoList
+
+
+class TestMinHash(unittest.TestCase):
+    """Test cases for shingling, signatures and LSH clustering."""
+
+    def test_shingles_ignore_case_punctuation_and_stopwords(self):
+        """Test that trivially different descriptions share all shingles."""
+        self.assertEqual(dedupe.shingles("Fix login bug"), dedupe.shingles("fix the login-bug!"))
+        self.assertIn("#work", dedupe.shingles("x", ["Work"]))
+
+    def test_similarity_estimates_jaccard(self):
+        """Test that signature agreement tracks set overlap."""
+        same = dedupe.similarity(dedupe.signature("Fix login bug"), dedupe.signature("fix the login bug"))
+        close = dedupe.similarity(dedupe.signature("Fix login bug"), dedupe.signature("Fix login bugs"))
+        far = dedupe.similarity(dedupe.signature("Fix login bug"), dedupe.signature("Water the plants"))
+
+        self.assertEqual(same, 1.0)
+        self.assertGreater(close, 0.7)
+        self.assertLess(far, 0.3)
+
+    def test_signature_is_stable(self):
+        """Test that signatures do not depend on the process or platform."""
+        self.assertEqual(dedupe.signature("Fix login bug", ["auth"]).hex()[:16], "023816a300721bbd")
+        self.assertEqual(len(dedupe.signature("")), dedupe.ENTRY_SIZE)
+
+    def test_find_clusters(self):
+        """Test that near-duplicates group together and others stay apart."""
+        tasks = [
+            {"task": "Fix login bug"},
+            {"task": "Write quarterly report"},
+            {"task": "fix the login bugs"},
+            {"task": "Water the plants"},
+            {"task": "Write the quarterly report"},
+        ]
+        blob = dedupe.build_blob(tasks)
+
+        self.assertEqual(dedupe.find_clusters(blob, range(len(tasks))), [[0, 2], [1, 4]])
+        self.assertEqual(dedupe.find_clusters(blob, [0, 1, 3]), [])
+
+    def test_tasks_without_shingles_are_not_duplicates(self):
+        """Test that empty and stopword-only descriptions never match each other."""
+        tasks = [{"task": ""}, {"task": "the"}, {"task": "Fix login bug"}, {"task": "?!"}, {"task": "fix login bug"}]
+        blob = dedupe.build_blob(tasks)
+
+        self.assertEqual(dedupe.signature("the"), dedupe.EMPTY)
+        self.assertEqual(dedupe.find_clusters(blob, range(len(tasks))), [[2, 4]])
+        self.assertEqual(dedupe.find_matches(blob, dedupe.signature("a")), [])
+
+    def test_find_matches(self):
+        """Test single-signature lookups against a blob."""
+        blob = dedupe.build_blob([{"task": "Water the plants"}, {"task": "Fix login bug"}])
+
+        matches = dedupe.find_matches(blob, dedupe.signature("fix login bug"))
+
+        self.assertEqual([p for p, _ in matches], [1])
+        self.assertEqual(dedupe.find_matches(blob, dedupe.signature("Buy milk")), [])
+
+
+class TestTodoListDedupe(unittest.TestCase):
+    """Test cases for TodoList duplicate detection and the signature index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks_file = os.path.join(self.tmpdir.name, "tasks.json")
+        self.todo_list = TodoList(self.tasks_file)
+        for description in ("Fix login bug", "Write docs", "fix the login bugs"):
+            self.todo_list.add_task(description)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    def _assert_index_current(self):
+        header, blob = self.todo_list.signatures.load()
+        self.assertEqual(bytes(blob), bytes(dedupe.build_blob(self.todo_list.load_tasks())))
+
+    def test_find_duplicates(self):
+        """Test that clusters use absolute indices and skip completed tasks."""
+        clusters = self.todo_list.find_duplicates()
+        self.assertEqual([[i for i, _ in c] for c in clusters], [[1, 3]])
+
+        self.todo_list.complete_task(3)
+        self.assertEqual(self.todo_list.find_duplicates(), [])
+        self.assertEqual(len(self.todo_list.find_duplicates(include_completed=True)), 1)
+
+    def test_index_is_created_on_demand(self):
+        """Test that no index exists until duplicate detection is used."""
+        self.assertFalse(os.path.exists(self.todo_list.signatures.path))
+        self.todo_list.find_duplicates()
+        self._assert_index_current()
+
+    def test_mutations_update_index_incrementally(self):
+        """Test that add, complete, remove and clear keep the index in sync."""
+        self.todo_list.find_duplicates()
+
+        with mock.patch("todolist.dedupe.build_blob") as build:
+            self.todo_list.add_task("Fix login bug again")
+            self.todo_list.complete_task(2)
+            self.todo_list.remove_task(1)
+            self.todo_list.clear_completed()
+            self.todo_list.find_duplicates()
+        build.assert_not_called()
+        self._assert_index_current()
+
+    def test_stale_index_is_rebuilt(self):
+        """Test that changes made behind the index's back trigger a rebuild."""
+        self.todo_list.find_duplicates()
+        tasks = self.todo_list.load_tasks()
+        tasks.append({"task": "Write the docs", "status": "pending"})
+        self.todo_list.save_tasks(tasks)
+
+        clusters = self.todo_list.find_duplicates()
+
+        self.assertIn([2, 4], [[i for i, _ in c] for c in clusters])
+        self._assert_index_current()
+
+    def test_find_similar(self):
+        """Test the add-time duplicate lookup."""
+        matches = self.todo_list.find_similar("Fix the login bug")
+
+        self.assertEqual([i for i, _, _ in matches], [1, 3])
+        self.assertTrue(all(score >= dedupe.DEFAULT_THRESHOLD for _, _, score in matches))
+        self.assertEqual(self.todo_list.find_similar("Buy groceries"), [])
+
+
+class TestAsyncDedupe(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncTodoList.find_duplicates."""
+
+    async def test_find_duplicates(self):
+        """Test clustering over the shared in-memory list."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with AsyncTodoList(os.path.join(tmpdir, "tasks.json")) as todo:
+                await todo.add_task("Fix login bug")
+                await todo.add_task("Write docs")
+                await todo.add_task("fix the login bug")
+                clusters = await todo.find_duplicates()
+
+        self.assertEqual([[i for i, _ in c] for c in clusters], [[1, 3]])
+
+
+class TestDedupeCommand(unittest.TestCase):
+    """Test cases for the dedupe CLI command and add --check-duplicates."""
+
+    def setUp(self):
+        """Set up a temporary working directory."""
+        self.old_cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.tmpdir.cleanup()
+
+    def _run(self, *argv):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main(list(argv))
+        return buf.getvalue()
+
+    def test_dedupe_ndjson(self):
+        """Test that each duplicate is one record with its group number."""
+        self._run("add", "Fix login bug")
+        self._run("add", "Write docs")
+        self._run("add", "fix the login bug")
+
+        records = [json.loads(line) for line in self._run("dedupe", "--ndjson").splitlines()]
+
+        self.assertEqual([(r["group"], r["index"]) for r in records], [(1, 1), (1, 3)])
+
+    def test_add_warns_about_duplicates(self):
+        """Test the add-time warning in text and JSON output."""
+        self._run("add", "Fix login bug")
+
+        self.assertIn("Similar pending task", self._run("add", "fix the login bug", "--check-duplicates"))
+        record = json.loads(self._run("add", "Fix login bugs", "--check-duplicates", "--json"))
+        self.assertEqual([s["index"] for s in record["similar"]], [1, 2])
+        self.assertNotIn("Similar", self._run("add", "Unrelated", "--check-duplicates"))
+
+
+if __name__ == '__main__':
+    unittest.main()
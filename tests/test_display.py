@@ -0,0 +1,82 @@
+"""Unit tests for the terminal presentation layer."""
+
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import display
+from todolist.core import compute_statistics
+
+
+def capture(func, *args, **kwargs):
+    """Run func and return (result, printed text)."""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        result = func(*args, **kwargs)
+    return result, buf.getvalue()
+
+
+class TestDisplay(unittest.TestCase):
+    """Test cases for display functions (colors disabled)."""
+
+    def setUp(self):
+        """Disable colors for predictable output."""
+        patcher = mock.patch("todolist.colors.supports_color", return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.task = {
+            "task": "Write docs",
+            "status": "pending",
+            "priority": "high",
+            "tags": ["work"],
+            "due_date": "2025-11-20",
+            "created_at": "2025-11-13T10:00:00",
+            "completed_at": None,
+        }
+
+    def test_format_task(self):
+        """Test the lines produced for a single task."""
+        self.assertEqual(display.format_task(4, self.task), [
+            "4. [○] Write docs",
+            "   Priority: !!! HIGH",
+            "   Tags: #work",
+            "   📅 Due: 2025-11-20",
+            "",
+        ])
+
+    def test_print_tasks_counts_and_empty_messages(self):
+        """Test print_tasks output and empty-result messages."""
+        count, out = capture(display.print_tasks, iter([(1, self.task)]))
+        self.assertEqual(count, 1)
+        self.assertIn("1. [○] Write docs", out)
+
+        _, out = capture(display.print_tasks, iter([]))
+        self.assertEqual(out.strip(), "No tasks found.")
+        _, out = capture(display.print_tasks, iter([]), filtered=True)
+        self.assertEqual(out.strip(), "No tasks match the filter criteria.")
+
+    def test_print_statistics(self):
+        """Test the statistics dashboard."""
+        stats = compute_statistics([self.task])
+        _, out = capture(display.print_statistics, stats)
+
+        self.assertIn("Total tasks: 1", out)
+        self.assertIn("Completed:   0 (0.0%)", out)
+        self.assertIn("#work: 1", out)
+
+    def test_print_search_results(self):
+        """Test search output header."""
+        count, out = capture(display.print_search_results, "docs", [(2, self.task)])
+
+        self.assertEqual(count, 1)
+        self.assertIn("Found 1 task(s) matching 'docs'", out)
+        self.assertIn("2. [○] Write docs", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
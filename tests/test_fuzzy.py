@@ -0,0 +1,192 @@
+"""Unit tests for typo-tolerant search."""
+
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import fuzzy
+from todolist.__main__ import main
+from todolist.aio import AsyncTodoList
+from todolist.core import TodoList
+
+
+def _reference_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class TestLevenshtein(unittest.TestCase):
+    """Test cases for the bit-parallel edit distance."""
+
+    def test_known_distances(self):
+        """Test a few hand-checked distances."""
+        self.assertEqual(fuzzy.levenshtein("kitten", "sitting"), 3)
+        self.assertEqual(fuzzy.levenshtein("", "abc"), 3)
+        self.assertEqual(fuzzy.levenshtein("login", "login"), 0)
+        self.assertEqual(fuzzy.levenshtein("logn", "login"), 1)
+
+    def test_matches_dynamic_programming(self):
+        """Test against the textbook algorithm, with and without limits."""
+        rng = random.Random(0)
+        for _ in range(2000):
+            a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+            b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+            expected = _reference_distance(a, b)
+            self.assertEqual(fuzzy.levenshtein(a, b), expected)
+            for limit in (0, 1, 2):
+                self.assertEqual(fuzzy.levenshtein(a, b, limit), min(expected, limit + 1))
+
+
+class TestBKTree(unittest.TestCase):
+    """Test cases for BKTree."""
+
+    def setUp(self):
+        """Build a tree over random words."""
+        rng = random.Random(1)
+        self.words = sorted({
+            "".join(rng.choice("abcdefgh") for _ in range(rng.randint(3, 7))) for _ in range(500)
+        })
+        self.tree = fuzzy.BKTree(self.words)
+
+    def test_search_matches_brute_force(self):
+        """Test that pruning never drops a match."""
+        for query in ("abc", "hgfed", "aaaa", "bcdefg"):
+            for k in (0, 1, 2):
+                expected = sorted(
+                    (fuzzy.levenshtein(query, w), w) for w in self.words
+                    if fuzzy.levenshtein(query, w) <= k
+                )
+                self.assertEqual(self.tree.search(query, k), expected)
+
+    def test_round_trip(self):
+        """Test that a saved tree searches the same."""
+        restored = fuzzy.BKTree.from_dict(json.loads(json.dumps(self.tree.to_dict())))
+
+        self.assertEqual(restored.search("abcd", 2), self.tree.search("abcd", 2))
+        self.assertIn(self.words[0], restored)
+        self.assertFalse(restored.add(self.words[0]))
+
+    def test_rank_prefers_more_and_closer_matches(self):
+        """Test ranking by matched words, then closeness."""
+        tasks = [{"task": "Update login page"}, {"task": "Fix login bug"}, {"task": "Fix logon bug"}]
+        _, postings = fuzzy.vocabulary(tasks)
+        tree = fuzzy.BKTree(postings)
+
+        ranked = fuzzy.rank("fix login", tree, postings)
+
+        self.assertEqual([p for p, _ in ranked], [1, 2, 0])
+        self.assertEqual(ranked[0][1], 1.0)
+
+
+class TestTodoListFuzzy(unittest.TestCase):
+    """Test cases for TodoList fuzzy search and tag suggestions."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks_file = os.path.join(self.tmpdir.name, "tasks.json")
+        self.todo_list = TodoList(self.tasks_file)
+        self.todo_list.add_task("Fix login bug", tags=["backend"])
+        self.todo_list.add_task("Write documentation", tags=["docs"])
+        self.todo_list.add_task("Buy groceries", tags=["home"])
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    def test_fuzzy_search(self):
+        """Test that misspelled queries still find tasks, best first."""
+        results = self.todo_list.fuzzy_search("documantation")
+
+        self.assertEqual([i for i, _, _ in results], [2])
+        self.assertLess(results[0][2], 1.0)
+        self.assertEqual(self.todo_list.fuzzy_search("documantation", max_distance=0), [])
+
+    def test_fuzzy_search_matches_tags(self):
+        """Test that tags are searchable words too."""
+        self.assertEqual([i for i, _, _ in self.todo_list.fuzzy_search("bakend")], [1])
+
+    def test_suggest_tags(self):
+        """Test "did you mean" suggestions for unknown tags only."""
+        self.assertEqual(self.todo_list.suggest_tags(["bakend", "home", "zzz"]), {"bakend": ["backend"], "zzz": []})
+
+    def test_index_persists_and_tolerates_stale_words(self):
+        """Test that removed words stay in the tree but are never suggested."""
+        self.todo_list.suggest_tags(["x"])
+        self.assertTrue(os.path.exists(self.todo_list.terms.path))
+
+        self.todo_list.remove_task(3)
+        fresh = TodoList(self.tasks_file)
+
+        self.assertEqual(fresh.suggest_tags(["hom"]), {"hom": []})
+        self.assertIn("home", fresh.terms.tags)
+        self.assertEqual(fresh.fuzzy_search("groceries"), [])
+
+
+class TestAsyncFuzzy(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncTodoList.fuzzy_search."""
+
+    async def test_fuzzy_search_sees_new_tasks(self):
+        """Test that words added after the first search are found."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with AsyncTodoList(os.path.join(tmpdir, "tasks.json")) as todo:
+                await todo.add_task("Fix login bug")
+                self.assertEqual(len(await todo.fuzzy_search("logn")), 1)
+                await todo.add_task("Plan vacation")
+                results = await todo.fuzzy_search("vacaton")
+
+        self.assertEqual([i for i, _, _ in results], [2])
+
+
+class TestFuzzyCommands(unittest.TestCase):
+    """Test cases for search --fuzzy and tag suggestions in the CLI."""
+
+    def setUp(self):
+        """Set up a temporary working directory."""
+        self.old_cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.tmpdir.cleanup()
+
+    def _run(self, *argv):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main(list(argv))
+        return buf.getvalue()
+
+    def test_search_fuzzy_json(self):
+        """Test that fuzzy results carry a score."""
+        self._run("add", "Fix login bug")
+        self._run("add", "Water plants")
+
+        records = json.loads(self._run("search", "--fuzzy", "loginn", "--json"))
+
+        self.assertEqual([r["index"] for r in records], [1])
+        self.assertIn("score", records[0])
+
+    def test_list_suggests_tags(self):
+        """Test the "did you mean" hint when a tag filter matches nothing."""
+        self._run("add", "Fix login bug", "-t", "backend")
+
+        self.assertIn("Did you mean", self._run("list", "-t", "backnd"))
+        self.assertNotIn("Did you mean", self._run("list", "-t", "backend"))
+
+
+if __name__ == '__main__':
+    unittest.main()
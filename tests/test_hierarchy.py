@@ -0,0 +1,189 @@
+"""Unit tests for subtasks and rolled-up progress."""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import hierarchy
+from todolist.__main__ import main
+from todolist.core import TodoList
+from todolist.locking import file_signature
+
+
+def _rows(rows):
+    """Reduce tree rows to comparable tuples."""
+    return [(r.depth, r.index, r.task["task"], r.done, r.total) for r in rows]
+
+
+class TestBuildTree(unittest.TestCase):
+    """Test cases for building the hierarchy index."""
+
+    def test_counts_all_descendants(self):
+        """Test that progress rolls up through every level."""
+        tasks = [
+            {"id": "a", "task": "A"},
+            {"id": "b", "task": "B", "parent": "a"},
+            {"id": "c", "task": "C", "parent": "b", "status": "completed"},
+            {"id": "d", "task": "D"},
+            {"id": "e", "task": "E", "parent": "a", "status": "completed"},
+        ]
+
+        tree = hierarchy.build_tree(tasks)
+
+        self.assertNotIn("d", tree["nodes"])
+        self.assertEqual(
+            _rows(hierarchy.walk(tree, hierarchy.roots(tree))),
+            [(0, 1, "A", 2, 3), (1, 2, "B", 1, 1), (2, 3, "C", 0, 0), (1, 5, "E", 0, 0)],
+        )
+
+    def test_dangling_and_cyclic_parents(self):
+        """Test that missing parents are ignored and cycles are broken."""
+        tasks = [
+            {"id": "a", "task": "A", "parent": "c"},
+            {"id": "b", "task": "B", "parent": "a"},
+            {"id": "c", "task": "C", "parent": "b"},
+            {"id": "d", "task": "D", "parent": "gone"},
+            {"id": "e", "task": "E", "parent": "e"},
+        ]
+
+        tree = hierarchy.build_tree(tasks)
+
+        self.assertEqual(hierarchy.roots(tree), ["a"])
+        self.assertEqual(_rows(hierarchy.walk(tree, ["a"])), [(0, 1, "A", 0, 2), (1, 2, "B", 0, 1), (2, 3, "C", 0, 0)])
+
+
+class TestSubtasks(unittest.TestCase):
+    """Test cases for TodoList subtasks."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "tasks.json")
+        self.todo_list = TodoList(self.path)
+        self.todo_list.add_task("Book")
+        self.todo_list.add_task("Chapter 1", parent=1)
+        self.todo_list.add_task("Chapter 2", parent=1)
+        self.todo_list.add_task("Outline", parent=2)
+        self.todo_list.add_task("Errand")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    def assertMatchesRebuild(self):
+        """Assert that the incrementally updated index equals a fresh one."""
+        stored = self.todo_list.hierarchy.load(file_signature(self.path))
+        self.assertIsNotNone(stored)
+        stored.pop("signature")
+        self.assertEqual(stored, hierarchy.build_tree(self.todo_list.load_tasks()))
+
+    def test_tree_shows_progress(self):
+        """Test the rows and counts for the whole hierarchy and a subtree."""
+        self.todo_list.complete_task(4)
+
+        self.assertEqual(
+            _rows(self.todo_list.tree()),
+            [(0, 1, "Book", 1, 3), (1, 2, "Chapter 1", 1, 1), (2, 4, "Outline", 0, 0), (1, 3, "Chapter 2", 0, 0)],
+        )
+        self.assertEqual(_rows(self.todo_list.tree(2)), [(0, 2, "Chapter 1", 1, 1), (1, 4, "Outline", 0, 0)])
+        self.assertEqual(_rows(self.todo_list.tree(1, depth=0)), [(0, 1, "Book", 1, 3)])
+        self.assertEqual(_rows(self.todo_list.tree(5)), [(0, 5, "Errand", 0, 0)])
+        self.assertIsNone(self.todo_list.tree(9))
+
+    def test_incremental_updates_match_rebuild(self):
+        """Test that every mutation keeps the sidecar equal to a rebuild."""
+        self.todo_list.tree()
+        self.todo_list.complete_task(4)
+        self.assertMatchesRebuild()
+        self.todo_list.move_task(5, parent=3)
+        self.assertMatchesRebuild()
+        self.todo_list.add_task("Index", parent=5)
+        self.assertMatchesRebuild()
+        self.todo_list.move_task(2, parent=None)
+        self.assertMatchesRebuild()
+        self.todo_list.remove_task(3)
+        self.assertMatchesRebuild()
+        self.todo_list.clear_completed()
+        self.assertMatchesRebuild()
+
+    def test_remove_orphans_subtasks(self):
+        """Test that removing a parent makes its subtasks top-level."""
+        self.todo_list.remove_task(2)
+
+        self.assertEqual(_rows(self.todo_list.tree()), [(0, 1, "Book", 0, 1), (1, 2, "Chapter 2", 0, 0)])
+        self.assertEqual(_rows(self.todo_list.tree(3)), [(0, 3, "Outline", 0, 0)])
+
+    def test_move_rejects_cycles(self):
+        """Test that a task cannot be moved under itself or a descendant."""
+        with self.assertRaises(ValueError):
+            self.todo_list.move_task(1, parent=4)
+        with self.assertRaises(ValueError):
+            self.todo_list.move_task(2, parent=2)
+        with self.assertRaises(ValueError):
+            self.todo_list.add_task("Nowhere", parent=9)
+        self.assertIsNone(self.todo_list.move_task(9, parent=1))
+
+    def test_move_is_undoable(self):
+        """Test that undo restores the previous parent."""
+        self.todo_list.move_task(4, parent=3)
+        self.todo_list.undo()
+
+        self.assertEqual(_rows(self.todo_list.tree(2)), [(0, 2, "Chapter 1", 0, 1), (1, 4, "Outline", 0, 0)])
+
+    def test_legacy_parent_gets_an_id(self):
+        """Test that tasks saved before ids existed can become parents."""
+        with open(self.path, "w") as f:
+            json.dump([{"task": "Old", "status": "pending", "priority": "low"}], f)
+
+        self.todo_list.add_task("New", parent=1)
+
+        tasks = self.todo_list.load_tasks()
+        self.assertEqual(tasks[1]["parent"], tasks[0]["id"])
+        self.assertEqual(_rows(self.todo_list.tree()), [(0, 1, "Old", 0, 1), (1, 2, "New", 0, 0)])
+
+
+class TestTreeCommand(unittest.TestCase):
+    """Test cases for the tree and move CLI commands."""
+
+    def setUp(self):
+        """Set up a temporary working directory."""
+        self.old_cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.tmpdir.cleanup()
+
+    def test_tree_output(self):
+        """Test the text and JSON renderings."""
+        with redirect_stdout(io.StringIO()):
+            main(["add", "Book"])
+            main(["add", "Chapter 1", "--parent", "1"])
+            main(["add", "Chapter 2", "--parent", "1"])
+            main(["complete", "3"])
+            main(["move", "3", "--parent", "2"])
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main(["tree"])
+        lines = buf.getvalue().splitlines()
+        self.assertIn("1/2 (50%)", lines[0])
+        self.assertTrue(lines[1].startswith("└── 2."))
+        self.assertTrue(lines[2].startswith("    └── 3."))
+
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main(["tree", "1", "--depth", "1", "--json"])
+        records = json.loads(buf.getvalue())
+        self.assertEqual([(r["index"], r["depth"], r["done"], r["total"]) for r in records], [(1, 0, 1, 2), (2, 1, 1, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+"""Unit tests for undo/redo history."""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import history
+from todolist.__main__ import main
+from todolist.aio import AsyncTodoList
+from todolist.core import TodoList
+
+
+class TestDeltas(unittest.TestCase):
+    """Test cases for applying and inverting deltas."""
+
+    def test_invert_restores_original(self):
+        """Test that a delta followed by its inverse is a no-op."""
+        tasks = [{"id": str(i), "task": f"t{i}"} for i in range(5)]
+        original = [dict(t) for t in tasks]
+        changes = [
+            ["delete", 3, tasks[3]],
+            ["replace", 0, tasks[0], dict(tasks[0], task="changed")],
+            ["delete", 1, tasks[1]],
+            ["insert", 3, {"id": "new", "task": "new"}],
+        ]
+
+        history.apply_changes(tasks, changes)
+        self.assertEqual([t["id"] for t in tasks], ["0", "2", "4", "new"])
+        history.apply_changes(tasks, history.invert(changes))
+
+        self.assertEqual(tasks, original)
+
+    def test_mismatch_is_rejected(self):
+        """Test that a delta recorded against another list is refused."""
+        with self.assertRaises(ValueError):
+            history.apply_changes([{"id": "a"}], [["delete", 0, {"id": "b"}]])
+
+    def test_diff(self):
+        """Test the delta computed for a synced list."""
+        old = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+        new = [{"id": "a", "x": 1}, {"id": "c"}, {"id": "d"}]
+
+        changes = history.diff(old, new)
+        history.apply_changes(old, changes)
+
+        self.assertEqual(old, new)
+
+    def test_rebase_matches_by_id(self):
+        """Test replaying a delta onto a list another writer changed."""
+        old = [{"id": "a", "task": "A"}, {"id": "b", "task": "B"}, {"id": "c", "task": "C"}]
+        changes = [
+            ["replace", 2, old[2], dict(old[2], status="completed")],
+            ["delete", 1, old[1]],
+            ["insert", 2, {"id": "d", "task": "D"}],
+        ]
+        current = [{"id": "a", "task": "A"}, {"id": "c", "task": "C renamed"}, {"id": "e", "task": "E"}]
+
+        applied = history.rebase(current, changes)
+
+        self.assertEqual([t["id"] for t in current], ["a", "c", "d", "e"])
+        self.assertEqual(current[1], {"id": "c", "task": "C renamed", "status": "completed"})
+        self.assertEqual([c[:2] for c in applied], [["replace", 1], ["insert", 2]])
+
+
+class TestTodoListHistory(unittest.TestCase):
+    """Test cases for TodoList undo, redo and revisions."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.todo_list = TodoList(os.path.join(self.tmpdir.name, "tasks.json"))
+        for description in ("Task 1", "Task 2", "Task 3"):
+            self.todo_list.add_task(description)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    def _state(self):
+        return [(t["task"], t["status"]) for t in self.todo_list.load_tasks()]
+
+    def test_undo_clear_restores_positions(self):
+        """Test that undoing clear puts tasks back where they were."""
+        self.todo_list.complete_task(1)
+        self.todo_list.complete_task(3)
+        self.todo_list.clear_completed()
+
+        revision = self.todo_list.undo()
+
+        self.assertEqual((revision.op, revision.undone), ("clear", True))
+        self.assertEqual(
+            self._state(),
+            [("Task 1", "completed"), ("Task 2", "pending"), ("Task 3", "completed")],
+        )
+
+    def test_undo_and_redo_remove(self):
+        """Test stepping back and forth over a removal."""
+        self.todo_list.remove_task(2)
+        self.todo_list.undo()
+        self.assertEqual([d for d, _ in self._state()], ["Task 1", "Task 2", "Task 3"])
+        self.assertEqual(self.todo_list.tombstones.load(), {})
+
+        self.assertEqual(self.todo_list.redo().op, "remove")
+        self.assertEqual([d for d, _ in self._state()], ["Task 1", "Task 3"])
+        self.assertIsNone(self.todo_list.redo())
+
+    def test_new_change_discards_redo(self):
+        """Test that a change after an undo cannot be followed by redo."""
+        self.todo_list.complete_task(1)
+        self.todo_list.undo()
+        self.todo_list.add_task("Task 4")
+
+        self.assertIsNone(self.todo_list.redo())
+        self.assertEqual([r.op for r in self.todo_list.revisions()], ["add"] * 4)
+
+    def test_undo_everything(self):
+        """Test undoing back to an empty list."""
+        for _ in range(3):
+            self.todo_list.undo()
+
+        self.assertEqual(self.todo_list.load_tasks(), [])
+        self.assertIsNone(self.todo_list.undo())
+
+    def test_external_change_blocks_undo(self):
+        """Test that history is not applied to a file edited behind its back."""
+        tasks = self.todo_list.load_tasks()
+        tasks.append({"task": "Edited by hand", "status": "pending"})
+        self.todo_list.save_tasks(tasks)
+
+        with self.assertRaises(ValueError):
+            self.todo_list.undo()
+
+        self.todo_list.add_task("Task 5")
+        self.assertEqual([r.summary for r in self.todo_list.revisions()], ["Task 5"])
+
+    def test_sync_can_be_undone_on_both_sides(self):
+        """Test that sync records a revision in each file it changes."""
+        remote = TodoList(os.path.join(self.tmpdir.name, "remote", "tasks.json"))
+        os.mkdir(os.path.dirname(remote.tasks_file))
+        remote.add_task("Remote task")
+
+        self.todo_list.sync(remote.tasks_file)
+
+        self.assertEqual(remote.revisions()[-1].op, "sync")
+        self.assertEqual(remote.revisions()[-1].summary, f"with {os.path.abspath(self.todo_list.tasks_file)}")
+        self.assertEqual(self.todo_list.revisions()[-1].summary, f"with {os.path.abspath(remote.tasks_file)}")
+        remote.undo()
+        self.assertEqual([t["task"] for t in remote.load_tasks()], ["Remote task"])
+        self.todo_list.undo()
+        self.assertEqual([d for d, _ in self._state()], ["Task 1", "Task 2", "Task 3"])
+
+    def test_retention_is_bounded(self):
+        """Test that the log is checkpointed and old revisions dropped."""
+        for i in range(history.MAX_REVISIONS * 3):
+            self.todo_list.add_task(f"Extra {i}")
+
+        revisions = self.todo_list.revisions()
+        with open(self.todo_list.history.path) as f:
+            lines = sum(1 for _ in f)
+
+        self.assertLessEqual(len(revisions), history.MAX_REVISIONS * 3 // 2 + 1)
+        self.assertLessEqual(lines, history.MAX_REVISIONS * 3 + 2)
+        self.assertEqual(revisions[-1].rev, history.MAX_REVISIONS * 3 + 3)
+        self.assertEqual(self.todo_list.undo().summary, f"Extra {history.MAX_REVISIONS * 3 - 1}")
+
+
+class TestAsyncHistory(unittest.IsolatedAsyncioTestCase):
+    """Test cases for history recorded by AsyncTodoList."""
+
+    async def test_flush_records_revisions(self):
+        """Test that async mutations can be undone through TodoList."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tasks.json")
+            async with AsyncTodoList(path) as todo:
+                await todo.add_task("Task 1")
+                await todo.add_task("Task 2")
+                await todo.complete_task(1)
+            store = TodoList(path)
+
+            self.assertEqual([r.op for r in store.revisions()], ["add", "add", "complete"])
+            store.undo()
+            self.assertEqual(store.load_tasks()[0]["status"], "pending")
+
+
+class TestHistoryCommands(unittest.TestCase):
+    """Test cases for the undo, redo and history CLI commands."""
+
+    def setUp(self):
+        """Set up a temporary working directory."""
+        self.old_cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.tmpdir.cleanup()
+
+    def _run(self, *argv):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main(list(argv))
+        return buf.getvalue()
+
+    def test_undo_redo_history(self):
+        """Test the text and JSON output of the history commands."""
+        self._run("add", "Buy milk")
+        self._run("remove", "1")
+
+        self.assertIn("Undid remove: Buy milk", self._run("undo"))
+        records = json.loads(self._run("history", "--json"))
+        self.assertEqual([(r["op"], r["undone"]) for r in records], [("remove", True), ("add", False)])
+        self.assertIn("Redid remove", self._run("redo"))
+        self.assertIn("Nothing to redo", self._run("redo"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Unit tests for operational metrics."""
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import metrics, profiling
+from todolist.__main__ import main
+from todolist.core import TodoList
+
+
+class TestHistogram(unittest.TestCase):
+    """Test cases for histogram records."""
+
+    def test_observe_buckets(self):
+        """Test that observations land in the first bucket they fit."""
+        hist = metrics.new_histogram()
+        metrics.observe(hist, 0.001)
+        metrics.observe(hist, 0.02)
+        metrics.observe(hist, 60.0)
+
+        self.assertEqual(hist["buckets"][0], 1)
+        self.assertEqual(hist["buckets"][metrics.BUCKETS.index(0.025)], 1)
+        self.assertEqual(hist["buckets"][-1], 1)
+        self.assertEqual(hist["count"], 3)
+
+
+class TestMetricsStore(unittest.TestCase):
+    """Test cases for MetricsStore and exposition."""
+
+    def setUp(self):
+        """Create a temporary metrics file location."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = metrics.MetricsStore(os.path.join(self.temp_dir.name, "metrics.json"))
+
+    def tearDown(self):
+        """Clean up."""
+        self.temp_dir.cleanup()
+
+    def test_record_run_accumulates(self):
+        """Test that runs accumulate across store instances."""
+        self.store.record_run("list", 0.01, True, file_size=100)
+        self.store.record_run("list", 0.02, False, save_seconds=0.003, lock_wait_seconds=0.0001)
+
+        data = metrics.MetricsStore(self.store.path).load()
+        self.assertEqual(data["commands"]["list"]["ok"], 1)
+        self.assertEqual(data["commands"]["list"]["error"], 1)
+        self.assertEqual(data["commands"]["list"]["duration"]["count"], 2)
+        self.assertEqual(data["save_duration"]["count"], 1)
+        self.assertEqual(data["lock_wait"]["count"], 1)
+        self.assertEqual(data["tasks_file_size_bytes"], 100)
+
+    def test_render_prometheus(self):
+        """Test Prometheus text output with cumulative buckets."""
+        self.store.record_run("add", 0.002, True)
+        self.store.record_run("add", 0.2, True)
+        text = metrics.render(self.store.load(), {("pending", "high"): 3}, 512)
+
+        self.assertIn("# TYPE todo_command_runs_total counter", text)
+        self.assertIn('todo_command_runs_total{command="add",outcome="ok"} 2', text)
+        self.assertIn('todo_command_duration_seconds_bucket{command="add",le="0.0025"} 1', text)
+        self.assertIn('todo_command_duration_seconds_bucket{command="add",le="+Inf"} 2', text)
+        self.assertIn('todo_tasks{status="pending",priority="high"} 3', text)
+        self.assertIn("todo_tasks_file_size_bytes 512", text)
+        self.assertNotIn("# EOF", text)
+
+    def test_render_openmetrics(self):
+        """Test OpenMetrics family naming and EOF marker."""
+        text = metrics.render(metrics.empty_metrics(), fmt="openmetrics")
+
+        self.assertIn("# TYPE todo_command_runs counter", text)
+        self.assertTrue(text.endswith("# EOF\n"))
+
+    def test_label_escaping(self):
+        """Test that label values are escaped."""
+        text = metrics.render(metrics.empty_metrics(), {('a"b', "x\\y"): 1})
+
+        self.assertIn('todo_tasks{status="a\\"b",priority="x\\\\y"} 1', text)
+
+
+class TestMetricsCli(unittest.TestCase):
+    """Test cases for metrics recording from the CLI."""
+
+    def setUp(self):
+        """Run each test in an empty directory with metrics enabled."""
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        self.metrics_file = os.path.join(self.temp_dir.name, "metrics.json")
+        patcher = mock.patch.dict(os.environ, {"TODO_METRICS_FILE": self.metrics_file, "TODO_TRACE": ""})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(profiling.tracer.reset)
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.temp_dir.cleanup()
+
+    def run_cli(self, *argv):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            try:
+                main(list(argv))
+            except SystemExit:
+                pass
+        profiling.tracer.reset()
+        return buf.getvalue()
+
+    def test_runs_are_recorded(self):
+        """Test that each run updates the metrics file."""
+        self.run_cli("add", "Task")
+        self.run_cli("complete", "5")
+
+        data = metrics.MetricsStore(self.metrics_file).load()
+        self.assertEqual(data["commands"]["add"]["ok"], 1)
+        self.assertEqual(data["commands"]["complete"]["ok"], 1)
+        self.assertEqual(data["save_duration"]["count"], 1)
+        self.assertEqual(data["lock_wait"]["count"], 2)
+
+    def test_failed_run_counts_as_error(self):
+        """Test that runs exiting non-zero are counted as errors."""
+        self.run_cli("complete", "5", "--json")
+
+        data = metrics.MetricsStore(self.metrics_file).load()
+        self.assertEqual(data["commands"]["complete"]["error"], 1)
+
+    def test_metrics_command_writes_file(self):
+        """Test `todo metrics -o FILE`."""
+        TodoList().add_task("Pending", priority="low")
+        self.run_cli("metrics", "-o", "todo.prom")
+
+        with open("todo.prom") as f:
+            text = f.read()
+        self.assertIn('todo_tasks{status="pending",priority="low"} 1', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
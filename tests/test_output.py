@@ -0,0 +1,163 @@
+"""Unit tests for machine-readable output."""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import output
+from todolist.__main__ import main
+from todolist.core import TodoList
+
+
+class TestWriteRecords(unittest.TestCase):
+    """Test cases for the streaming encoders."""
+
+    def test_json_array(self):
+        """Test that json output is a single valid array."""
+        buf = io.StringIO()
+        count = output.write_records(iter([{"a": 1}, {"b": "é"}]), "json", buf)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(json.loads(buf.getvalue()), [{"a": 1}, {"b": "é"}])
+
+    def test_empty_json_array(self):
+        """Test that no records produce an empty array."""
+        buf = io.StringIO()
+        output.write_records(iter([]), "json", buf)
+
+        self.assertEqual(json.loads(buf.getvalue()), [])
+
+    def test_json_array_left_open_on_error(self):
+        """Test that a failure mid-stream never looks like a complete result."""
+        def records():
+            yield {"a": 1}
+            raise OSError("disk gone")
+
+        buf = io.StringIO()
+        with self.assertRaises(OSError):
+            output.write_records(records(), "json", buf)
+        self.assertEqual(buf.getvalue(), '[{"a":1}')
+        with self.assertRaises(ValueError):
+            json.loads(buf.getvalue())
+
+        def failing():
+            raise OSError("disk gone")
+            yield
+
+        buf = io.StringIO()
+        with self.assertRaises(OSError):
+            output.write_records(failing(), "json", buf)
+        self.assertEqual(buf.getvalue(), "")
+
+    def test_ndjson_lines(self):
+        """Test that ndjson output has one object per line."""
+        buf = io.StringIO()
+        output.write_records(iter([{"a": 1}, {"a": 2}]), "ndjson", buf)
+
+        lines = buf.getvalue().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{"a": 1}, {"a": 2}])
+
+    def test_records_are_streamed(self):
+        """Test that each record is written before the next is produced."""
+        buf = io.StringIO()
+        seen = []
+
+        def records():
+            for i in range(3):
+                seen.append(buf.getvalue().count("\n"))
+                yield {"i": i}
+
+        output.write_records(records(), "ndjson", buf)
+        self.assertEqual(seen, [0, 1, 2])
+
+    def test_task_record_puts_index_first(self):
+        """Test that task records carry their index."""
+        record = output.task_record(3, {"task": "x", "status": "pending"})
+
+        self.assertEqual(list(record), ["index", "task", "status"])
+
+
+class TestCliOutputFlag(unittest.TestCase):
+    """Test cases for the --output/--json/--ndjson CLI flags."""
+
+    def setUp(self):
+        """Run each test in an empty directory."""
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        todo = TodoList()
+        todo.add_task("Buy milk", priority="high", tags=["home"])
+        todo.add_task("Write code", tags=["work"])
+        todo.complete_task(2)
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.temp_dir.cleanup()
+
+    def run_cli(self, *argv):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main(list(argv))
+        return buf.getvalue()
+
+    def test_list_ndjson_after_command(self):
+        """Test `todo list --output ndjson`."""
+        out = self.run_cli("list", "--output", "ndjson")
+        records = [json.loads(line) for line in out.splitlines()]
+
+        self.assertEqual([r["task"] for r in records], ["Buy milk", "Write code"])
+        self.assertEqual(records[0]["index"], 1)
+
+    def test_global_flag_before_command(self):
+        """Test `todo --json list --status completed`."""
+        records = json.loads(self.run_cli("--json", "list", "--status", "completed"))
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["index"], 2)
+        self.assertEqual(records[0]["status"], "completed")
+
+    def test_closed_pipe_exits_quietly(self):
+        """Test that a reader closing the pipe early is not reported as an error."""
+        class ClosedPipe(io.StringIO):
+            def write(self, text):
+                raise BrokenPipeError(32, "Broken pipe")
+
+        for fmt in ("text", "ndjson"):
+            with self.subTest(fmt=fmt), redirect_stdout(ClosedPipe()), \
+                    mock.patch("sys.stderr", new_callable=io.StringIO) as err:
+                with self.assertRaises(SystemExit) as cm:
+                    main(["list", "--output", fmt])
+                self.assertEqual(cm.exception.code, 141)
+                self.assertEqual(err.getvalue(), "")
+
+    def test_stats_json(self):
+        """Test that stats are emitted as one object."""
+        record = json.loads(self.run_cli("stats", "--json"))
+
+        self.assertEqual(record["total"], 2)
+        self.assertEqual(record["completion_pct"], 50.0)
+
+    def test_invalid_index_is_error_record(self):
+        """Test that invalid indices produce an error record and exit 1."""
+        buf = io.StringIO()
+        with redirect_stdout(buf), self.assertRaises(SystemExit) as ctx:
+            main(["complete", "9", "--json"])
+
+        self.assertEqual(ctx.exception.code, 1)
+        self.assertEqual(json.loads(buf.getvalue())["index"], 9)
+
+    def test_no_ansi_codes(self):
+        """Test that machine output contains no escape sequences."""
+        self.assertNotIn("\033", self.run_cli("tags", "--ndjson"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Unit tests for timing instrumentation and the --profile flag."""
+
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import profiling
+from todolist.__main__ import main
+from todolist.core import TodoList
+from todolist.profiling import Tracer
+
+
+class TestTracer(unittest.TestCase):
+    """Test cases for the Tracer class."""
+
+    def test_disabled_span_is_shared_noop(self):
+        """Test that disabled spans record nothing and allocate nothing."""
+        tracer = Tracer()
+        self.assertIs(tracer.span("a"), tracer.span("b"))
+        with tracer.span("a"):
+            pass
+        self.assertEqual(tracer.phases, {})
+
+    def test_nested_self_time(self):
+        """Test that nested spans are excluded from the parent's self time."""
+        tracer = Tracer()
+        tracer.enable()
+        with tracer.span("outer"):
+            with tracer.span("inner"):
+                time.sleep(0.02)
+
+        outer, inner = tracer.phases["outer"], tracer.phases["inner"]
+        self.assertGreaterEqual(outer.total, inner.total)
+        self.assertLess(outer.self_time, 0.01)
+        self.assertGreaterEqual(inner.self_time, 0.015)
+
+    def test_timed_iter_excludes_consumer(self):
+        """Test that timed_iter counts producer time only."""
+        tracer = Tracer()
+        tracer.enable()
+        for _ in tracer.timed_iter("produce", range(3)):
+            time.sleep(0.01)
+
+        stats = tracer.phases["produce"]
+        self.assertEqual(stats.calls, 4)  # three items plus the final StopIteration
+        self.assertLess(stats.total, 0.01)
+
+    def test_json_report(self):
+        """Test the JSON report format."""
+        tracer = Tracer()
+        tracer.enable()
+        tracer.record("load", 0.5)
+        buf = io.StringIO()
+        tracer.report("json", buf, total=1.0, startup_cpu=0.1)
+
+        data = json.loads(buf.getvalue())
+        self.assertEqual(data["phases"]["load"]["self_ms"], 500.0)
+        self.assertEqual(data["total_ms"], 1000.0)
+        self.assertEqual(data["startup_cpu_ms"], 100.0)
+
+    def test_trace_env(self):
+        """Test TODO_TRACE parsing."""
+        for value, expected in (("", None), ("0", None), ("1", "table"), ("json", "json")):
+            with mock.patch.dict(os.environ, {"TODO_TRACE": value}):
+                self.assertEqual(profiling.trace_format_from_env(), expected)
+
+
+class TestProfileFlag(unittest.TestCase):
+    """Test cases for --profile on the CLI."""
+
+    def setUp(self):
+        """Run each test in a directory with a few tasks."""
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        TodoList().add_task("Profile me")
+        self.addCleanup(profiling.tracer.reset)
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.temp_dir.cleanup()
+
+    def run_cli(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            main(list(argv))
+        return out.getvalue(), err.getvalue()
+
+    def test_profile_table_on_stderr(self):
+        """Test that --profile writes phases to stderr, not stdout."""
+        out, err = self.run_cli("--profile", "list")
+
+        self.assertIn("Profile me", out)
+        self.assertNotIn("parse-args", out)
+        for phase in ("parse-args", "load", "filter", "render", "total"):
+            self.assertIn(phase, err)
+
+    def test_profile_json_with_save(self):
+        """Test the JSON breakdown includes the save phase."""
+        _, err = self.run_cli("--profile", "--profile-format", "json", "complete", "1")
+
+        phases = json.loads(err)["phases"]
+        self.assertEqual(set(phases), {"parse-args", "lock-wait", "load", "save", "compute", "render"})
+
+    def test_profile_dump(self):
+        """Test that --profile-dump writes a loadable cProfile file."""
+        import pstats
+        self.run_cli("--profile-dump", "out.prof", "stats")
+
+        self.assertGreater(pstats.Stats("out.prof").total_calls, 0)
+
+    def test_disabled_by_default(self):
+        """Test that nothing is reported without the flag."""
+        with mock.patch.dict(os.environ, {"TODO_TRACE": ""}):
+            _, err = self.run_cli("list")
+        self.assertEqual(err, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
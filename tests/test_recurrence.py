@@ -0,0 +1,220 @@
+"""Unit tests for recurring tasks."""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from itertools import islice
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import recurrence
+from todolist.__main__ import main
+from todolist.core import TodoList
+
+
+def _dates(rule, start, begin, end):
+    return [d.isoformat() for d in recurrence.occurrences(recurrence.parse_rule(rule), start, begin, end)]
+
+
+class TestRules(unittest.TestCase):
+    """Test cases for parsing rules and generating occurrences."""
+
+    def test_interval_rules(self):
+        """Test that interval rules start from the first occurrence in the window."""
+        start = date(2026, 1, 1)
+
+        self.assertEqual(
+            _dates("every 3 days", start, date(2026, 1, 5), date(2026, 1, 12)),
+            ["2026-01-07", "2026-01-10"],
+        )
+        self.assertEqual(
+            _dates("weekly", start, date(2026, 1, 1), date(2026, 1, 20)),
+            ["2026-01-01", "2026-01-08", "2026-01-15"],
+        )
+        self.assertEqual(_dates("daily", start, date(2025, 12, 30), date(2026, 1, 2)), ["2026-01-01", "2026-01-02"])
+
+    def test_monthly_rules_clamp_to_month_end(self):
+        """Test that the 31st becomes the last day of shorter months."""
+        self.assertEqual(
+            _dates("monthly", date(2026, 1, 31), date(2026, 1, 1), date(2026, 4, 30)),
+            ["2026-01-31", "2026-02-28", "2026-03-31", "2026-04-30"],
+        )
+        self.assertEqual(
+            _dates("yearly", date(2024, 2, 29), date(2024, 1, 1), date(2028, 12, 31)),
+            ["2024-02-29", "2025-02-28", "2026-02-28", "2027-02-28", "2028-02-29"],
+        )
+
+    def test_cron_rules(self):
+        """Test weekday names, lists, steps and cron's either-day-field rule."""
+        start = date(2026, 10, 1)
+
+        self.assertEqual(
+            _dates("cron: * * mon-fri", start, date(2026, 10, 16), date(2026, 10, 20)),
+            ["2026-10-16", "2026-10-19", "2026-10-20"],
+        )
+        self.assertEqual(
+            _dates("cron: 1,15 */6 *", start, date(2026, 1, 1), date(2027, 12, 31)),
+            ["2027-01-01", "2027-01-15", "2027-07-01", "2027-07-15"],
+        )
+        # 13th of the month or any Friday
+        self.assertEqual(
+            _dates("cron: 13 * fri", start, date(2026, 11, 1), date(2026, 11, 14)),
+            ["2026-11-06", "2026-11-13"],
+        )
+
+    def test_invalid_rules(self):
+        """Test that malformed rules are rejected."""
+        for text in ("hourly", "every 0 days", "cron: * *", "cron: 32 * *", "cron: * * funday"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                recurrence.parse_rule(text)
+
+    def test_occurrences_are_lazy(self):
+        """Test that an unbounded window can be consumed a few dates at a time."""
+        rule = recurrence.parse_rule("daily")
+        first = list(islice(recurrence.occurrences(rule, date(2026, 1, 1), date(2026, 1, 1), date.max), 3))
+
+        self.assertEqual(first, [date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 3)])
+
+    def test_previous_and_next_occurrence(self):
+        """Test stepping to the surrounding occurrences."""
+        rule = recurrence.parse_rule("every 2 weeks")
+        start = date(2026, 1, 5)
+
+        self.assertEqual(recurrence.previous_occurrence(rule, start, date(2026, 1, 25)), date(2026, 1, 19))
+        self.assertEqual(recurrence.next_occurrence(rule, start, date(2026, 1, 19)), date(2026, 2, 2))
+        self.assertIsNone(recurrence.previous_occurrence(rule, start, date(2026, 1, 4)))
+
+
+class TestTodoListRecurrence(unittest.TestCase):
+    """Test cases for recurring templates on TodoList."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.todo_list = TodoList(os.path.join(self.tmpdir.name, "tasks.json"))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    def test_templates_do_not_touch_the_tasks_file(self):
+        """Test that adding a template and listing an agenda store no tasks."""
+        self.todo_list.add_recurring("Water plants", "daily", start=date(2026, 1, 1))
+        items = list(self.todo_list.agenda(date(2026, 1, 1), days=30))
+
+        self.assertEqual(len(items), 30)
+        self.assertTrue(all(item.recurring and item.task["status"] == "pending" for item in items))
+        self.assertEqual(self.todo_list.load_tasks(), [])
+
+    def test_complete_occurrence_materializes_one_task(self):
+        """Test that only the completed occurrence is stored."""
+        self.todo_list.add_recurring("Standup", "cron: * * mon-fri", tags=["work"], start=date(2026, 10, 1))
+
+        task = self.todo_list.complete_occurrence(1, date(2026, 10, 5))
+
+        self.assertEqual(task["status"], "completed")
+        self.assertEqual(task["due_date"], "2026-10-05")
+        self.assertEqual(task["tags"], ["work"])
+        self.assertEqual(self.todo_list.load_tasks(), [task])
+        with self.assertRaises(ValueError):
+            self.todo_list.complete_occurrence(1, date(2026, 10, 5))
+        with self.assertRaises(ValueError):
+            self.todo_list.complete_occurrence(1, date(2026, 10, 4))
+        self.assertIsNone(self.todo_list.complete_occurrence(2))
+
+    def test_agenda_merges_tasks_and_occurrences(self):
+        """Test date order, completed occurrences and no double listing."""
+        self.todo_list.add_recurring("Water plants", "every 2 days", start=date(2026, 10, 1))
+        self.todo_list.add_task("Dentist", due_date="2026-10-02")
+        self.todo_list.add_task("Someday")
+        self.todo_list.complete_occurrence(1, date(2026, 10, 3))
+
+        items = [
+            (item.on.isoformat(), item.task["task"], item.task["status"], item.recurring)
+            for item in self.todo_list.agenda(date(2026, 10, 1), days=4)
+        ]
+
+        self.assertEqual(items, [
+            ("2026-10-01", "Water plants", "pending", True),
+            ("2026-10-02", "Dentist", "pending", False),
+            ("2026-10-03", "Water plants", "completed", True),
+        ])
+
+    def test_default_occurrence_and_undo(self):
+        """Test that done picks the occurrence due today and can be undone."""
+        self.todo_list.add_recurring("Stretch", "daily")
+
+        first = self.todo_list.complete_occurrence(1)
+        second = self.todo_list.complete_occurrence(1)
+
+        today = date.today().isoformat()
+        self.assertEqual(first["recurrence"]["on"], today)
+        self.assertGreater(second["recurrence"]["on"], today)
+        self.assertEqual(self.todo_list.undo().op, "done")
+        self.assertEqual(self.todo_list.load_tasks(), [first])
+
+    def test_remove_recurring_keeps_history(self):
+        """Test that removing a template keeps its completed occurrences."""
+        self.todo_list.add_recurring("Water plants", "daily", start=date(2026, 10, 1))
+        self.todo_list.complete_occurrence(1, date(2026, 10, 1))
+
+        self.assertEqual(self.todo_list.remove_recurring(1)["task"], "Water plants")
+        self.assertEqual(self.todo_list.list_recurring(), [])
+        items = list(self.todo_list.agenda(date(2026, 10, 1), days=3))
+        self.assertEqual([(i.task["task"], i.recurring) for i in items], [("Water plants", False)])
+
+    def test_damaged_templates_file_is_not_overwritten(self):
+        """Test that an unreadable templates file is an error, not an empty list."""
+        self.todo_list.add_recurring("Water plants", "daily")
+        with open(self.todo_list.recurring.path, "a") as f:
+            f.write("garbage")
+
+        with self.assertRaises(ValueError):
+            self.todo_list.add_recurring("Stretch", "daily")
+        with open(self.todo_list.recurring.path) as f:
+            self.assertIn("Water plants", f.read())
+
+
+class TestRecurrenceCommands(unittest.TestCase):
+    """Test cases for the recur and agenda CLI commands."""
+
+    def setUp(self):
+        """Set up a temporary working directory."""
+        self.old_cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.tmpdir.cleanup()
+
+    def _run(self, *argv):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main(list(argv))
+        return buf.getvalue()
+
+    def test_recur_and_agenda(self):
+        """Test adding a template, completing it and listing the agenda."""
+        self._run("recur", "add", "Take out trash", "-r", "weekly", "--start", "2026-10-05", "-t", "home")
+        self.assertIn("R1. Take out trash", self._run("recur", "list"))
+        self.assertIn("Completed task", self._run("recur", "done", "1", "--on", "2026-10-12"))
+
+        records = [json.loads(line) for line in self._run(
+            "agenda", "--from", "2026-10-05", "--days", "14", "--ndjson"
+        ).splitlines()]
+
+        self.assertEqual(
+            [(r["date"], r["status"], r["index"]) for r in records],
+            [("2026-10-05", "pending", 1), ("2026-10-12", "completed", 1)],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,208 @@
+"""Unit tests for time-bucketed rollups and reports."""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import rollups
+from todolist.__main__ import main
+from todolist.aio import AsyncTodoList
+from todolist.core import TodoList
+
+
+def _task(created, completed=None, tags=None):
+    task = {"task": "t", "priority": "medium", "tags": tags or [], "status": "pending", "created_at": created}
+    if completed:
+        task["status"] = "completed"
+        task["completed_at"] = completed
+    return task
+
+
+TASKS = [
+    _task("2024-06-03T09:00:00", "2024-06-03T10:00:00", ["work"]),
+    _task("2024-06-04T09:00:00", "2024-06-06T09:00:00", ["work", "home"]),
+    _task("2024-06-11T09:00:00"),
+    _task("2024-07-01T09:00:00", "2024-07-02T09:00:00", ["home"]),
+]
+
+
+class TestRollups(unittest.TestCase):
+    """Test cases for building and querying rollups."""
+
+    def test_lead_buckets_are_within_ten_percent(self):
+        """Test that bucketing preserves lead times to within the growth factor."""
+        for seconds in (1, 59, 3600, 86400 * 3, 86400 * 400):
+            value = rollups.bucket_seconds(rollups.lead_bucket(seconds))
+            self.assertLess(abs(value - seconds) / seconds, 0.1)
+        self.assertEqual(rollups.bucket_seconds(rollups.lead_bucket(0)), 0.0)
+
+    def test_weekly_report(self):
+        """Test created/completed counts and lead times per ISO week."""
+        report = rollups.make_report(rollups.build_rollups(TASKS), "week")
+
+        periods = {p.period: p for p in report.periods}
+        self.assertEqual(sorted(periods), ["2024-W23", "2024-W24", "2024-W27"])
+        self.assertEqual((periods["2024-W23"].created, periods["2024-W23"].completed), (2, 2))
+        self.assertEqual(periods["2024-W23"].throughput, round(2 / 7, 3))
+        self.assertAlmostEqual(periods["2024-W23"].lead_p50, 3600, delta=360)
+        self.assertAlmostEqual(periods["2024-W23"].lead_p90, 2 * 86400, delta=2 * 8640)
+        self.assertIsNone(periods["2024-W24"].lead_p50)
+
+    def test_monthly_report_per_tag(self):
+        """Test per-tag periods and the last filter."""
+        report = rollups.make_report(rollups.build_rollups(TASKS), "month", last=1)
+
+        self.assertEqual([p.period for p in report.periods], ["2024-07"])
+        self.assertEqual(sorted(report.tags), ["home", "work"])
+        self.assertEqual(report.tags["work"], [])
+        self.assertEqual(report.tags["home"][0].completed, 1)
+        self.assertEqual(report.tags["home"][0].throughput, round(1 / 31, 3))
+
+    def test_removal_undoes_addition(self):
+        """Test that applying a task with sign -1 restores the previous rollups."""
+        data = rollups.build_rollups(TASKS[:2])
+        rollups.apply_task(data, TASKS[3])
+        rollups.apply_task(data, TASKS[3], -1)
+
+        self.assertEqual(data, rollups.build_rollups(TASKS[:2]))
+
+    def test_invalid_timestamps_are_skipped(self):
+        """Test that tasks without usable timestamps are ignored."""
+        data = rollups.build_rollups([{"task": "legacy"}, _task("yesterday")])
+
+        self.assertEqual(data["days"], {})
+
+    def test_unknown_period(self):
+        """Test that unsupported periods raise ValueError."""
+        with self.assertRaises(ValueError):
+            rollups.make_report(rollups.empty_rollups(), "year")
+
+
+class TestTodoListReport(unittest.TestCase):
+    """Test cases for TodoList.report and the rollups sidecar."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks_file = os.path.join(self.tmpdir.name, "tasks.json")
+        self.todo_list = TodoList(self.tasks_file)
+        self.todo_list.save_tasks([dict(t) for t in TASKS])
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    def _assert_rollups_current(self):
+        stored = self.todo_list.rollups.load()
+        rebuilt = rollups.build_rollups(self.todo_list.load_tasks())
+        self.assertEqual((stored["days"], stored["tags"]), (rebuilt["days"], rebuilt["tags"]))
+
+    def test_mutations_without_sidecar_do_not_create_it(self):
+        """Test that lists never reported on pay nothing for rollups."""
+        self.todo_list.add_task("New")
+
+        self.assertFalse(os.path.exists(self.todo_list.rollups.path))
+
+    def test_report_is_served_from_sidecar(self):
+        """Test that a current sidecar answers reports without loading tasks."""
+        first = self.todo_list.report("month")
+
+        with mock.patch.object(self.todo_list, "load_tasks") as load:
+            self.assertEqual(self.todo_list.report("month"), first)
+        load.assert_not_called()
+
+    def test_mutations_update_sidecar_incrementally(self):
+        """Test that add, complete, remove and clear keep rollups in sync."""
+        self.todo_list.report()
+
+        self.todo_list.add_task("New", tags=["work"])
+        self._assert_rollups_current()
+        self.todo_list.complete_task(3)
+        self._assert_rollups_current()
+        self.todo_list.remove_task(1)
+        self._assert_rollups_current()
+        self.todo_list.clear_completed()
+        self._assert_rollups_current()
+
+        with mock.patch.object(self.todo_list, "load_tasks") as load:
+            self.todo_list.report()
+        load.assert_not_called()
+
+    def test_external_change_triggers_rebuild(self):
+        """Test that a stale sidecar is rebuilt rather than trusted."""
+        self.todo_list.report()
+        tasks = self.todo_list.load_tasks()
+        tasks.append(_task("2024-08-01T09:00:00"))
+        self.todo_list.save_tasks(tasks)
+
+        report = self.todo_list.report("month")
+
+        self.assertEqual(report.periods[-1].period, "2024-08")
+        self._assert_rollups_current()
+
+
+class TestAsyncReport(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncTodoList.report."""
+
+    async def test_report_from_memory(self):
+        """Test that the async report matches the rollups of the shared list."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tasks.json")
+            TodoList(path).save_tasks([dict(t) for t in TASKS])
+            async with AsyncTodoList(path) as todo:
+                report = await todo.report("week", tags=["home"])
+
+        self.assertEqual(len(report.periods), 3)
+        self.assertEqual(list(report.tags), ["home"])
+
+
+class TestReportCommand(unittest.TestCase):
+    """Test cases for the report CLI command."""
+
+    def setUp(self):
+        """Set up a temporary working directory with tasks."""
+        self.old_cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+        TodoList().save_tasks([dict(t) for t in TASKS])
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.tmpdir.cleanup()
+
+    def _run(self, *argv):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main(list(argv))
+        return buf.getvalue()
+
+    def test_report_ndjson(self):
+        """Test one record per period and tag."""
+        lines = self._run("report", "--by", "month", "-t", "work", "--ndjson").splitlines()
+        records = [json.loads(line) for line in lines]
+
+        self.assertEqual(
+            [(r["tag"], r["period"]) for r in records],
+            [(None, "2024-06"), (None, "2024-07"), ("work", "2024-06")],
+        )
+        self.assertEqual(records[0]["created"], 3)
+
+    def test_report_text(self):
+        """Test the text report."""
+        out = self._run("report", "--by", "week")
+
+        self.assertIn("Activity by week", out)
+        self.assertIn("2024-W23", out)
+        self.assertIn("#home", out)
+
+
+if __name__ == '__main__':
+    unittest.main()
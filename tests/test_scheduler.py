@@ -0,0 +1,237 @@
+"""Unit tests for the next-task scheduler."""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from unittest import mock
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist.__main__ import main
+from todolist.aio import AsyncTodoList
+from todolist.core import TodoList
+from todolist.scheduler import TaskScheduler, parse_due
+
+TODAY = date(2024, 6, 15)
+
+
+def _task(priority="medium", due_date=None, created_at="2024-01-01T00:00:00", status="pending"):
+    return {
+        "task": "t",
+        "priority": priority,
+        "due_date": due_date,
+        "created_at": created_at,
+        "status": status,
+    }
+
+
+class TestTaskScheduler(unittest.TestCase):
+    """Test cases for TaskScheduler ordering and updates."""
+
+    def test_ordering(self):
+        """Test overdue, then priority, then due date, then age."""
+        tasks = {
+            "low-overdue": _task("low", "2024-06-01"),
+            "high-new": _task("high", created_at="2024-03-01T00:00:00"),
+            "high-old": _task("high", created_at="2024-02-01T00:00:00"),
+            "high-due": _task("high", "2024-07-01", created_at="2024-05-01T00:00:00"),
+            "medium": _task("medium"),
+            "done": _task("high", status="completed"),
+        }
+        scheduler = TaskScheduler.from_tasks(tasks.items(), today=TODAY)
+
+        self.assertEqual(
+            scheduler.peek(10, today=TODAY),
+            ["low-overdue", "high-due", "high-old", "high-new", "medium"],
+        )
+        self.assertNotIn("done", scheduler)
+
+    def test_peek_is_non_destructive(self):
+        """Test that repeated peeks return the same keys."""
+        scheduler = TaskScheduler.from_tasks(
+            ((i, _task(created_at=f"2024-01-{i:02d}")) for i in range(1, 21)), today=TODAY
+        )
+
+        first = scheduler.peek(5, today=TODAY)
+        self.assertEqual(first, [1, 2, 3, 4, 5])
+        self.assertEqual(scheduler.peek(5, today=TODAY), first)
+        self.assertEqual(len(scheduler), 20)
+
+    def test_incremental_add_and_discard(self):
+        """Test that replaced and discarded keys drop out of the results."""
+        scheduler = TaskScheduler(today=TODAY)
+        scheduler.add(1, _task("low"))
+        scheduler.add(2, _task("medium"))
+        self.assertEqual(scheduler.peek(1, today=TODAY), [2])
+
+        scheduler.add(1, _task("high"))
+        self.assertEqual(scheduler.peek(2, today=TODAY), [1, 2])
+
+        scheduler.add(1, _task("high", status="completed"))
+        scheduler.discard(2)
+        self.assertEqual(scheduler.peek(2, today=TODAY), [])
+        self.assertEqual(len(scheduler), 0)
+
+    def test_many_discards_compact(self):
+        """Test that heavy churn keeps results correct."""
+        scheduler = TaskScheduler(today=TODAY)
+        for i in range(500):
+            scheduler.add(i % 10, _task(created_at=f"2024-01-01T00:00:{i % 60:02d}"))
+        self.assertEqual(len(scheduler), 10)
+        self.assertEqual(len(scheduler.peek(20, today=TODAY)), 10)
+
+    def test_due_date_promotes_to_overdue(self):
+        """Test that a task becomes overdue once its date passes."""
+        scheduler = TaskScheduler.from_tasks(
+            [("high", _task("high")), ("low", _task("low", "2024-06-20"))], today=TODAY
+        )
+        self.assertEqual(scheduler.peek(1, today=TODAY), ["high"])
+        self.assertFalse(scheduler.is_overdue("low"))
+
+        later = date(2024, 6, 21)
+        self.assertEqual(scheduler.peek(2, today=later), ["low", "high"])
+        self.assertTrue(scheduler.is_overdue("low"))
+
+    def test_parse_due(self):
+        """Test due date parsing."""
+        self.assertEqual(parse_due("2024-06-15"), TODAY)
+        self.assertEqual(parse_due("2024-06-15T10:00:00"), TODAY)
+        self.assertIsNone(parse_due("tomorrow"))
+        self.assertIsNone(parse_due(None))
+
+
+class TestNextTasks(unittest.TestCase):
+    """Test cases for TodoList.next_tasks."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks_file = os.path.join(self.tmpdir.name, "tasks.json")
+        self.todo_list = TodoList(self.tasks_file)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    def test_next_returns_most_urgent(self):
+        """Test that next_tasks ranks pending tasks with their indices."""
+        self.todo_list.add_task("Low", priority="low")
+        self.todo_list.add_task("High", priority="high")
+        self.todo_list.add_task("Overdue", priority="low", due_date="2000-01-01")
+
+        results = self.todo_list.next_tasks(2)
+
+        self.assertEqual([(i, t["task"]) for i, t in results], [(3, "Overdue"), (2, "High")])
+
+    def test_unchanged_file_is_not_reloaded(self):
+        """Test that repeated polling skips loading the file."""
+        self.todo_list.add_task("Task")
+        self.todo_list.next_tasks()
+
+        with mock.patch.object(self.todo_list, "load_tasks") as load:
+            self.assertEqual(self.todo_list.next_tasks()[0][1]["task"], "Task")
+        load.assert_not_called()
+
+    def test_own_mutations_update_incrementally(self):
+        """Test that add and complete update the cached queue."""
+        self.todo_list.add_task("First", priority="low")
+        self.todo_list.next_tasks()
+        scheduler = self.todo_list._scheduler
+
+        self.todo_list.add_task("Second", priority="high")
+        self.assertEqual(self.todo_list.next_tasks()[0][1]["task"], "Second")
+        self.todo_list.complete_task(2)
+        self.assertEqual(self.todo_list.next_tasks()[0][1]["task"], "First")
+        self.assertIs(self.todo_list._scheduler, scheduler)
+
+    def test_external_changes_are_picked_up(self):
+        """Test that writes from another instance invalidate the cache."""
+        self.todo_list.add_task("Mine", priority="low")
+        self.todo_list.next_tasks()
+
+        TodoList(self.tasks_file).add_task("Theirs", priority="high")
+        self.todo_list.add_task("Another", priority="low")
+
+        tasks = [t["task"] for _, t in self.todo_list.next_tasks(3)]
+        self.assertEqual(tasks, ["Theirs", "Mine", "Another"])
+
+    def test_remove_reindexes(self):
+        """Test that removal rebuilds the queue with shifted indices."""
+        self.todo_list.add_task("A", priority="low")
+        self.todo_list.add_task("B", priority="high")
+        self.todo_list.next_tasks()
+
+        self.todo_list.remove_task(1)
+
+        self.assertEqual(self.todo_list.next_tasks(), [(1, self.todo_list.load_tasks()[0])])
+
+
+class TestAsyncNextTasks(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncTodoList.next_tasks."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks_file = os.path.join(self.tmpdir.name, "tasks.json")
+        self.todo = AsyncTodoList(self.tasks_file, flush_delay=0.01)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    async def test_next_tracks_mutations(self):
+        """Test that the async queue follows adds, completions and removals."""
+        async with self.todo:
+            await self.todo.add_task("Low", priority="low")
+            self.assertEqual((await self.todo.next_tasks())[0][1]["task"], "Low")
+
+            await self.todo.add_task("High", priority="high")
+            self.assertEqual((await self.todo.next_tasks())[0][0], 2)
+
+            await self.todo.complete_task(2)
+            await self.todo.remove_task(1)
+            self.assertEqual(await self.todo.next_tasks(), [])
+
+
+class TestNextCommand(unittest.TestCase):
+    """Test cases for the next CLI command."""
+
+    def setUp(self):
+        """Set up a temporary working directory."""
+        self.old_cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.tmpdir.cleanup()
+
+    def _run(self, *argv):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main(list(argv))
+        return buf.getvalue()
+
+    def test_next_json(self):
+        """Test next -n with JSON output."""
+        self._run("add", "Low", "-p", "low")
+        self._run("add", "High", "-p", "high")
+        self._run("add", "Medium")
+
+        records = json.loads(self._run("next", "-n", "2", "--json"))
+
+        self.assertEqual([(r["index"], r["task"]) for r in records], [(2, "High"), (3, "Medium")])
+
+    def test_next_text_empty(self):
+        """Test the message shown when nothing is pending."""
+        self.assertIn("No pending tasks.", self._run("next"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,228 @@
+"""Unit tests for crash-safe storage and verification."""
+
+import builtins
+import io
+import json
+import os
+import tempfile
+import unittest
+import warnings
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import storage
+from todolist.__main__ import main
+from todolist.core import TodoList
+
+
+def _rewrite(path, old, new, keep_mtime=False):
+    """Change bytes in a file, optionally as bit rot would (same mtime and size)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    st = os.stat(path)
+    with open(path, "r+b") as f:
+        f.write(data.replace(old, new, 1))
+        f.truncate()
+    if keep_mtime:
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+class TestTaskStore(unittest.TestCase):
+    """Test cases for TaskStore."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "tasks.json")
+        self.todo_list = TodoList(self.path)
+        for i in range(1, 6):
+            self.todo_list.add_task(f"Task {i}")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    def test_file_is_a_json_array_one_task_per_line(self):
+        """Test that the format stays plain JSON readable by other tools."""
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+            f.seek(0)
+            tasks = json.load(f)
+
+        self.assertEqual([t["task"] for t in tasks], [f"Task {i}" for i in range(1, 6)])
+        self.assertEqual((lines[0], lines[-1], len(lines)), ("[", "]", 7))
+        self.assertTrue(self.todo_list.verify().ok)
+
+    def test_failed_write_leaves_file_untouched(self):
+        """Test that an interrupted save keeps the previous version."""
+        with open(self.path, "rb") as f:
+            before = f.read()
+
+        with mock.patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.todo_list.add_task("Task 6")
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), before)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_verify_pinpoints_damaged_records(self):
+        """Test that bit rot and broken JSON are reported per record."""
+        _rewrite(self.path, b"Task 2", b"Tusk 2", keep_mtime=True)
+        report = self.todo_list.verify()
+        self.assertEqual(report.checksums, "verified")
+        self.assertEqual([(d.index, d.line, d.reason) for d in report.damaged], [(2, 3, "checksum mismatch")])
+
+        _rewrite(self.path, b'"Task 4"', b'"Task 4')
+        report = self.todo_list.verify()
+        self.assertEqual(report.checksums, "stale")
+        self.assertEqual([d.index for d in report.damaged], [4])
+        self.assertEqual(report.records, 5)
+
+    def test_verify_reports_truncation(self):
+        """Test that a file cut short is reported."""
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 40)
+
+        report = self.todo_list.verify()
+
+        self.assertFalse(report.ok)
+        self.assertEqual([d.index for d in report.damaged], [5])
+        self.assertTrue(any("truncated" in e for e in report.errors))
+
+    def test_verify_streams_with_small_buffers(self):
+        """Test that records spanning read boundaries are handled."""
+        with mock.patch.object(storage, "CHUNK", 7):
+            report = self.todo_list.verify()
+
+        self.assertTrue(report.ok)
+        self.assertEqual(report.records, 5)
+
+    def test_verify_indented_file(self):
+        """Test files written by older versions with json.dump(indent=4)."""
+        with open(self.path, "w") as f:
+            json.dump([{"task": "a"}, {"task": "b", "modified": {"status": "x"}, "tags": ["t"]}], f, indent=4)
+
+        report = self.todo_list.verify()
+
+        self.assertEqual((report.ok, report.records, report.checksums), (True, 2, "stale"))
+
+    def test_verify_compact_one_line_file(self):
+        """Test files written by other tools with plain json.dump."""
+        with open(self.path, "w") as f:
+            json.dump([{"task": "a"}, {"task": "b"}, {"task": "c"}], f)
+
+        report = self.todo_list.verify()
+
+        self.assertEqual((report.ok, report.records), (True, 3))
+
+    def test_damaged_file_recovers_last_good_state(self):
+        """Test that a damaged file is kept aside and never overwritten with []."""
+        _rewrite(self.path, b'"Task 3"', b'\x00')
+
+        with self.assertWarns(storage.RecoveredTasksWarning) as cm:
+            tasks = TodoList(self.path).load_tasks()
+            TodoList(self.path).add_task("Task 6")
+
+        self.assertEqual([t["task"] for t in tasks], [f"Task {i}" for i in range(1, 5)])
+        self.assertIn("damaged", str(cm.warning))
+        kept = [name for name in os.listdir(self.tmpdir.name) if ".corrupt-" in name]
+        self.assertEqual(len(kept), 1)
+        self.assertEqual(
+            [t["task"] for t in TodoList(self.path).load_tasks()],
+            ["Task 1", "Task 2", "Task 3", "Task 4", "Task 6"],
+        )
+
+    def test_damaged_file_without_backup_is_an_error(self):
+        """Test that loading fails rather than returning an empty list."""
+        os.unlink(self.path + ".bak")
+        _rewrite(self.path, b"Task 1", b"Task 1\x00")
+
+        with self.assertRaises(storage.CorruptTasksError):
+            self.todo_list.load_tasks()
+        with self.assertRaises(storage.CorruptTasksError):
+            self.todo_list.add_task("Task 6")
+        with open(self.path, "rb") as f:
+            self.assertIn(b"Task 1\x00", f.read())
+
+    def test_reader_racing_a_writer_sees_no_damage(self):
+        """Test a read while another process renames a new version into place."""
+        writer = TodoList(self.path)
+        real_open = builtins.open
+        raced = []
+
+        def racing_open(path, mode="r", *args, **kwargs):
+            if path == self.path and mode == "rb" and not raced:
+                raced.append(path)
+                # The new file is in place but its checksums are not written yet
+                with mock.patch.object(storage, "write_atomic"):
+                    writer.add_task("Task 6")
+            return real_open(path, mode, *args, **kwargs)
+
+        with mock.patch.object(storage, "open", racing_open, create=True), \
+                warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            tasks = TodoList(self.path).load_tasks()
+
+        self.assertEqual(len(tasks), 6)
+        self.assertEqual(caught, [])
+        self.assertFalse([name for name in os.listdir(self.tmpdir.name) if ".corrupt-" in name])
+
+    def test_emptied_file_recovers(self):
+        """Test that a file truncated to zero bytes is not taken as empty."""
+        open(self.path, "w").close()
+
+        with self.assertWarns(storage.RecoveredTasksWarning):
+            self.assertEqual(len(self.todo_list.load_tasks()), 4)
+
+
+class TestVerifyCommand(unittest.TestCase):
+    """Test cases for the verify CLI command."""
+
+    def setUp(self):
+        """Set up a temporary working directory."""
+        self.old_cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.tmpdir.cleanup()
+
+    def test_verify_exit_status(self):
+        """Test the JSON report and exit status for good and damaged files."""
+        TodoList("tasks.json").add_task("Buy milk")
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main(["verify", "--json"])
+        self.assertTrue(json.loads(buf.getvalue())["ok"])
+
+        _rewrite("tasks.json", b"Buy milk", b"Buy silk", keep_mtime=True)
+        buf = io.StringIO()
+        with redirect_stdout(buf), self.assertRaises(SystemExit) as cm:
+            main(["verify"])
+        self.assertEqual(cm.exception.code, 1)
+        self.assertIn("record 1 (line 2): checksum mismatch", buf.getvalue())
+
+    def test_recovery_warning_on_stderr(self):
+        """Test that the CLI shows a recovery warning as a plain message."""
+        todo = TodoList("tasks.json")
+        todo.add_task("Buy milk")
+        todo.add_task("Write code")
+        _rewrite("tasks.json", b"Write code", b"Write\x00code")
+        out, err = io.StringIO(), io.StringIO()
+
+        with redirect_stdout(out), redirect_stderr(err):
+            main(["list", "--json"])
+
+        self.assertEqual([t["task"] for t in json.loads(out.getvalue())], ["Buy milk"])
+        self.assertTrue(err.getvalue().startswith("Warning: tasks.json is damaged"))
+        self.assertEqual(err.getvalue().count("\n"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
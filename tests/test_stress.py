@@ -0,0 +1,70 @@
+"""Tests for the concurrency stress and crash-injection harness."""
+
+import json
+import os
+import tempfile
+import unittest
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from benchmarks.stress import Outcome, check, percentile, run_level, seed_tasks
+
+
+class TestStress(unittest.TestCase):
+    """Test cases for concurrent and interrupted writes."""
+
+    def setUp(self):
+        """Set up a temporary working directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Clean up the working directory."""
+        self.tmpdir.cleanup()
+
+    def test_threads_lose_nothing(self):
+        """Test that concurrent TodoList instances never lose updates."""
+        result = run_level("threads", 4, 30, self.tmpdir.name)
+
+        self.assertEqual(result.violations, [])
+        self.assertEqual(result.ops, 120)
+        self.assertGreater(result.p99_ms, 0)
+
+    def test_killed_processes_leave_a_consistent_file(self):
+        """Test that todo processes killed mid-write lose nothing acknowledged."""
+        result = run_level("processes", 3, 4, self.tmpdir.name, kill_rate=0.5, initial=5, seed=3)
+
+        # Whether a kill lands before the process exits depends on the machine,
+        # so only the consistency of the result is checked
+        self.assertEqual(result.violations, [])
+        self.assertEqual(result.ops, 12)
+
+    def test_check_detects_lost_updates(self):
+        """Test that the checker notices acknowledged changes that vanished."""
+        path = os.path.join(self.tmpdir.name, "tasks.json")
+        seeded = seed_tasks(path, 3)
+        with open(path) as f:
+            tasks = json.load(f)
+        outcomes = [Outcome("complete", 0.1, task=tasks[1]), Outcome("remove", 0.1, task=tasks[2])]
+        with open(path, "w") as f:
+            json.dump(tasks[1:], f)
+
+        violations = check(path, seeded, outcomes)
+
+        self.assertEqual(len(violations), 3)
+        self.assertTrue(any("missing" in v for v in violations))
+        self.assertTrue(any("completion" in v for v in violations))
+        self.assertTrue(any("came back" in v for v in violations))
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(v) for v in range(1, 101)]
+
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 99), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,254 @@
+"""Unit tests for two-way sync."""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import sync
+from todolist.__main__ import main
+from todolist.aio import AsyncTodoList
+from todolist.core import TodoList
+from todolist.locking import file_signature
+
+
+class TestMergeTask(unittest.TestCase):
+    """Test cases for per-field last-writer-wins merging."""
+
+    def test_newer_field_wins_independently(self):
+        """Test that concurrent edits to different fields both survive."""
+        base = {"id": "abc", "task": "Old", "priority": "low", "created_at": "2025-01-01T00:00:00"}
+        a = dict(base, task="New title", modified={"task": "2025-01-02T00:00:00"})
+        b = dict(base, priority="high", modified={"priority": "2025-01-03T00:00:00"})
+
+        merged = sync.merge_task(a, b)
+
+        self.assertEqual((merged["task"], merged["priority"]), ("New title", "high"))
+        self.assertEqual(merged, sync.merge_task(b, a))
+
+    def test_times_compare_across_timezones(self):
+        """Test that the later instant wins, not the later-looking string."""
+        base = {"id": "abc", "task": "Old", "created_at": "2025-01-01T00:00:00"}
+        tokyo = dict(base, task="Tokyo", modified={"task": "2025-01-02T10:00:00+09:00"})
+        london = dict(base, task="London", modified={"task": "2025-01-02T02:00:00+00:00"})
+
+        self.assertEqual(sync.merge_task(tokyo, london)["task"], "London")
+        self.assertEqual(sync.last_modified(tokyo), "2025-01-02T10:00:00+09:00")
+
+    def test_ties_are_deterministic(self):
+        """Test that equal timestamps pick the same value on both sides."""
+        a = {"id": "abc", "task": "x", "created_at": "2025-01-01T00:00:00"}
+        b = {"id": "abc", "task": "y", "created_at": "2025-01-01T00:00:00"}
+
+        self.assertEqual(sync.merge_task(a, b), sync.merge_task(b, a))
+
+    def test_legacy_ids_are_deterministic(self):
+        """Test that copies of a task without an id agree on one."""
+        task = {"task": "Old task", "created_at": "2024-05-01T09:00:00"}
+
+        self.assertEqual(sync.task_id(task), sync.task_id(dict(task)))
+        self.assertEqual(len(sync.task_id(task)), 32)
+
+
+class TestSyncTree(unittest.TestCase):
+    """Test cases for the XOR hash tree."""
+
+    def test_toggle_is_order_independent_and_reversible(self):
+        """Test that incremental updates match a rebuild."""
+        tasks = [{"id": f"{i:032x}", "task": str(i)} for i in range(50)]
+        tree = sync.SyncTree.from_state(tasks[:40], {})
+        for task in tasks[40:]:
+            tree.toggle(task["id"], sync.entry_hash(task))
+        tree.toggle(tasks[0]["id"], sync.entry_hash(tasks[0]))
+
+        self.assertEqual(tree.root(), sync.SyncTree.from_state(tasks[1:], {}).root())
+
+    def test_differing_buckets(self):
+        """Test that only leaves holding changed ids differ."""
+        tasks = [{"id": "a" * 32, "task": "x"}, {"id": "b" * 32, "task": "y"}]
+        changed = [tasks[0], dict(tasks[1], task="z")]
+
+        left = sync.SyncTree.from_state(tasks, {})
+        right = sync.SyncTree.from_state(changed, {})
+
+        self.assertEqual(left.differing(right), [sync.bucket_of("b" * 32)])
+
+
+class TestTodoListSync(unittest.TestCase):
+    """Test cases for TodoList.sync between two directories."""
+
+    def setUp(self):
+        """Create two task lists in separate directories."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dirs = [os.path.join(self.tmpdir.name, name) for name in ("laptop", "desktop")]
+        for path in self.dirs:
+            os.mkdir(path)
+        self.local = TodoList(os.path.join(self.dirs[0], "tasks.json"))
+        self.remote = TodoList(os.path.join(self.dirs[1], "tasks.json"))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    def _descriptions(self, todo):
+        return sorted(t["task"] for t in todo.load_tasks())
+
+    def test_copies_new_tasks_both_ways(self):
+        """Test that each side receives the other's tasks."""
+        self.local.add_task("Fix login")
+        self.remote.add_task("Buy milk")
+
+        result = self.local.sync(self.dirs[1])
+
+        self.assertEqual((result.pulled_added, result.pushed_added), (1, 1))
+        self.assertEqual(self._descriptions(self.local), ["Buy milk", "Fix login"])
+        self.assertEqual(self.local.load_tasks()[0]["task"], "Fix login")
+        self.assertEqual(self._descriptions(self.remote), ["Buy milk", "Fix login"])
+        self.assertTrue(self.local.sync(self.dirs[1]).in_sync)
+
+    def test_completion_and_removal_propagate(self):
+        """Test that completions and tombstones reach the other side."""
+        self.local.add_task("Fix login")
+        self.local.add_task("Write docs")
+        self.local.sync(self.dirs[1])
+
+        self.remote.complete_task(1)
+        self.local.remove_task(2)
+        result = self.local.sync(self.remote.tasks_file)
+
+        self.assertEqual((result.pulled_updated, result.pushed_removed), (1, 1))
+        for todo in (self.local, self.remote):
+            tasks = todo.load_tasks()
+            self.assertEqual([(t["task"], t["status"]) for t in tasks], [("Fix login", "completed")])
+
+    def test_edit_after_removal_wins(self):
+        """Test that a tombstone only wins over older changes."""
+        self.local.add_task("Fix login")
+        self.local.sync(self.dirs[1])
+        tid = self.local.load_tasks()[0]["id"]
+        self.local.remove_task(1)
+        earlier = (datetime.now() - timedelta(hours=1)).isoformat()
+        self.local.tombstones.save({tid: earlier})
+
+        self.remote.complete_task(1)
+        self.local.sync(self.dirs[1])
+
+        self.assertEqual(self._descriptions(self.local), ["Fix login"])
+        self.assertNotIn(tid, self.local.tombstones.load())
+
+    def test_stored_tree_tracks_mutations(self):
+        """Test that mutations keep the sidecar tree equal to a rebuild."""
+        self.local.add_task("Fix login")
+        self.local.sync(self.dirs[1])
+
+        self.local.add_task("Write docs")
+        self.local.complete_task(1)
+        self.local.remove_task(2)
+        self.local.clear_completed()
+
+        stored = self.local.synctree.load(file_signature(self.local.tasks_file))
+        rebuilt = sync.SyncTree.from_state(self.local.load_tasks(), self.local.tombstones.load())
+        self.assertIsNotNone(stored)
+        self.assertEqual(stored.root(), rebuilt.root())
+
+    def test_dry_run_writes_nothing(self):
+        """Test that a dry run reports changes without applying them."""
+        self.local.add_task("Fix login")
+
+        result = self.local.sync(self.dirs[1], dry_run=True)
+
+        self.assertEqual(result.pushed_added, 1)
+        self.assertFalse(os.path.exists(self.remote.tasks_file))
+
+    def test_legacy_tasks_get_ids(self):
+        """Test that tasks saved before ids existed sync without duplicating."""
+        legacy = [{"task": "Old task", "status": "pending", "created_at": "2024-05-01T09:00:00"}]
+        self.local.save_tasks(legacy)
+        self.remote.save_tasks([dict(legacy[0])])
+
+        self.local.sync(self.dirs[1])
+
+        self.assertEqual(len(self.remote.load_tasks()), 1)
+        self.assertEqual(self.local.load_tasks()[0]["id"], sync.task_id(legacy[0]))
+
+    def test_rejects_self(self):
+        """Test that syncing a list with itself is an error."""
+        with self.assertRaises(ValueError):
+            self.local.sync(self.dirs[0])
+
+    def test_expired_tombstones_are_pruned(self):
+        """Test that tombstones past the retention period are dropped."""
+        old = (datetime.now() - timedelta(days=sync.TOMBSTONE_DAYS + 1)).isoformat()
+        self.local.tombstones.save({"f" * 32: old})
+
+        self.local.sync(self.dirs[1])
+
+        self.assertEqual(self.local.tombstones.load(), {})
+
+    def test_damaged_tombstones_are_not_discarded(self):
+        """Test that an unreadable tombstones file stops sync instead of resurrecting tasks."""
+        self.local.add_task("Fix login")
+        self.local.sync(self.dirs[1])
+        self.local.remove_task(1)
+        with open(self.local.tombstones.path, "a") as f:
+            f.write("garbage")
+
+        with self.assertRaises(ValueError):
+            self.local.sync(self.dirs[1])
+        self.assertEqual(self.local.load_tasks(), [])
+
+
+class TestAsyncTombstones(unittest.IsolatedAsyncioTestCase):
+    """Test cases for tombstones written by AsyncTodoList."""
+
+    async def test_remove_leaves_tombstone(self):
+        """Test that removals are recorded when the list is flushed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with AsyncTodoList(os.path.join(tmpdir, "tasks.json")) as todo:
+                task = await todo.add_task("Fix login")
+                await todo.remove_task(1)
+            tombstones = TodoList(os.path.join(tmpdir, "tasks.json")).tombstones.load()
+
+        self.assertEqual(list(tombstones), [task["id"]])
+
+
+class TestSyncCommand(unittest.TestCase):
+    """Test cases for the sync CLI command."""
+
+    def setUp(self):
+        """Set up a temporary working directory."""
+        self.old_cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+        os.mkdir("other")
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.tmpdir.cleanup()
+
+    def _run(self, *argv):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main(list(argv))
+        return buf.getvalue()
+
+    def test_sync_json(self):
+        """Test the machine-readable result and the in-sync message."""
+        self._run("add", "Fix login")
+
+        record = json.loads(self._run("sync", "other", "--json"))
+
+        self.assertEqual(record["pushed_added"], 1)
+        self.assertFalse(record["in_sync"])
+        self.assertIn("Already in sync", self._run("sync", "other"))
+
+
+if __name__ == '__main__':
+    unittest.main()
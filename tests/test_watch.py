@@ -0,0 +1,126 @@
+"""Unit tests for the live watch view."""
+
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from todolist import watch
+from todolist.__main__ import main
+from todolist.core import TodoList
+from todolist.locking import write_atomic
+
+
+class TestFileWatcher(unittest.TestCase):
+    """Test cases for FileWatcher."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "tasks.json")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmpdir.cleanup()
+
+    def _check(self, use_inotify):
+        watcher = watch.FileWatcher(self.path, interval=0.01, use_inotify=use_inotify)
+        try:
+            self.assertFalse(watcher.wait(timeout=0.05))
+
+            # An atomic write, so the watcher cannot observe a half-written file
+            timer = threading.Timer(0.05, write_atomic, [self.path, "[]"])
+            timer.start()
+            start = time.monotonic()
+            self.assertTrue(watcher.wait(timeout=5))
+            timer.join()
+
+            self.assertLess(time.monotonic() - start, 5)
+            self.assertFalse(watcher.changed())
+        finally:
+            watcher.close()
+
+    def test_polling_detects_changes(self):
+        """Test change detection by stat polling."""
+        self._check(use_inotify=False)
+
+    def test_default_mode_detects_changes(self):
+        """Test change detection with inotify where available."""
+        self._check(use_inotify=True)
+
+
+class TestLiveScreen(unittest.TestCase):
+    """Test cases for incremental redraw."""
+
+    def test_diff_lines(self):
+        """Test which rows are rewritten and when the tail is cleared."""
+        self.assertEqual(watch.diff_lines(["a", "b", "c"], ["a", "x", "c", "d"]), ([1, 3], False))
+        self.assertEqual(watch.diff_lines(["a", "b", "c"], ["a"]), ([], True))
+
+    def test_update_rewrites_only_changed_rows(self):
+        """Test that an unchanged view writes nothing and one change writes one row."""
+        stream = io.StringIO()
+        screen = watch.LiveScreen(stream)
+        with mock.patch.object(screen, "height", return_value=50):
+            self.assertEqual(screen.update(["header", "task 1", "task 2"]), 3)
+            written = len(stream.getvalue())
+
+            self.assertEqual(screen.update(["header", "task 1", "task 2"]), 0)
+            self.assertEqual(len(stream.getvalue()), written)
+
+            self.assertEqual(screen.update(["header", "task 1 done", "task 2"]), 1)
+            self.assertIn("\x1b[2;1Htask 1 done\x1b[K", stream.getvalue()[written:])
+
+    def test_long_views_are_truncated(self):
+        """Test that views taller than the terminal end with a note."""
+        screen = watch.LiveScreen(io.StringIO())
+        with mock.patch.object(screen, "height", return_value=5):
+            screen.update([str(i) for i in range(10)])
+
+        self.assertEqual(screen.lines, ["0", "1", "2", "3", "... 6 more line(s)"])
+
+
+class TestWatchCommand(unittest.TestCase):
+    """Test cases for the watch CLI command."""
+
+    def setUp(self):
+        """Set up a temporary working directory."""
+        self.old_cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+        self.tmpdir.cleanup()
+
+    def test_watch_ndjson_emits_views_until_interrupted(self):
+        """Test one view record per change and a clean exit on Ctrl-C."""
+        TodoList("tasks.json").add_task("Fix login", tags=["work"])
+        waits = [None, KeyboardInterrupt()]
+
+        def fake_wait(self, timeout=None):
+            result = waits.pop(0)
+            if isinstance(result, BaseException):
+                raise result
+            TodoList("tasks.json").add_task("Write docs", tags=["work"])
+            return True
+
+        buf = io.StringIO()
+        with mock.patch.object(watch.FileWatcher, "wait", fake_wait), redirect_stdout(buf):
+            main(["watch", "--tags", "work", "--poll", "--ndjson"])
+
+        views = [json.loads(line) for line in buf.getvalue().splitlines()]
+        self.assertEqual([len(v["tasks"]) for v in views], [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()